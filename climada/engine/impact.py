@@ -27,7 +27,8 @@ import copy
 import csv
 import warnings
 import datetime as dt
-from itertools import zip_longest
+import functools
+from itertools import chain, repeat, zip_longest
 from typing import Any, Iterable, Union
 from collections.abc import Collection
 from pathlib import Path
@@ -1240,7 +1241,7 @@ class Impact():
     def video_direct_impact(exp, impf_set, haz_list, file_name='',
                             writer=animation.PillowWriter(bitrate=500),
                             imp_thresh=0, args_exp=None, args_imp=None,
-                            ignore_zero=False, pop_name=False):
+                            ignore_zero=False, pop_name=False, pool=None):
         """
         Computes and generates video of accumulated impact per input events
         over exposure.
@@ -1272,6 +1273,11 @@ class Impact():
         pop_name : bool, optional
             add names of the populated places
             The default is False.
+        pool : pathos.pool, optional
+            Pool that will be used to compute the impacts of the events and to render the frames
+            of the video in parallel. The events are split into one chunk per worker, so that the
+            exposures are sent to each worker only once. The rendered frames are encoded
+            afterwards, see `climada.util.plot.save_frames_video`. Default: None
 
         Returns
         -------
@@ -1286,9 +1292,15 @@ class Impact():
         imp_arr = np.zeros(len(exp.gdf))
         # assign centroids once for all
         exp.assign_centroids(haz_list[0])
-        for i_time, _ in enumerate(haz_list):
-            imp_tmp = Impact()
-            imp_tmp.calc(exp, impf_set, haz_list[i_time], assign_centroids=False)
+        if pool:
+            n_chunks = min(len(haz_list), pool.nodes)
+            bounds = np.linspace(0, len(haz_list), n_chunks + 1).astype(int)
+            imp_tmp_list = chain.from_iterable(pool.map(
+                Impact._video_direct_impact_calc, repeat(exp, n_chunks), repeat(impf_set, n_chunks),
+                [haz_list[start:end] for start, end in zip(bounds[:-1], bounds[1:])]))
+        else:
+            imp_tmp_list = Impact._video_direct_impact_calc(exp, impf_set, haz_list)
+        for imp_tmp in imp_tmp_list:
             imp_arr = np.maximum(imp_arr, imp_tmp.eai_exp)
             # remove not impacted exposures
             save_exp = imp_arr > imp_thresh
@@ -1321,35 +1333,24 @@ class Impact():
             args_imp['cmap'] = 'autumn_r'
 
 
-        plot_raster = False
-        if exp.meta:
-            plot_raster = True
+        plot_params = dict(
+            exp=exp, v_lim=v_lim, args_exp=args_exp, args_imp=args_imp,
+            ignore_zero=ignore_zero, pop_name=pop_name, plot_raster=bool(exp.meta),
+            lon_lim=(haz_list[-1].centroids.lon.min(), haz_list[-1].centroids.lon.max()),
+            lat_lim=(haz_list[-1].centroids.lat.min(), haz_list[-1].centroids.lat.max()),
+        )
 
         def run(i_time):
-            haz_list[i_time].plot_intensity(1, axis=axis, cmap='Greys', vmin=v_lim[0],
-                                            vmax=v_lim[1], alpha=0.8)
-            if plot_raster:
-                exp.plot_hexbin(axis=axis, mask=exp_list[i_time], ignore_zero=ignore_zero,
-                                pop_name=pop_name, **args_exp)
-                if imp_list[i_time].coord_exp.size:
-                    imp_list[i_time].plot_hexbin_eai_exposure(axis=axis, pop_name=pop_name,
-                                                              **args_imp)
-                    fig.delaxes(fig.axes[1])
-            else:
-                exp.plot_scatter(axis=axis, mask=exp_list[i_time], ignore_zero=ignore_zero,
-                                 pop_name=pop_name, **args_exp)
-                if imp_list[i_time].coord_exp.size:
-                    imp_list[i_time].plot_scatter_eai_exposure(axis=axis, pop_name=pop_name,
-                                                               **args_imp)
-                    fig.delaxes(fig.axes[1])
-            fig.delaxes(fig.axes[1])
-            fig.delaxes(fig.axes[1])
-            axis.set_xlim(haz_list[-1].centroids.lon.min(), haz_list[-1].centroids.lon.max())
-            axis.set_ylim(haz_list[-1].centroids.lat.min(), haz_list[-1].centroids.lat.max())
-            axis.set_title(haz_list[i_time].event_name[0])
+            Impact._video_direct_impact_plot(
+                fig, axis, haz_list[i_time], exp_list[i_time], imp_list[i_time], **plot_params)
             pbar.update()
 
-        if file_name:
+        if file_name and pool:
+            LOGGER.info('Generating video %s', file_name)
+            u_plot.save_frames_video(
+                functools.partial(Impact._video_direct_impact_frame, **plot_params),
+                list(zip(haz_list, exp_list, imp_list)), file_name, writer, pool=pool)
+        elif file_name:
             LOGGER.info('Generating video %s', file_name)
             fig, axis, _fontsize = u_plot.make_map()
             ani = animation.FuncAnimation(fig, run, frames=len(haz_list),
@@ -1361,6 +1362,62 @@ class Impact():
 
         return imp_list
 
+    @staticmethod
+    def _video_direct_impact_calc(exp, impf_set, haz_list):
+        """Impacts of the events of a chunk of frames of `video_direct_impact`"""
+        imp_list = []
+        for haz in haz_list:
+            imp = Impact()
+            imp.calc(exp, impf_set, haz, assign_centroids=False)
+            imp_list.append(imp)
+        return imp_list
+
+    @staticmethod
+    def _video_direct_impact_plot(fig, axis, haz, exp_mask, imp, exp, v_lim, args_exp,
+                                  args_imp, ignore_zero, pop_name, plot_raster, lon_lim,
+                                  lat_lim):
+        """Plot a single frame of `video_direct_impact` to the given axis
+
+        The color bars of the individual plots are removed from the figure.
+        """
+        haz.plot_intensity(1, axis=axis, cmap='Greys', vmin=v_lim[0], vmax=v_lim[1], alpha=0.8)
+        if plot_raster:
+            exp.plot_hexbin(axis=axis, mask=exp_mask, ignore_zero=ignore_zero,
+                            pop_name=pop_name, **args_exp)
+            if imp.coord_exp.size:
+                imp.plot_hexbin_eai_exposure(axis=axis, pop_name=pop_name, **args_imp)
+                fig.delaxes(fig.axes[1])
+        else:
+            exp.plot_scatter(axis=axis, mask=exp_mask, ignore_zero=ignore_zero,
+                             pop_name=pop_name, **args_exp)
+            if imp.coord_exp.size:
+                imp.plot_scatter_eai_exposure(axis=axis, pop_name=pop_name, **args_imp)
+                fig.delaxes(fig.axes[1])
+        fig.delaxes(fig.axes[1])
+        fig.delaxes(fig.axes[1])
+        axis.set_xlim(*lon_lim)
+        axis.set_ylim(*lat_lim)
+        axis.set_title(haz.event_name[0])
+
+    @staticmethod
+    def _video_direct_impact_frame(frame, path, **plot_params):
+        """Plot a single frame of `video_direct_impact` in a new figure and save it to a file
+
+        Parameters
+        ----------
+        frame : tuple (Hazard, np.ndarray, Impact)
+            Hazard, mask of exposures that are not impacted, and impact of the frame.
+        path : str
+            File to save the frame to.
+        plot_params : dict
+            Parameters of `_video_direct_impact_plot`.
+        """
+        fig, axis, _fontsize = u_plot.make_map()
+        Impact._video_direct_impact_plot(fig, axis, *frame, **plot_params)
+        fig.tight_layout()
+        fig.savefig(path)
+        plt.close(fig)
+
 #TODO: rewrite and deprecate method
     def _loc_return_imp(self, return_periods, imp, exc_imp):
         """Compute local exceedence impact for given return period.
@@ -19,12 +19,15 @@ with CLIMADA. If not, see <https://www.gnu.org/licenses/>.
 Test Impact class.
 """
 import unittest
+import copy
 from pathlib import Path
 from tempfile import TemporaryDirectory
 import numpy as np
 import numpy.testing as npt
 from scipy import sparse
 import h5py
+from pathos.pools import ThreadPool
+from PIL import Image
 
 from climada.entity.tag import Tag
 from climada.hazard.tag import Tag as TagHaz
@@ -98,6 +101,42 @@ class TestImpact(unittest.TestCase):
             np.stack([exp.gdf.latitude.values, exp.gdf.longitude.values], axis=1)
             )
 
+    def test_video_direct_impact_pool(self):
+        """Test video_direct_impact with a thread pool against the sequential computation"""
+        haz_list = []
+        for event_id in HAZ.event_id[np.argsort(HAZ.intensity.max(axis=1).toarray().ravel())[-3:]]:
+            haz = HAZ.select(event_id=[event_id])
+            # the frames plot the event with id 1
+            haz.event_id = np.array([1])
+            haz_list.append(haz)
+
+        with TemporaryDirectory() as tmpdir:
+            file_name = str(Path(tmpdir, "seq.gif"))
+            imp_list = Impact.video_direct_impact(
+                copy.deepcopy(ENT.exposures), ENT.impact_funcs, haz_list, file_name=file_name)
+            with Image.open(file_name) as image:
+                seq_frames, seq_image_size = image.n_frames, image.size
+
+            file_name = str(Path(tmpdir, "pool.gif"))
+            pool = ThreadPool(nodes=2)
+            imp_list_pool = Impact.video_direct_impact(
+                copy.deepcopy(ENT.exposures), ENT.impact_funcs, haz_list, file_name=file_name,
+                pool=pool)
+            pool.close()
+            pool.join()
+            pool.clear()
+            with Image.open(file_name) as image:
+                self.assertEqual(image.n_frames, seq_frames)
+                self.assertEqual(image.size, seq_image_size)
+
+        self.assertEqual(seq_frames, 3)
+        self.assertEqual(len(imp_list_pool), 3)
+        for imp, imp_pool in zip(imp_list, imp_list_pool):
+            np.testing.assert_array_equal(imp_pool.eai_exp, imp.eai_exp)
+            np.testing.assert_array_equal(imp_pool.coord_exp, imp.coord_exp)
+            np.testing.assert_array_equal(imp_pool.at_event, imp.at_event)
+        self.assertGreater(imp_list[-1].eai_exp.size, 0)
+
 
 class TestImpactConcat(unittest.TestCase):
     """test Impact.concat"""
@@ -432,7 +432,8 @@ class Exposures():
         else:
             assigned = u_coord.assign_coordinates(
                 np.stack([self.gdf.latitude.values, self.gdf.longitude.values], axis=1),
-                hazard.centroids.coord, distance=distance, threshold=threshold)
+                hazard.centroids.coord, distance=distance, threshold=threshold,
+                nn_index=hazard.centroids.get_nn_index() if threshold > 0 else None)
         self.gdf[centr_haz] = assigned
 
     def set_geometry_points(self, scheduler=None):
@@ -442,10 +443,10 @@ class Exposures():
         Parameters
         ----------
         scheduler : str, optional
-            used for dask map_partitions.
-            “threads”, “synchronous” or “processes”
+            Not used anymore, see `climada.util.coordinates.set_df_geometry_points`. Kept for
+            backwards compatibility.
         """
-        u_coord.set_df_geometry_points(self.gdf, scheduler=scheduler, crs=self.crs)
+        u_coord.set_df_geometry_points(self.gdf, crs=self.crs)
 
     def set_lat_lon(self):
         """Set latitude and longitude attributes from geometry attribute."""
@@ -631,7 +632,7 @@ class Exposures():
     def plot_raster(self, res=None, raster_res=None, save_tiff=None,
                     raster_f=lambda x: np.log10((np.fmax(x + 1, 1))),
                     label='value (log10)', scheduler=None, axis=None,
-                    figsize=(9, 13), fill=True, adapt_fontsize=True, **kwargs):
+                    figsize=(9, 13), fill=True, adapt_fontsize=True, aggregation=None, **kwargs):
         """Generate raster from points geometry and plot it using log10 scale
         `np.log10((np.fmax(raster+1, 1)))`.
 
@@ -651,8 +652,8 @@ class Exposures():
         label : str
             colorbar label
         scheduler : str
-            used for dask map_partitions. “threads”,
-            “synchronous” or “processes”
+            Not used anymore, see `climada.util.coordinates.points_to_raster`. Kept for
+            backwards compatibility.
         axis : matplotlib.axes._subplots.AxesSubplot, optional
             axis to use
         figsize : tuple, optional
@@ -664,6 +665,9 @@ class Exposures():
         adapt_fontsize : bool, optional
             If set to true, the size of the fonts will be adapted to the size of the figure.
             Otherwise the default matplotlib font size is used. Default is True.
+        aggregation : str, optional
+            How to aggregate the values of several points in the same raster cell, see
+            `climada.util.coordinates.points_to_raster`. Default: None
         kwargs : optional
             arguments for imshow matplotlib function
 
@@ -680,7 +684,8 @@ class Exposures():
             if self.gdf.longitude.values[0] > self.gdf.longitude.values[-1]:
                 raise ValueError('Points are not ordered according to meta raster.')
         else:
-            raster, meta = u_coord.points_to_raster(self.gdf, ['value'], res, raster_res, scheduler)
+            raster, meta = u_coord.points_to_raster(self.gdf, ['value'], res, raster_res,
+                                                    scheduler=scheduler, aggregation=aggregation)
             raster = raster.reshape((meta['height'], meta['width']))
         # save tiff
         if save_tiff is not None:
@@ -952,13 +957,22 @@ class Exposures():
             **metadata
         )
 
-    def write_raster(self, file_name, value_name='value', scheduler=None):
+    def write_raster(self, file_name, value_name='value', scheduler=None, aggregation=None):
         """Write value data into raster file with GeoTiff format
 
         Parameters
         ----------
         file_name : str
             name output file in tif format
+        value_name : str, optional
+            name of the column with the values to write. Default: 'value'
+        scheduler : str, optional
+            Not used anymore, see `climada.util.coordinates.points_to_raster`. Kept for
+            backwards compatibility.
+        aggregation : str, optional
+            How to aggregate the values of several points in the same raster cell, see
+            `climada.util.coordinates.points_to_raster`. Only used if the points are not already
+            given on the raster of `meta`. Default: None
         """
         if self.meta and self.meta['height'] * self.meta['width'] == len(self.gdf):
             raster = self.gdf[value_name].values.reshape((self.meta['height'],
@@ -970,7 +984,8 @@ class Exposures():
                 raise ValueError('Points are not ordered according to meta raster.')
             u_coord.write_raster(file_name, raster, self.meta)
         else:
-            raster, meta = u_coord.points_to_raster(self.gdf, [value_name], scheduler=scheduler)
+            raster, meta = u_coord.points_to_raster(self.gdf, [value_name], scheduler=scheduler,
+                                                    aggregation=aggregation)
             u_coord.write_raster(file_name, raster, meta)
 
     @staticmethod
@@ -1053,8 +1068,8 @@ def add_sea(exposures, sea_res, scheduler=None):
         is distance from coast to fill with water and second parameter
         is resolution between sea points
     scheduler : str, optional
-        used for dask map_partitions.
-        “threads”, “synchronous” or “processes”
+        Not used anymore, see `climada.util.coordinates.set_df_geometry_points`. Kept for
+        backwards compatibility.
 
     Returns
     -------
@@ -1083,7 +1098,7 @@ def add_sea(exposures, sea_res, scheduler=None):
     sea_exp_gdf['region_id'] = np.zeros(sea_exp_gdf.latitude.size, int) - 1
 
     if 'geometry' in exposures.gdf.columns:
-        u_coord.set_df_geometry_points(sea_exp_gdf, crs=exposures.crs, scheduler=scheduler)
+        u_coord.set_df_geometry_points(sea_exp_gdf, crs=exposures.crs)
 
     for var_name in exposures.gdf.columns:
         if var_name not in ('latitude', 'longitude', 'region_id', 'geometry'):
@@ -753,15 +753,18 @@ def _get_litpop_single_polygon(polygon, reference_year, res_arcsec, data_dir,
     lon, lat = u_coord.raster_to_meshgrid(meta_out['transform'],
                                           meta_out['width'],
                                           meta_out['height'])
+    # only keep the entries within the polygon (not NaN), keeping their position in the raster
+    # as index, so that the geometries of the masked grid points are never constructed:
+    litpop_array = litpop_array.flatten()
+    in_polygon = np.flatnonzero(~np.isnan(litpop_array))
+    lat = np.round_(lat.flatten()[in_polygon], decimals = 8, out = None)
+    lon = np.round_(lon.flatten()[in_polygon], decimals = 8, out = None)
     # init GeoDataFrame from data and coordinates:
-    gdf = geopandas.GeoDataFrame({'value': litpop_array.flatten()}, crs=meta_out['crs'],
-                                 geometry=geopandas.points_from_xy(
-                                     np.round_(lon.flatten(), decimals = 8, out = None),
-                                     np.round_(lat.flatten(), decimals = 8, out = None)
-                                     )
-                                 )
-    gdf['latitude'] = np.round_(lat.flatten(), decimals = 8, out = None)
-    gdf['longitude'] = np.round_(lon.flatten(), decimals = 8, out = None)
+    gdf = geopandas.GeoDataFrame({'value': litpop_array[in_polygon]}, index=in_polygon,
+                                 crs=meta_out['crs'],
+                                 geometry=geopandas.points_from_xy(lon, lat))
+    gdf['latitude'] = lat
+    gdf['longitude'] = lon
     if region_id is not None: # set region_id
         gdf['region_id'] = region_id
     else:
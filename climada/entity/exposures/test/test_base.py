@@ -312,6 +312,20 @@ class TestIO(unittest.TestCase):
             self.assertEqual(point_df.x, point_read.x)
             self.assertEqual(point_df.y, point_read.y)
 
+    def test_write_raster_aggregation(self):
+        """write_raster with several points in the same raster cell"""
+        exp = Exposures(gpd.GeoDataFrame({
+            'latitude': [0, 0, 1, 1, 1, 0],
+            'longitude': [10, 11, 10, 12, 12, 10],
+            'value': [1, 2, 3, 4, -5, 6],
+        }), crs=DEF_CRS)
+        file_name = DATA_DIR.joinpath('test_write_raster_exp.tif')
+        for aggregation, ref in [(None, [[3, 0, -5], [6, 2, 0]]),
+                                 ("sum", [[3, 0, -1], [7, 2, 0]])]:
+            exp.write_raster(file_name, aggregation=aggregation)
+            with rasterio.open(file_name) as src:
+                np.testing.assert_array_almost_equal(src.read(1), ref)
+
 class TestAddSea(unittest.TestCase):
     """Check constructor Exposures through DataFrames readers"""
     def test_add_sea_pass(self):
@@ -1188,8 +1188,8 @@ class Hazard():
         Parameters
         ----------
         scheduler : str, optional
-            used for dask map_partitions. “threads”,
-            “synchronous” or “processes”
+            Not used anymore, see `climada.util.coordinates.points_to_raster`. Kept for
+            backwards compatibility.
         """
         points_df = gpd.GeoDataFrame()
         points_df['latitude'] = self.centroids.lat
@@ -2252,10 +2252,9 @@ class Hazard():
         attribute value is identical among the given hazard objects. The initial attribute value of
         `self` will not be modified.
 
-        Note: Each of the hazard's `centroids` attributes might be modified in place in the sense
-        that missing properties are added, but existing ones are not overwritten. In case of raster
-        centroids, conversion to point centroids is applied so that raster information (meta) is
-        lost. For more information, see `Centroids.union`.
+        Note: In case of raster centroids, each of the hazard's `centroids` attributes might be
+        converted to point centroids in place so that raster information (meta) is lost. For more
+        information, see `Centroids.union`.
 
         Parameters
         ----------
@@ -2318,10 +2317,10 @@ class Hazard():
                 self.tag.append(haz.tag)
 
         # map individual centroids objects to union
-        centroids = Centroids.union(*[haz.centroids for haz in haz_list])
+        centroids, hazcent_in_cent_idx_list = Centroids.union(
+            *[haz.centroids for haz in haz_list], return_mapping=True)
         hazcent_in_cent_idx_list = [
-            u_coord.assign_coordinates(haz.centroids.coord, centroids.coord, threshold=0)
-            for haz in haz_list_nonempty
+            cent_idx for haz, cent_idx in zip(haz_list, hazcent_in_cent_idx_list) if haz.size > 0
         ]
 
         # concatenate array and list attributes of non-empty hazards
@@ -2442,7 +2441,8 @@ class Hazard():
                                  " Please choose a larger raster.")
         else:
             new_cent_idx = u_coord.assign_coordinates(
-                self.centroids.coord, centroids.coord, threshold=threshold
+                self.centroids.coord, centroids.coord, threshold=threshold,
+                nn_index=centroids.get_nn_index() if threshold > 0 else None,
             )
             if -1 in new_cent_idx:
                 raise ValueError("At least one hazard centroid is at a larger "
@@ -34,7 +34,6 @@ from pyproj.crs import CRS
 import rasterio
 from rasterio.warp import Resampling
 from scipy import sparse
-from shapely.geometry.point import Point
 
 from climada.util.constants import (DEF_CRS,
                                     ONE_LAT_KM,
@@ -705,48 +704,79 @@ class Centroids():
         self.__dict__.update(self.union(centr).__dict__)
 
 
-    def union(self, *others):
+    def union(self, *others, return_mapping=False):
         """
         Create the union of centroids from the inputs.
 
-        The centroids are combined together point by point.
-        Rasters are converted to points and raster information is lost
-        in the output. All centroids must have the same CRS.
+        The centroids are combined together point by point, in the order of their first
+        occurrence. Duplicate points are identified by their exact coordinates. Rasters are
+        converted to points and raster information is lost in the output. All centroids must have
+        the same CRS. If all centroids are equal (see `equal`), a copy of the first ones is
+        returned.
 
-        In any case, the attribute .geometry is computed for all centroids.
-        This requires a CRS to be defined. If Centroids.crs is None, the
-        default DEF_CRS is set for all centroids (self and others).
+        The properties .area_pixel, .dist_coast, .on_land, .region_id and .elevation are only
+        transferred to the output if they are defined in all of the (non-empty) inputs.
+        Otherwise, they are left empty and can be computed for the union when needed, e.g., with
+        `set_on_land`.
 
-        When at least one centroids has one of the following property
-        defined, it is also computed for all others.
-        .area_pixel, .dist_coast, .on_land, .region_id, .elevetaion'
-
-        !Caution!: the input objects (self and others) are modified in place.
-        Missing properties are added, existing ones are not overwritten.
+        !Caution!: raster centroids among the inputs (self and others) are converted to points in
+        place, see `set_meta_to_lat_lon`.
 
         Parameters
         ----------
         others : any number of climada.hazard.Centroids()
             Centroids to form the union with
+        return_mapping : bool, optional
+            If True, also return the positions of the points of each input in the union.
+            Default: False
 
         Returns
         -------
         centroids : Centroids
             Centroids containing the union of the centroids in others.
+        mapping : list of np.array
+            Only if `return_mapping` is True. For each input (self and others), the index of
+            each of its points in the union.
 
         Raises
         ------
         ValueError
         """
+        all_cent = (self,) + others
         # restrict to non-empty centroids
-        cent_list = [c for c in (self,) + others if c.size > 0 or c.meta] # pylint: disable=no-member
+        cent_list = [c for c in all_cent if c.size > 0 or c.meta] # pylint: disable=no-member
         if len(cent_list) == 0 or len(others) == 0:
-            return copy.deepcopy(self)
-
+            centroids = copy.deepcopy(self)
+            mapping = [np.arange(cent.size if cent in cent_list else 0) for cent in all_cent]
         # check if all centroids are identical
-        if all([cent_list[0].equal(cent) for cent in cent_list[1:]]):
-            return copy.deepcopy(cent_list[0])
+        elif all([cent_list[0].equal(cent) for cent in cent_list[1:]]):
+            centroids = copy.deepcopy(cent_list[0])
+            mapping = [np.arange(cent.size if cent in cent_list else 0) for cent in all_cent]
+        else:
+            centroids, mapping = self._union_points(cent_list)
+            mapping = iter(mapping)
+            mapping = [next(mapping) if cent in cent_list else np.zeros(0, dtype=np.int64)
+                       for cent in all_cent]
+        if return_mapping:
+            return centroids, mapping
+        return centroids
+
+    @staticmethod
+    def _union_points(cent_list):
+        """Union of non-empty centroids that are not all equal, see `union`
 
+        Parameters
+        ----------
+        cent_list : list of Centroids
+            Non-empty centroids to combine.
+
+        Returns
+        -------
+        centroids : Centroids
+            Point centroids containing the union of the centroids in cent_list.
+        mapping : list of np.array
+            For each of the centroids in cent_list, the index of each of its points in the union.
+        """
         # convert all raster centroids to point centroids
         for cent in cent_list:
             if cent.meta and not cent.lat.any():
@@ -754,32 +784,30 @@ class Centroids():
 
         # make sure that all Centroids have the same CRS
         for cent in cent_list:
-            if cent.crs is None:
-                cent.geometry = cent.geometry.set_crs(DEF_CRS)
             if not u_coord.equal_crs(cent.crs, cent_list[0].crs):
                 raise ValueError('In a union, all Centroids need to have the same CRS: '
                                  f'{cent.crs} != {cent_list[0].crs}')
 
-        # set attributes that are missing in some but defined in others
-        for attr in ["geometry", "area_pixel", "dist_coast", "on_land", "region_id", "elevation"]:
-            if np.any([getattr(cent, attr).size > 0 for cent in cent_list]):
-                for cent in cent_list:
-                    if not getattr(cent, attr).size > 0:
-                        fun_name = f"set_{attr}{'_points' if attr == 'geometry' else ''}"
-                        getattr(Centroids, fun_name)(cent)
-
-        # create new Centroids object and set concatenated attributes
-        centroids = Centroids()
-        for attr_name, attr_val in vars(cent_list[0]).items():
-            if isinstance(attr_val, np.ndarray) and attr_val.ndim == 1:
-                attr_val_list = [getattr(cent, attr_name) for cent in cent_list]
-                setattr(centroids, attr_name, np.hstack(attr_val_list))
-            elif isinstance(attr_val, gpd.GeoSeries):
-                attr_val_list = [getattr(cent, attr_name) for cent in cent_list]
-                setattr(centroids, attr_name, pd.concat(attr_val_list, ignore_index=True))
-
-        # finally, remove duplicate points
-        return centroids.remove_duplicate_points()
+        # identify duplicate points by hashing the coordinates as structured (lat, lon) keys
+        coord = np.concatenate([cent.coord.astype(np.float64) for cent in cent_list], axis=0)
+        coords_view = np.ascontiguousarray(coord).view(dtype='float64,float64').ravel()
+        _, first_idx, key_idx = np.unique(coords_view, return_index=True, return_inverse=True)
+        # the union keeps the points in the order of their first occurrence
+        order = np.argsort(first_idx)
+        sel_cen = first_idx[order]
+        union_idx = np.empty(order.size, dtype=np.int64)
+        union_idx[order] = np.arange(order.size)
+        mapping = np.split(union_idx[key_idx.ravel()],
+                           np.cumsum([cent.size for cent in cent_list])[:-1])
+
+        centroids = Centroids.from_lat_lon(coord[sel_cen, 0], coord[sel_cen, 1],
+                                           cent_list[0].crs)
+        for attr in ["area_pixel", "dist_coast", "on_land", "region_id", "elevation"]:
+            attr_val_list = [getattr(cent, attr) for cent in cent_list]
+            if all(attr_val.ndim == 1 and attr_val.size == cent.size
+                   for attr_val, cent in zip(attr_val_list, cent_list)):
+                setattr(centroids, attr, np.concatenate(attr_val_list)[sel_cen])
+        return centroids, mapping
 
     def get_closest_point(self, x_lon, y_lat, scheduler=None):
         """Returns closest centroid and its index to a given point.
@@ -791,7 +819,8 @@ class Centroids():
         y_lat : float
             y coord (lat)
         scheduler : str
-            used for dask map_partitions. “threads”, “synchronous” or “processes”
+            Not used anymore since the closest point is found using the cached nearest neighbor
+            index (see `get_nn_index`). Kept for backwards compatibility.
 
         Returns
         -------
@@ -810,22 +839,67 @@ class Centroids():
             i_lon = np.clip(i_lon, 0, self.meta['width'] - 1)
             close_idx = int(i_lat * self.meta['width'] + i_lon)
         else:
-            self.set_geometry_points(scheduler)
-            close_idx = self.geometry.distance(Point(x_lon, y_lat)).values.argmin()
+            # the euclidean distance in radians is proportional to the planar distance
+            _, close_idx = self.get_nn_index().tree("euclidean").query(
+                np.radians([y_lat, x_lon]))
+            close_idx = int(close_idx)
         return self.lon[close_idx], self.lat[close_idx], close_idx
 
+    def get_nn_index(self):
+        """Return the nearest neighbor index of the centroids' coordinates
+
+        The index is cached and reused as long as the coordinates are not modified. Its search
+        trees are built on first use. It is used for the nearest neighbor matching in
+        `Exposures.assign_centroids`, `Hazard.change_centroids` and `get_closest_point`.
+
+        The coordinates are compared with the cached index by their hash, see
+        `climada.util.coordinates.NearestNeighborIndex.matches`. This is linear in the number of
+        centroids, but much cheaper than building a search tree.
+
+        Returns
+        -------
+        climada.util.coordinates.NearestNeighborIndex
+        """
+        if self.meta and not self.lat.size:
+            self.set_meta_to_lat_lon()
+        coord = self.coord
+        nn_index = getattr(self, '_nn_index', None)
+        if nn_index is None or not nn_index.matches(coord):
+            nn_index = u_coord.NearestNeighborIndex(coord)
+            self._nn_index = nn_index
+        return nn_index
+
+    def set_nn_index(self, nn_index):
+        """Set the nearest neighbor index, e.g., after reading it from a file
+
+        Parameters
+        ----------
+        nn_index : climada.util.coordinates.NearestNeighborIndex
+            Index of the coordinates of these centroids.
+
+        Raises
+        ------
+        ValueError
+            If the index has been built for different coordinates.
+        """
+        if self.meta and not self.lat.size:
+            self.set_meta_to_lat_lon()
+        if not nn_index.matches(self.coord):
+            raise ValueError("The nearest neighbor index does not match the coordinates of the"
+                             " centroids.")
+        self._nn_index = nn_index
+
     def set_region_id(self, scheduler=None):
         """Set region_id as country ISO numeric code attribute for every pixel or point.
 
         Parameters
         ----------
         scheduler : str
-            used for dask map_partitions. “threads”, “synchronous” or “processes”
+            Not used anymore, see `set_geometry_points`. Kept for backwards compatibility.
         """
-        ne_geom = self._ne_crs_geom(scheduler)
+        ne_x, ne_y = self._ne_crs_xy()
         LOGGER.debug('Setting region_id %s points.', str(self.lat.size))
-        self.region_id = u_coord.get_country_code(
-            ne_geom.geometry[:].y.values, ne_geom.geometry[:].x.values)
+        self.region_id = u_coord.get_country_code(ne_y, ne_x)
 
     def set_area_pixel(self, min_resol=1.0e-8, scheduler=None):
         """Set `area_pixel` attribute for every pixel or point (area in m*m).
@@ -835,7 +909,7 @@ class Centroids():
         min_resol : float, optional
             if centroids are points, use this minimum resolution in lat and lon. Default: 1.0e-8
         scheduler : str
-            used for dask map_partitions. “threads”, “synchronous” or “processes”
+            Not used anymore, see `set_geometry_points`. Kept for backwards compatibility.
         """
         if self.meta:
             if hasattr(self.meta['crs'], 'linear_units') and \
@@ -910,7 +984,7 @@ class Centroids():
             self.set_meta_to_lat_lon()
         self.elevation = u_coord.read_raster_sample(topo_path, self.lat, self.lon)
 
-    def set_dist_coast(self, signed=False, precomputed=False, scheduler=None):
+    def set_dist_coast(self, signed=False, precomputed=False, scheduler=None, method="utm"):
         """Set dist_coast attribute for every pixel or point in meters.
 
         Parameters
@@ -920,7 +994,11 @@ class Centroids():
         precomputed : bool
             If True, use precomputed distances (from NASA). Default: False.
         scheduler : str
-            Used for dask map_partitions. "threads", "synchronous" or "processes"
+            Not used anymore, see `set_geometry_points`. Kept for backwards compatibility.
+        method : str, optional
+            Method to compute the distances if `precomputed` is False, one of "utm" or "index".
+            The indexed great-circle distance ("index") is much faster for large numbers of
+            centroids. See `climada.util.coordinates.dist_to_coast`. Default: "utm"
         """
         if (not self.lat.size or not self.lon.size) and not self.meta:
             LOGGER.warning('No lat/lon, no meta, nothing to do!')
@@ -931,9 +1009,9 @@ class Centroids():
             self.dist_coast = u_coord.dist_to_coast_nasa(
                 self.lat, self.lon, highres=True, signed=signed)
         else:
-            ne_geom = self._ne_crs_geom(scheduler)
+            ne_x, ne_y = self._ne_crs_xy()
             LOGGER.debug('Computing distance to coast for %s centroids.', str(self.lat.size))
-            self.dist_coast = u_coord.dist_to_coast(ne_geom, signed=signed)
+            self.dist_coast = u_coord.dist_to_coast(ne_y, ne_x, signed=signed, method=method)
 
     def set_on_land(self, scheduler=None):
         """Set on_land attribute for every pixel or point.
@@ -941,12 +1019,11 @@ class Centroids():
         Parameters
         ----------
         scheduler : str
-            used for dask map_partitions. “threads”, “synchronous” or “processes”
+            Not used anymore, see `set_geometry_points`. Kept for backwards compatibility.
         """
-        ne_geom = self._ne_crs_geom(scheduler)
+        ne_x, ne_y = self._ne_crs_xy()
         LOGGER.debug('Setting on_land %s points.', str(self.lat.size))
-        self.on_land = u_coord.coord_on_land(
-            ne_geom.geometry[:].y.values, ne_geom.geometry[:].x.values)
+        self.on_land = u_coord.coord_on_land(ne_y, ne_x)
 
     def remove_duplicate_points(self):
         """Return Centroids with removed duplicated points
@@ -962,8 +1039,8 @@ class Centroids():
             coords_view = self.coord.astype(np.float64).view(dtype='float64,float64')
             sel_cen = np.sort(np.unique(coords_view, return_index=True)[1])
         else:
-            geom_wkb = self.geometry.apply(lambda geom: geom.wkb)
-            sel_cen = geom_wkb.drop_duplicates().index
+            # the pixels of a raster are unique
+            sel_cen = np.arange(self.size)
         return self.select(sel_cen=sel_cen)
 
     def select(self, reg_id=None, extent=None, sel_cen=None):
@@ -1110,7 +1187,7 @@ class Centroids():
         Parameters
         ----------
         scheduler : str
-            used for dask map_partitions. “threads”, “synchronous” or “processes”
+            Not used anymore, see `set_geometry_points`. Kept for backwards compatibility.
 
         Returns
         -------
@@ -1168,6 +1245,8 @@ class Centroids():
                             dtype=float)
             elif centr_name == 'geometry':
                 LOGGER.debug("Skip writing Centroids.geometry")
+            elif centr_name.startswith('_'):
+                LOGGER.debug("Skip writing Centroids.%s", centr_name)
             else:
                 LOGGER.info("Skip writing Centroids.%s:%s, it's neither an array nor a non-empty"
                             " meta object", centr_name, centr_val.__class__.__name__)
@@ -1285,24 +1364,34 @@ class Centroids():
         Parameters
         ----------
         scheduler : str
-            used for dask map_partitions. “threads”, “synchronous” or “processes”
+            Not used anymore since the points are constructed from the coordinate arrays in a
+            single vectorized call. Kept for backwards compatibility.
         """
-        def apply_point(df_exp):
-            return df_exp.apply((lambda row: Point(row.longitude, row.latitude)), axis=1)
         if not self.geometry.size:
             LOGGER.info('Convert centroids to GeoSeries of Point shapes.')
             if (not self.lat.any() or not self.lon.any()) and self.meta:
                 self.set_meta_to_lat_lon()
-            if not scheduler:
-                self.geometry = gpd.GeoSeries(
-                    gpd.points_from_xy(self.lon, self.lat), crs=self.geometry.crs)
-            else:
-                import dask.dataframe as dd
-                from multiprocessing import cpu_count
-                ddata = dd.from_pandas(self, npartitions=cpu_count())
-                self.geometry = (ddata
-                                 .map_partitions(apply_point, meta=Point)
-                                 .compute(scheduler=scheduler))
+            self.geometry = gpd.GeoSeries(
+                gpd.points_from_xy(self.lon, self.lat), crs=self.geometry.crs)
+
+    def _ne_crs_xy(self):
+        """Return `lon` and `lat` attributes in the CRS of Natural Earth.
+
+        The point geometries are only constructed if the centroids are in a different CRS.
+
+        Returns
+        -------
+        x : np.array
+            x-coordinates (longitudes) in the CRS of Natural Earth
+        y : np.array
+            y-coordinates (latitudes) in the CRS of Natural Earth
+        """
+        if not self.lat.size or not self.lon.size:
+            self.set_meta_to_lat_lon()
+        if u_coord.equal_crs(self.geometry.crs, u_coord.NE_CRS):
+            return self.lon, self.lat
+        ne_geom = self._ne_crs_geom()
+        return ne_geom.geometry[:].x.values, ne_geom.geometry[:].y.values
 
     def _ne_crs_geom(self, scheduler=None):
         """Return `geometry` attribute in the CRS of Natural Earth.
@@ -1310,7 +1399,7 @@ class Centroids():
         Parameters
         ----------
         scheduler : str
-            used for dask map_partitions. “threads”, “synchronous” or “processes”
+            Not used anymore, see `set_geometry_points`. Kept for backwards compatibility.
 
         Returns
         -------
@@ -1323,12 +1412,23 @@ class Centroids():
         self.set_geometry_points(scheduler)
         return self.geometry.to_crs(u_coord.NE_CRS)
 
+    def __copy__(self):
+        """Shallow copy without the cached nearest neighbor index (see `get_nn_index`)."""
+        result = self.__class__.__new__(self.__class__)
+        result.__dict__.update(
+            {key: value for key, value in self.__dict__.items() if key != '_nn_index'})
+        return result
+
     def __deepcopy__(self, memo):
-        """Avoid error deep copy in gpd.GeoSeries by setting only the crs."""
+        """Avoid error deep copy in gpd.GeoSeries by setting only the crs.
+
+        The cached nearest neighbor index (see `get_nn_index`) is not copied."""
         cls = self.__class__
         result = cls.__new__(cls)
         memo[id(self)] = result
         for key, value in self.__dict__.items():
+            if key == '_nn_index':
+                continue
             if key == 'geometry':
                 setattr(result, key, gpd.GeoSeries(crs=self.geometry.crs))
             else:
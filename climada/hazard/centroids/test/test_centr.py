@@ -167,6 +167,30 @@ class TestCentroidsMethods(unittest.TestCase):
         np.testing.assert_array_equal(cent.lon, [0, -1, -2, 3, 1, 2])
 
 
+    def test_union_mapping(self):
+        """Test union with return_mapping and attributes missing in some inputs"""
+        cent1 = Centroids(lat=np.array([0, 1]), lon=np.array([0, -1]),
+                          on_land=np.array([True, True]), region_id=np.array([1, 2]))
+        cent2 = Centroids(lat=np.array([2, 1, 0]), lon=np.array([-2, -1, 0]),
+                          on_land=np.array([False, True, True]))
+        cent_empty = Centroids(lat=np.array([]), lon=np.array([]))
+
+        cent, mapping = cent1.union(cent_empty, cent2, return_mapping=True)
+        np.testing.assert_array_equal(cent.lat, [0, 1, 2])
+        np.testing.assert_array_equal(cent.lon, [0, -1, -2])
+        np.testing.assert_array_equal(cent.on_land, [True, True, False])
+        # region_id is not defined for all inputs, it is not computed for the union
+        self.assertEqual(cent.region_id.size, 0)
+        self.assertEqual(len(mapping), 3)
+        np.testing.assert_array_equal(mapping[0], [0, 1])
+        np.testing.assert_array_equal(mapping[1], [])
+        np.testing.assert_array_equal(mapping[2], [2, 1, 0])
+
+        cent, mapping = cent1.union(cent1, return_mapping=True)
+        np.testing.assert_array_equal(cent.lat, [0, 1])
+        np.testing.assert_array_equal(mapping[0], [0, 1])
+        np.testing.assert_array_equal(mapping[1], [0, 1])
+
     def test_union_meta(self):
         cent1 = Centroids.from_pnt_bounds((-1, -1, 0, 0), res=1)
         cent2 = Centroids.from_pnt_bounds((0, 0, 1, 1), res=1)
@@ -18,6 +18,7 @@ with CLIMADA. If not, see <https://www.gnu.org/licenses/>.
 
 Test CentroidsVector and CentroidsRaster classes.
 """
+import copy
 import unittest
 
 from cartopy.io import shapereader
@@ -192,6 +193,16 @@ class TestVector(unittest.TestCase):
         self.assertEqual(np.count_nonzero(centr.region_id), 6)
         self.assertEqual(centr.region_id[0], 52)  # 052 for barbados
 
+    def test_region_id_on_land_no_geometry(self):
+        """Test that set_region_id and set_on_land don't construct point geometries"""
+        lat, lon, _ = data_vector()
+        centr = Centroids.from_lat_lon(lat, lon)
+        centr.set_region_id()
+        centr.set_on_land()
+        self.assertEqual(centr.geometry.size, 0)
+        self.assertEqual(centr.region_id[0], 52)  # 052 for barbados
+        self.assertEqual(centr.on_land.size, lat.size)
+
     def test_on_land(self):
         """Test set_on_land"""
         lat, lon, geometry = data_vector()
@@ -260,6 +271,35 @@ class TestVector(unittest.TestCase):
         self.assertEqual(centr.lon[idx], x)
         self.assertEqual(centr.lat[idx], y)
 
+    def test_get_nn_index(self):
+        """Test caching and invalidation of the nearest neighbor index"""
+        lat, lon, geometry = data_vector()
+        geometry.crs = 'epsg:4326'
+        centr = Centroids(lat=lat, lon=lon, geometry=geometry)
+        nn_index = centr.get_nn_index()
+        self.assertIs(centr.get_nn_index(), nn_index)
+        np.testing.assert_array_equal(nn_index.coords, centr.coord)
+
+        # copies don't carry the index along
+        self.assertFalse(hasattr(copy.deepcopy(centr), '_nn_index'))
+        self.assertFalse(hasattr(copy.copy(centr), '_nn_index'))
+
+        centr_other = Centroids(lat=lat.copy(), lon=lon.copy())
+        centr_other.set_nn_index(nn_index)
+        self.assertIs(centr_other.get_nn_index(), nn_index)
+
+        # modifying the coordinates invalidates the index, also in place
+        centr.lon[centr.size // 2 + 1] += 1
+        nn_index_mod = centr.get_nn_index()
+        self.assertIsNot(nn_index_mod, nn_index)
+        centr.lon[centr.size // 2 + 1] -= 1
+        centr.set_nn_index(nn_index)
+        centr.lat = centr.lat.copy()
+        centr.lat[0] += 1
+        self.assertIsNot(centr.get_nn_index(), nn_index)
+        with self.assertRaises(ValueError):
+            centr.set_nn_index(nn_index)
+
     def test_set_lat_lon_to_meta_pass(self):
         """Test set_lat_lon_to_meta"""
         lat, lon, geometry = data_vector()
@@ -19,13 +19,15 @@ with CLIMADA. If not, see <https://www.gnu.org/licenses/>.
 Define TCTracks: IBTracs reader and tracks manager.
 """
 
-__all__ = ['CAT_NAMES', 'SAFFIR_SIM_CAT', 'TCTracks', 'set_category']
+__all__ = ['CAT_NAMES', 'SAFFIR_SIM_CAT', 'TCTracks', 'TCTracksRagged', 'set_category']
 
 # standard libraries
 import contextlib
 import datetime as dt
+import hashlib
 import itertools
 import logging
+import os
 from typing import Optional, List
 import pathlib
 import re
@@ -47,10 +49,9 @@ import netCDF4 as nc
 import numba
 import numpy as np
 import pandas as pd
+import scipy.interpolate
 import scipy.io.matlab as matlab
-from shapely.geometry import Point, LineString, MultiLineString
-import shapely.ops
-from sklearn.metrics import DistanceMetric
+import shapely
 import statsmodels.api as sm
 import xarray as xr
 from xarray.backends import NetCDF4DataStore
@@ -95,6 +96,24 @@ s. https://www.ncdc.noaa.gov/ibtracs/index.php?name=ib-v4-access"""
 IBTRACS_FILE = 'IBTrACS.ALL.v04r00.nc'
 """IBTrACS v4.0 file all"""
 
+IBTRACS_CACHE_DIR = SYSTEM_DIR.joinpath('ibtracs_cache')
+"""Folder where processed IBTrACS data is cached by `TCTracks.from_ibtracs_netcdf`"""
+
+IBTRACS_CACHE_VERSION = 1
+"""Version of the processing in `TCTracks.from_ibtracs_netcdf`, part of the cache key. Increment
+this whenever the processing changes."""
+
+RAGGED_RECORD_CHUNKSIZE = 2**16
+"""Chunk size along the record dimension when writing tracks with `TCTracksRagged.write_netcdf`"""
+
+TRACK_SUMMARY_COLUMNS = ['genesis_basin', 'basins', 'year', 'size',
+                         'lon_min', 'lat_min', 'lon_max', 'lat_max']
+"""Columns of `TCTracks.summary` that are derived from the track variables"""
+
+LON_GAP_MIN = 2
+"""Minimum longitudinal gap (in degrees) between track positions that is considered by the bounds
+of a set of tracks (see `climada.util.coordinates.lon_bounds`)"""
+
 IBTRACS_AGENCIES = [
     'usa', 'tokyo', 'newdelhi', 'reunion', 'bom', 'nadi', 'wellington',
     'cma', 'hko', 'ds824', 'td9636', 'td9635', 'neumann', 'mlc',
@@ -208,6 +227,7 @@ class TCTracks():
         self.pool = pool
         if pool:
             LOGGER.debug('Using %s CPUs.', self.pool.ncpus)
+        self._summary_cache = ([], None)
 
     def append(self, tracks):
         """Append tracks to current.
@@ -271,13 +291,21 @@ class TCTracks():
         """
         out = self.__class__(pool=self.pool)
         out.data = self.data
+        if not filterdict or self.size == 0:
+            return out
 
+        # only the basins are taken from the cached summary, the attributes are read directly
+        summary = self._get_track_summary()
+        match = np.ones(self.size, dtype=bool)
         for key, pattern in filterdict.items():
             if key == "basin":
-                out.data = [ds for ds in out.data if pattern in ds.basin]
+                match &= summary['basins'].map(lambda basins: pattern in basins).values
             else:
-                out.data = [ds for ds in out.data if ds.attrs[key] == pattern]
+                match &= np.array([track.attrs[key] == pattern for track in self.data], dtype=bool)
 
+        out.data = [ds for ds, sel in zip(self.data, match) if sel]
+        fingerprints = [fp for fp, sel in zip(self._summary_cache[0], match) if sel]
+        out._summary_cache = (fingerprints, summary[match].reset_index(drop=True))
         return out
 
     def tracks_in_exp(self, exposure, buffer=1.0):
@@ -309,10 +337,15 @@ class TCTracks():
             exposure.set_geometry_points()
 
         exp_buffer = exposure.gdf.buffer(distance=buffer, resolution=0)
-        exp_buffer = exp_buffer.unary_union
-
         tc_tracks_lines = self.to_geodataframe().buffer(distance=buffer)
-        select_tracks = tc_tracks_lines.intersects(exp_buffer)
+
+        # Instead of testing against the union of all exposure buffers, use a spatial index
+        # (R-tree) of the exposure buffers: only pairs with intersecting bounding boxes are
+        # tested exactly, and a track is selected if it intersects any of the exposure buffers.
+        tree = shapely.STRtree(np.asarray(exp_buffer.values))
+        track_idx, _ = tree.query(np.asarray(tc_tracks_lines.values), predicate='intersects')
+        select_tracks = np.zeros(self.size, dtype=bool)
+        select_tracks[track_idx] = True
         tracks_in_exp = [track for j, track in enumerate(self.data) if select_tracks[j]]
         filtered_tracks = TCTracks(tracks_in_exp)
 
@@ -329,7 +362,7 @@ class TCTracks():
                             year_range=None, basin=None, genesis_basin=None,
                             interpolate_missing=True, estimate_missing=False, correct_pres=False,
                             discard_single_points=True,
-                            file_name='IBTrACS.ALL.v04r00.nc'):
+                            file_name='IBTrACS.ALL.v04r00.nc', cache=False, pool=None):
         """Create new TCTracks object from IBTrACS databse.
 
         When using data from IBTrACS, make sure to be familiar with the scope and limitations of
@@ -438,6 +471,15 @@ class TCTracks():
         file_name : str, optional
             Name of NetCDF file to be dowloaded or located at climada/data/system.
             Default: 'IBTrACS.ALL.v04r00.nc'
+        cache : bool, optional
+            If True, the processed tracks are stored in a single NetCDF file (in the columnar
+            format of `TCTracksRagged.write_netcdf`) in the folder `IBTRACS_CACHE_DIR`. Subsequent
+            calls with the same parameters and the same version of the IBTrACS file load the
+            tracks from there instead of processing the raw IBTrACS data again. If the cache file
+            cannot be read, the raw IBTrACS data is processed again. Default: False
+        pool : pathos.pool, optional
+            Pool that will be used to process the storms in parallel, in chunks of storms with
+            similar numbers of track positions. Default: None
 
         Returns
         -------
@@ -471,6 +513,23 @@ class TCTracks():
                            "this function, which will download the most recent version of the "
                            "IBTrACS data set from the official URL.", ibtracs_date, ibtracs_path)
 
+        if cache:
+            cache_path = _ibtracs_cache_path(
+                ibtracs_path, ibtracs_date, provider=provider,
+                rescale_windspeeds=rescale_windspeeds, storm_id=storm_id, year_range=year_range,
+                basin=basin, genesis_basin=genesis_basin, interpolate_missing=interpolate_missing,
+                estimate_missing=estimate_missing, discard_single_points=discard_single_points)
+            if cache_path.is_file():
+                LOGGER.info("Reading processed IBTrACS data from cache: %s", cache_path)
+                try:
+                    cached_tracks = TCTracksRagged.from_netcdf(cache_path).to_list()
+                except Exception as err:  # pylint: disable=broad-except
+                    LOGGER.warning("Failed to read cached IBTrACS data %s, processing the raw"
+                                   " data instead: %s", cache_path, err)
+                else:
+                    ibtracs_ds.close()
+                    return cls(cached_tracks)
+
         match = np.ones(ibtracs_ds.sid.shape[0], dtype=bool)
         if storm_id is not None:
             if not isinstance(storm_id, list):
@@ -614,105 +673,52 @@ class TCTracks():
 
         max_wind = ibtracs_ds.wind.max(dim="date_time").data.ravel()
         category_test = (max_wind[:, None] < np.array(SAFFIR_SIM_CAT)[None])
-        category = np.argmax(category_test, axis=1) - 1
-        basin_map = {b.encode("utf-8"): v for b, v in BASIN_ENV_PRESSURE.items()}
-        basin_fun = lambda b: basin_map[b]
+        ibtracs_ds['category'] = ('storm', np.argmax(category_test, axis=1) - 1)
 
         ibtracs_ds['id_no'] = (ibtracs_ds.sid.str.replace(b'N', b'0')
                                .str.replace(b'S', b'1')
                                .astype(float))
+        ibtracs_ds['storm_idx'] = ('storm', np.arange(ibtracs_ds.sid.size))
 
-        last_perc = 0
-        all_tracks = []
-        for i_track, t_msk in enumerate(ibtracs_ds.valid_t.data):
-            perc = 100 * len(all_tracks) / ibtracs_ds.sid.size
-            if perc - last_perc >= 10:
-                LOGGER.info("Progress: %d%%", perc)
-                last_perc = perc
-            track_ds = ibtracs_ds.sel(storm=i_track, date_time=t_msk)
-            tr_basin_penv = xr.apply_ufunc(basin_fun, track_ds.basin, vectorize=True)
-            tr_genesis_basin = track_ds.basin.values[0].astype(str).item()
-
-            # Now that the valid time steps have been selected, we discard this track if it
-            # doesn't fit the specified basin definitions:
-            if genesis_basin is not None and tr_genesis_basin != genesis_basin:
-                continue
-            if basin is not None and basin.encode() not in track_ds.basin.values:
-                continue
+        if pool:
+            # consecutive chunks of storms with similar numbers of valid positions, the data is
+            # not loaded here, but only when the chunks are processed (or sent to the workers)
+            n_chunks = min(ibtracs_ds.sid.size, 4 * pool.nodes)
+            cum_size = np.cumsum(ibtracs_ds.valid_t.values.sum(axis=1))
+            bounds = np.searchsorted(
+                cum_size, np.linspace(0, cum_size[-1], n_chunks + 1)[1:-1], side="right")
+            bounds = np.unique(np.concatenate([[0], bounds, [ibtracs_ds.sid.size]]))
+            groups = [ibtracs_ds.isel(storm=slice(start, end))
+                      for start, end in zip(bounds[:-1], bounds[1:])]
+            LOGGER.info("Processing %d storms in %d chunks in parallel.",
+                        ibtracs_ds.sid.size, len(groups))
+            all_tracks = pool.map(
+                _ibtracs_tracks_from_ds, groups,
+                itertools.repeat(provider, len(groups)),
+                itertools.repeat(phys_vars, len(groups)),
+                itertools.repeat(basin, len(groups)),
+                itertools.repeat(genesis_basin, len(groups)),
+                itertools.repeat(estimate_missing, len(groups)),
+                chunksize=1)
+            all_tracks = sum(all_tracks, [])
+        else:
+            all_tracks = _ibtracs_tracks_from_ds(
+                ibtracs_ds, provider, phys_vars, basin, genesis_basin, estimate_missing,
+                log_progress=True)
+        # restore the original order of the storms
+        all_tracks = [track for _, track in sorted(all_tracks, key=lambda x: x[0])]
 
-            # A track that crosses the antimeridian in IBTrACS might be truncated by `t_msk` in
-            # such a way that the remaining part is not crossing the antimeridian:
-            if (track_ds.lon.values > 180).all():
-                track_ds['lon'] -= 360
-
-            # set time_step in hours
-            track_ds['time_step'] = xr.ones_like(track_ds.time, dtype=float)
-            if track_ds.time.size > 1:
-                track_ds.time_step.values[1:] = (track_ds.time.diff(dim="date_time")
-                                                 / np.timedelta64(1, 'h'))
-                track_ds.time_step.values[0] = track_ds.time_step[1]
-
-            with warnings.catch_warnings():
-                # See https://github.com/pydata/xarray/issues/4167
-                warnings.simplefilter(action="ignore", category=FutureWarning)
-
-                track_ds['rmw'] = track_ds.rmw \
-                    .ffill(dim='date_time', limit=1) \
-                    .bfill(dim='date_time', limit=1) \
-                    .fillna(0)
-                track_ds['roci'] = track_ds.roci \
-                    .ffill(dim='date_time', limit=1) \
-                    .bfill(dim='date_time', limit=1) \
-                    .fillna(0)
-                track_ds['poci'] = track_ds.poci \
-                    .ffill(dim='date_time', limit=4) \
-                    .bfill(dim='date_time', limit=4)
-                # this is the most time consuming line in the processing:
-                track_ds['poci'] = track_ds.poci.fillna(tr_basin_penv)
-
-            if estimate_missing:
-                track_ds['rmw'][:] = estimate_rmw(track_ds.rmw.values, track_ds.pres.values)
-                track_ds['roci'][:] = estimate_roci(track_ds.roci.values, track_ds.pres.values)
-                track_ds['roci'][:] = np.fmax(track_ds.rmw.values, track_ds.roci.values)
-
-            # ensure environmental pressure >= central pressure
-            # this is the second most time consuming line in the processing:
-            track_ds['poci'][:] = np.fmax(track_ds.poci, track_ds.pres)
-
-            provider_str = f"ibtracs_{provider[0]}"
-            if len(provider) > 1:
-                provider_str = "ibtracs_mixed:" + ",".join(
-                    "{}({})".format(v, track_ds[f'{v}_agency'].astype(str).item())
-                    for v in phys_vars)
-
-            all_tracks.append(xr.Dataset({
-                'time_step': ('time', track_ds.time_step.data),
-                'radius_max_wind': ('time', track_ds.rmw.data),
-                'radius_oci': ('time', track_ds.roci.data),
-                'max_sustained_wind': ('time', track_ds.wind.data),
-                'central_pressure': ('time', track_ds.pres.data),
-                'environmental_pressure': ('time', track_ds.poci.data),
-                'basin': ('time', track_ds.basin.data.astype("<U2")),
-            }, coords={
-                'time': track_ds.time.dt.round('s').data,
-                'lat': ('time', track_ds.lat.data),
-                'lon': ('time', track_ds.lon.data),
-            }, attrs={
-                'max_sustained_wind_unit': 'kn',
-                'central_pressure_unit': 'mb',
-                'name': track_ds.name.astype(str).item(),
-                'sid': track_ds.sid.astype(str).item(),
-                'orig_event_flag': True,
-                'data_provider': provider_str,
-                'id_no': track_ds.id_no.item(),
-                'category': category[i_track],
-            }))
-        if last_perc != 100:
-            LOGGER.info("Progress: 100%")
         if len(all_tracks) == 0:
             # If all tracks have been discarded in the loop due to the basin filters:
             LOGGER.info('There were no tracks left in the specified basin '
                         'after discarding invalid track positions.')
+        elif cache:
+            LOGGER.info("Writing processed IBTrACS data to cache: %s", cache_path)
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # the temporary file is specific to this process to allow for concurrent writes
+            tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+            TCTracksRagged.from_list(all_tracks).write_netcdf(tmp_path)
+            tmp_path.replace(cache_path)
         return cls(all_tracks)
 
     def read_processed_ibtracs_csv(self, *args, **kwargs):
@@ -1056,6 +1062,11 @@ class TCTracks():
 
         Note that tracks that already have the specified resolution remain unchanged.
 
+        Tracks with time coordinates of type `numpy.datetime64` (this is the case for most data
+        sources) are interpolated in a single vectorized pass, see
+        `TCTracksRagged.equal_timestep`. Only tracks with other types of time coordinates (e.g.
+        `cftime` objects) are interpolated one by one, using the pool if specified.
+
         Parameters
         ----------
         time_step_h : float or int, optional
@@ -1091,31 +1102,49 @@ class TCTracks():
 
         if land_params:
             extent = self.get_extent()
-            land_geom = u_coord.get_land_geometry(extent=extent, resolution=10)
+            land_geom = u_coord.LandMask(
+                u_coord.get_land_geometry(extent=extent, resolution=10))
         else:
             land_geom = None
 
-        if pool:
-            chunksize = min(self.size // pool.ncpus, 1000)
-            self.data = pool.map(
+        # tracks that can be handled by the vectorized interpolation
+        batch_idx = [
+            i for i, (track, ts_h) in enumerate(zip(self.data, l_time_step_h))
+            if ts_h is not None and track.time.size > 1
+            and np.issubdtype(track.time.dtype, np.datetime64)
+        ]
+        new_data = list(self.data)
+        if batch_idx:
+            ragged = TCTracksRagged.from_list([self.data[i] for i in batch_idx])
+            ragged.equal_timestep(time_step_h)
+            for i, track_int in zip(batch_idx, ragged.iter_tracks()):
+                if land_geom:
+                    track_land_params(track_int, land_geom)
+                new_data[i] = track_int
+
+        # remaining tracks are processed one by one
+        batch_mask = np.zeros(self.size, dtype=bool)
+        batch_mask[batch_idx] = True
+        other_idx = np.nonzero(~batch_mask)[0]
+        other_data = [self.data[i] for i in other_idx]
+        other_time_step_h = [l_time_step_h[i] for i in other_idx]
+        if pool and other_idx.size > 0:
+            chunksize = max(min(other_idx.size // pool.ncpus, 1000), 1)
+            other_data = pool.map(
                 self._one_interp_data,
-                self.data,
-                l_time_step_h,
-                itertools.repeat(land_geom, self.size),
+                other_data,
+                other_time_step_h,
+                itertools.repeat(land_geom, other_idx.size),
                 chunksize=chunksize
             )
         else:
-            last_perc = 0
-            new_data = []
-            for track, ts_h in zip(self.data, l_time_step_h):
-                # progress indicator
-                perc = 100 * len(new_data) / len(self.data)
-                if perc - last_perc >= 10:
-                    LOGGER.debug("Progress: %d%%", perc)
-                    last_perc = perc
-                track_int = self._one_interp_data(track, ts_h, land_geom)
-                new_data.append(track_int)
-            self.data = new_data
+            other_data = [
+                self._one_interp_data(track, ts_h, land_geom)
+                for track, ts_h in zip(other_data, other_time_step_h)
+            ]
+        for i, track_int in zip(other_idx, other_data):
+            new_data[i] = track_int
+        self.data = new_data
 
     def calc_random_walk(self, **kwargs):
         """Deprecated. Use `TCTracks.calc_perturbed_trajectories` instead."""
@@ -1134,9 +1163,67 @@ class TCTracks():
         """Get longitude from coord array."""
         return len(self.data)
 
+    @property
+    def summary(self):
+        """Table with one row per track, summarizing each track
+
+        The columns are the track attributes (such as "sid", "name" or "category"), and:
+
+        - "genesis_basin": the basin of the first track position
+        - "basins": the set of basins of all track positions
+        - "year": the year of the first track position
+        - "size": the number of track positions
+        - "lon_min", "lat_min", "lon_max", "lat_max": the bounds of the track (see
+          `climada.util.coordinates.latlon_bounds`)
+
+        The columns that are derived from the track variables are cached by a hash of the
+        variables "time", "lat", "lon" and "basin" of each track. When tracks are added to,
+        replaced in or modified in `data`, only the rows of the new or modified tracks are
+        computed. The columns of the track attributes are not cached, but built from the track
+        data on every access, so that they reflect in-place modifications of the attributes.
+
+        Returns
+        -------
+        summary : pandas.DataFrame
+        """
+        return pd.concat([
+            pd.DataFrame([track.attrs for track in self.data], index=range(self.size)),
+            self._get_track_summary()[TRACK_SUMMARY_COLUMNS],
+        ], axis=1)
+
+    def _get_track_summary(self):
+        """Cached columns of `summary` that are derived from the track variables
+
+        In addition to `TRACK_SUMMARY_COLUMNS`, the column "lon_gaps" contains the longitudinal
+        gaps between the positions of each track, see `_track_lon_gaps`.
+        """
+        cached_fps, cached_summary = getattr(self, '_summary_cache', ([], None))
+        fingerprints = [_track_fingerprint(track) for track in self.data]
+        if cached_summary is not None and fingerprints == cached_fps:
+            return cached_summary
+
+        # only the hashes of the tracks are kept, not the tracks themselves
+        cached_pos = {fp: i for i, fp in enumerate(cached_fps)}
+        pos = np.array([cached_pos.get(fp, -1) for fp in fingerprints], dtype=int)
+        new_idx = (pos < 0).nonzero()[0]
+        new_rows = pd.DataFrame(
+            [_track_summary_row(self.data[i]) for i in new_idx],
+            columns=TRACK_SUMMARY_COLUMNS + ['lon_gaps'])
+        if cached_summary is None:
+            cached_summary = new_rows.iloc[:0]
+        pos[new_idx] = len(cached_summary) + np.arange(new_idx.size)
+        summary = pd.concat([cached_summary, new_rows], ignore_index=True)
+        summary = summary.iloc[pos].reset_index(drop=True)
+        self._summary_cache = (fingerprints, summary)
+        return summary
+
     def get_bounds(self, deg_buffer=0.1):
         """Get bounds as (lon_min, lat_min, lon_max, lat_max) tuple.
 
+        The bounds are the same as the ones of `climada.util.coordinates.latlon_bounds` applied
+        to all track positions, but they are combined from cached properties of the individual
+        tracks, see `summary`.
+
         Parameters
         ----------
         deg_buffer : float
@@ -1146,11 +1233,13 @@ class TCTracks():
         -------
         bounds : tuple (lon_min, lat_min, lon_max, lat_max)
         """
-        bounds = u_coord.latlon_bounds(
-            np.concatenate([t.lat.values for t in self.data]),
-            np.concatenate([t.lon.values for t in self.data]),
-            buffer=deg_buffer)
-        return bounds
+        summary = self._get_track_summary()
+        summary = summary[summary['size'] > 0]
+        if summary.shape[0] == 0:
+            raise ValueError("Can't determine the bounds of empty tracks.")
+        lon_min, lon_max = _lon_bounds_union(summary['lon_gaps'].values, buffer=deg_buffer)
+        return (lon_min, max(summary['lat_min'].min() - deg_buffer, -90),
+                lon_max, min(summary['lat_max'].max() + deg_buffer, 90))
 
     @property
     def bounds(self):
@@ -1387,6 +1476,80 @@ class TCTracks():
             data.append(track)
         return cls(data)
 
+    def write_ragged_netcdf(self, file_name, complevel=5):
+        """Write all tracks to a single NetCDF file in contiguous ragged array representation.
+
+        Compared to `write_netcdf` (one file per track) and `write_hdf5` (one group per track),
+        this format is much more compact and faster to read, in particular for large numbers of
+        tracks. See `TCTracksRagged.write_netcdf` for details.
+
+        Parameters
+        ----------
+        file_name: str or Path
+            Path to a new NetCDF file. If it exists already, the file is overwritten.
+        complevel : int
+            Specifies a compression level (0-9) for the zlib compression of the data.
+            A value of 0 or None disables compression. Default: 5
+        """
+        self.to_ragged().write_netcdf(file_name, complevel=complevel)
+
+    @classmethod
+    def from_ragged_netcdf(cls, file_name, index=None, basin=None, year_range=None, pool=None):
+        """Create new TCTracks object from a NetCDF file in contiguous ragged array representation
+
+        Parameters
+        ----------
+        file_name : str or Path
+            Path to a file that has been generated with `TCTracks.write_ragged_netcdf`.
+        index : int, slice or array-like of int, optional
+            If given, only read the tracks with these indices (position in the file).
+            Default: None
+        basin : str, optional
+            If given, only read tracks that have at least one position in the specified basin.
+            Default: None
+        year_range : tuple (min_year, max_year), optional
+            If given, only read tracks that start within this year range. Default: None
+        pool : pathos.pool, optional
+            Pool that will be used to read the variables in parallel. The pool is also assigned
+            to the returned object. Default: None
+
+        Returns
+        -------
+        tracks : TCTracks
+            TCTracks with data from the given NetCDF file.
+        """
+        ragged = TCTracksRagged.from_netcdf(file_name, index=index, basin=basin,
+                                            year_range=year_range, pool=pool)
+        return cls.from_ragged(ragged, pool=pool)
+
+    def to_ragged(self):
+        """Convert the list of tracks into the columnar (ragged array) representation.
+
+        Returns
+        -------
+        ragged : TCTracksRagged
+            The same tracks, stored as flat arrays with per-track offsets.
+        """
+        return TCTracksRagged.from_list(self.data)
+
+    @classmethod
+    def from_ragged(cls, ragged, pool=None):
+        """Create new TCTracks object from the columnar (ragged array) representation.
+
+        Parameters
+        ----------
+        ragged : TCTracksRagged
+            Tracks in columnar representation.
+        pool : pathos.pools, optional
+            Pool that will be used for parallel computation when applicable. Default: None
+
+        Returns
+        -------
+        tracks : TCTracks
+            TCTracks with one xarray Dataset per track.
+        """
+        return cls(ragged.to_list(), pool=pool)
+
     def to_geodataframe(self, as_points=False, split_lines_antimeridian=True):
         """Transform this TCTracks instance into a GeoDataFrame.
 
@@ -1401,9 +1564,7 @@ class TCTracks():
         split_lines_antimeridian : bool, optional
             If True, tracks that cross the antimeridian are split into multiple Lines as a
             MultiLineString, with each Line on either side of the meridian. This ensures all Lines
-            are within (-180, +180) degrees longitude. Note that lines might be split at more
-            locations than strictly necessary, due to the underlying splitting algorithm
-            (https://github.com/Toblerity/Shapely/issues/572).
+            are within (-180, +180) degrees longitude.
 
         Returns
         -------
@@ -1416,48 +1577,23 @@ class TCTracks():
         if as_points:
             gdf_long = pd.concat([track.to_dataframe().assign(idx=i)
                                   for i, track in enumerate(self.data)])
-            gdf_long['lon'] = u_coord.lon_normalize(gdf_long['lon'].values.copy())
-            gdf_long['geometry'] = gdf_long.apply(lambda x: Point(x['lon'], x['lat']), axis=1)
+            gdf_long['geometry'] = gpd.points_from_xy(
+                u_coord.lon_normalize(gdf_long['lon'].values.copy()), gdf_long['lat'].values)
             gdf_long = gdf_long.drop(columns=['lon', 'lat'])
             gdf_long = gpd.GeoDataFrame(gdf_long.reset_index().set_index('idx'),
                                         geometry='geometry', crs=DEF_CRS)
             gdf = gdf_long.join(gdf)
-
-        elif split_lines_antimeridian:
-            # enforce longitudes to be within [-180, 180] range
-            t_lons = [u_coord.lon_normalize(t.lon.values.copy()) for t in self.data]
-            t_lats = [t.lat.values for t in self.data]
-
-            # LineString only works with more than one lat/lon pair
-            gdf.geometry = gpd.GeoSeries([
-                LineString(np.c_[lons, lats]) if lons.size > 1
-                else Point(lons, lats)
-                for lons, lats in zip(t_lons, t_lats)
-            ])
-            gdf.crs = DEF_CRS
-
-            # for splitting, restrict to tracks that come close to the antimeridian
-            t_split_mask = np.asarray([
-                (lon > 170).any() and (lon < -170).any() and lon.size > 1
-                for lon in t_lons])
-
-            # note that tracks might be splitted at self-intersections as well:
-            # https://github.com/Toblerity/Shapely/issues/572
-            antimeridian = LineString([(180, -90), (180, 90)])
-            gdf.loc[t_split_mask, "geometry"] = gdf.geometry[t_split_mask] \
-                .to_crs({"proj": "longlat", "lon_wrap": 180}) \
-                .apply(lambda line: MultiLineString([
-                    LineString([(x - 360, y) for x, y in segment.coords])
-                    if any(x > 180 for x, y in segment.coords) else segment
-                    for segment in shapely.ops.split(line, antimeridian).geoms
-                ]))
         else:
-            # LineString only works with more than one lat/lon pair
-            gdf.geometry = gpd.GeoSeries([
-                LineString(np.c_[track.lon, track.lat]) if track.lon.size > 1
-                else Point(track.lon.data, track.lat.data)
-                for track in self.data
-            ])
+            sizes = np.array([track.time.size for track in self.data], dtype=np.int64)
+            lons = np.concatenate([track.lon.values for track in self.data]
+                                  + [np.zeros(0)]).astype(np.float64)
+            lats = np.concatenate([track.lat.values for track in self.data]
+                                  + [np.zeros(0)]).astype(np.float64)
+            if split_lines_antimeridian:
+                # enforce longitudes to be within [-180, 180] range
+                u_coord.lon_normalize(lons)
+            gdf.geometry = gpd.GeoSeries(
+                _track_geometries(lons, lats, sizes, split_antimeridian=split_lines_antimeridian))
             gdf.crs = DEF_CRS
 
         return gdf
@@ -1517,6 +1653,876 @@ class TCTracks():
             track_land_params(track_int, land_geom)
         return track_int
 
+
+class TCTracksRagged():
+    """Columnar storage of tropical cyclone tracks as contiguous ragged arrays.
+
+    The time dependent variables of all tracks are concatenated into flat arrays, and track `i`
+    occupies the positions ``offsets[i]:offsets[i + 1]`` in each of those arrays. The track
+    attributes (sid, name, category, etc.) are stored in a table with one row per track.
+
+    Compared to the list of xarray Datasets in `TCTracks.data`, this representation is much faster
+    to filter and to pickle (e.g. when sending tracks to pool workers), and it allows for
+    vectorized processing of all tracks at once. Use `TCTracks.to_ragged` and
+    `TCTracks.from_ragged` to convert between the two representations.
+
+    Attributes
+    ----------
+    variables : dict of np.ndarray
+        Flat arrays of all time dependent variables of the tracks, including the coordinates
+        "time", "lat" and "lon". All arrays have the same length ``offsets[-1]``.
+    offsets : np.ndarray of int
+        Array of shape (ntracks + 1,) with the position of the first record of each track in the
+        arrays in `variables`. The last entry is the total number of records.
+    attrs : pd.DataFrame
+        Track attributes, one row per track.
+    var_present : dict of np.ndarray
+        For variables that are not contained in all tracks, a boolean mask of shape (ntracks,)
+        that is True for the tracks where the variable is available. For the other tracks, the
+        records are filled with NaN (or the corresponding fill value for non-float data).
+    """
+    def __init__(self, variables=None, offsets=None, attrs=None, var_present=None):
+        """Create new (empty) TCTracksRagged instance.
+
+        Parameters
+        ----------
+        variables : dict of np.ndarray, optional
+            Flat arrays of all time dependent variables. Default: empty dict
+        offsets : np.ndarray of int, optional
+            Start position of each track, with the total number of records appended.
+            Default: ``[0]`` (no tracks)
+        attrs : pd.DataFrame, optional
+            Track attributes, one row per track. Default: empty DataFrame
+        var_present : dict of np.ndarray, optional
+            Availability masks for variables not contained in all tracks. Default: empty dict
+        """
+        self.variables = variables if variables is not None else dict()
+        self.offsets = (np.asarray(offsets, dtype=np.int64) if offsets is not None
+                        else np.zeros(1, dtype=np.int64))
+        self.attrs = attrs if attrs is not None else pd.DataFrame()
+        self.var_present = var_present if var_present is not None else dict()
+
+    @property
+    def size(self):
+        """Number of tracks."""
+        return self.offsets.size - 1
+
+    @property
+    def sizes(self):
+        """Number of records (time steps) of each track."""
+        return np.diff(self.offsets)
+
+    @property
+    def track_index(self):
+        """For each record, the index of the track it belongs to."""
+        return np.repeat(np.arange(self.size), self.sizes)
+
+    @classmethod
+    def from_list(cls, data):
+        """Create new TCTracksRagged object from a list of xarray Datasets.
+
+        Parameters
+        ----------
+        data : list of xarray.Dataset
+            Tracks as stored in `TCTracks.data`.
+
+        Returns
+        -------
+        ragged : TCTracksRagged
+        """
+        sizes = np.array([track.time.size for track in data], dtype=np.int64)
+        offsets = np.zeros(sizes.size + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+
+        var_names = ['time', 'lat', 'lon']
+        var_names += list(dict.fromkeys(
+            var for track in data for var in track.data_vars if var not in var_names))
+
+        variables = dict()
+        var_present = dict()
+        for var in var_names:
+            present = np.array([var in track.variables for track in data], dtype=bool)
+            if not present.any():
+                continue
+            if present.all():
+                variables[var] = np.concatenate([track[var].values for track in data])
+                continue
+            dtype = np.result_type(*[data[i][var].values for i in present.nonzero()[0]])
+            fill_value = _ragged_fill_value(dtype)
+            variables[var] = np.concatenate([
+                track[var].values if has_var else np.full(track.time.size, fill_value, dtype=dtype)
+                for track, has_var in zip(data, present)
+            ])
+            var_present[var] = present
+
+        attrs = pd.DataFrame([dict(track.attrs) for track in data])
+        return cls(variables=variables, offsets=offsets, attrs=attrs, var_present=var_present)
+
+    def to_list(self):
+        """Convert to a list of xarray Datasets, as stored in `TCTracks.data`.
+
+        Returns
+        -------
+        data : list of xarray.Dataset
+        """
+        records = self.attrs.to_dict(orient='records')
+        return [self._get_one_track(i, records[i] if records else {}) for i in range(self.size)]
+
+    def iter_tracks(self):
+        """Iterate over the tracks, each converted to an xarray Dataset on demand.
+
+        Contrary to `to_list`, at most one track is held as a Dataset at any time.
+
+        Yields
+        ------
+        track : xarray.Dataset
+        """
+        for i in range(self.size):
+            yield self.get_track(i)
+
+    def get_track(self, i_track):
+        """Get a single track as an xarray Dataset.
+
+        Parameters
+        ----------
+        i_track : int
+            Index of the track.
+
+        Returns
+        -------
+        track : xarray.Dataset
+        """
+        records = self.attrs.iloc[i_track:i_track + 1].to_dict(orient='records')
+        return self._get_one_track(i_track, records[0] if records else {})
+
+    def _get_one_track(self, i_track, attrs):
+        """Construct the xarray Dataset of a single track given the attributes of that track."""
+        start, end = self.offsets[i_track], self.offsets[i_track + 1]
+        data_vars, coords = dict(), dict()
+        for var, values in self.variables.items():
+            if var in self.var_present and not self.var_present[var][i_track]:
+                continue
+            if var == 'time':
+                coords[var] = values[start:end].copy()
+            elif var in ['lat', 'lon']:
+                coords[var] = ('time', values[start:end].copy())
+            else:
+                data_vars[var] = ('time', values[start:end].copy())
+        attrs = {key: val for key, val in attrs.items() if not _ragged_attr_missing(val)}
+        return xr.Dataset(data_vars, coords=coords, attrs=attrs)
+
+    def write_netcdf(self, file_name, complevel=5):
+        """Write all tracks to a single NetCDF file.
+
+        The file follows the CF conventions for contiguous ragged arrays: all time dependent
+        variables are stored along a "record" dimension, and the number of records of each track
+        is given by the "row_size" variable along the "track" dimension. The track attributes are
+        stored as variables along the "track" dimension. Additional index variables (basins and
+        starting year of each track) allow for selective reading with `from_netcdf`.
+
+        Parameters
+        ----------
+        file_name : str or Path
+            Path to the NetCDF file to write. If it exists already, the file is overwritten.
+        complevel : int, optional
+            Specifies a compression level (0-9) for the zlib compression of the numeric data.
+            A value of 0 or None disables compression. Default: 5
+        """
+        ds = xr.Dataset({var: ('record', values) for var, values in self.variables.items()})
+        ds['row_size'] = ('track', self.sizes)
+        ds['row_size'].attrs['sample_dimension'] = 'record'
+        for var, present in self.var_present.items():
+            ds[f'{var}_present'] = ('track', present)
+            ds[var].attrs['present_variable'] = f'{var}_present'
+        for col in self.attrs.columns:
+            if col in ds.variables:
+                raise ValueError(f"Track attribute {col} conflicts with a variable name.")
+            values = self.attrs[col].values
+            missing = np.array([_ragged_attr_missing(val) for val in values], dtype=bool)
+            if values.dtype == object:
+                # missing values of string attributes are marked by an empty string
+                values = np.array(['' if miss else str(val)
+                                   for val, miss in zip(values, missing)], dtype=object)
+            ds[col] = ('track', values)
+            if values.dtype == object and missing.any():
+                ds[col].attrs['empty_is_missing'] = 1
+
+        index_vars = []
+        if 'basin' in self.variables:
+            ds['index_basins'] = ('track', np.array([
+                ",".join(np.unique(self.variables['basin'][start:end]))
+                for start, end in zip(self.offsets[:-1], self.offsets[1:])
+            ], dtype=object))
+            index_vars.append('index_basins')
+        if np.issubdtype(self.variables['time'].dtype, np.datetime64):
+            nonempty = self.sizes > 0
+            years = np.full(self.size, -1, dtype=np.int64)
+            years[nonempty] = (self.variables['time'][self.offsets[:-1][nonempty]]
+                               .astype('datetime64[Y]').astype(np.int64) + 1970)
+            ds['index_year'] = ('track', years)
+            index_vars.append('index_year')
+        ds.attrs['index_variables'] = " ".join(index_vars)
+        ds.attrs['featureType'] = 'trajectory'
+
+        encoding = dict()
+        if complevel and self.offsets[-1] > 0:
+            chunksize = int(min(self.offsets[-1], RAGGED_RECORD_CHUNKSIZE))
+            encoding = {
+                var: dict(zlib=True, complevel=complevel, chunksizes=(chunksize,))
+                for var, values in self.variables.items() if values.dtype.kind in "biufcM"
+            }
+        LOGGER.info('Writing %d tracks to %s', self.size, file_name)
+        ds.to_netcdf(file_name, encoding=encoding)
+
+    @classmethod
+    def from_netcdf(cls, file_name, index=None, basin=None, year_range=None, pool=None):
+        """Read tracks from a single NetCDF file written by `write_netcdf`.
+
+        Optionally, only a selection of the tracks is read. Only the records of the selected
+        tracks are read from the file, in contiguous runs of records (see `_ragged_read_runs`).
+
+        Parameters
+        ----------
+        file_name : str or Path
+            Path to the NetCDF file.
+        index : int, slice or array-like of int, optional
+            If given, only read the tracks with these indices (position in the file).
+            Default: None
+        basin : str, optional
+            If given, only read tracks that have at least one position in the specified basin.
+            Default: None
+        year_range : tuple (min_year, max_year), optional
+            If given, only read tracks that start within this year range. Default: None
+        pool : pathos.pool, optional
+            Pool that will be used to read the variables in parallel. Default: None
+
+        Returns
+        -------
+        ragged : TCTracksRagged
+            The selected tracks, in the order in which they are stored in the file.
+        """
+        with xr.open_dataset(file_name) as ds:
+            sizes = ds['row_size'].values.astype(np.int64)
+            offsets = np.zeros(sizes.size + 1, dtype=np.int64)
+            np.cumsum(sizes, out=offsets[1:])
+
+            select = np.ones(sizes.size, dtype=bool)
+            if index is not None:
+                select[:] = False
+                select[np.arange(sizes.size)[index]] = True
+            if basin is not None:
+                select &= np.array([basin in basins.split(",")
+                                    for basins in ds['index_basins'].values], dtype=bool)
+            if year_range is not None:
+                years = ds['index_year'].values
+                select &= (years >= year_range[0]) & (years <= year_range[1])
+            track_sel = select.nonzero()[0]
+
+            positions = _ragged_positions(offsets[track_sel], sizes[track_sel])
+            run_starts, run_ends = _ragged_read_runs(offsets[track_sel], sizes[track_sel])
+            # map the record positions in the file to positions in the concatenated runs
+            run_offsets = np.concatenate([[0], np.cumsum(run_ends - run_starts)[:-1]])
+            pos_run = np.searchsorted(run_starts, positions, side="right") - 1
+            positions = run_offsets[pos_run] + positions - run_starts[pos_run]
+
+            record_vars = [var for var, arr in ds.data_vars.items() if arr.dims == ('record',)]
+            if pool:
+                values = pool.map(_read_ragged_nc_var,
+                                  itertools.repeat(file_name, len(record_vars)), record_vars,
+                                  itertools.repeat(run_starts, len(record_vars)),
+                                  itertools.repeat(run_ends, len(record_vars)))
+            else:
+                values = [_read_ragged_nc_runs(ds, var, run_starts, run_ends)
+                          for var in record_vars]
+
+            ds_sel = ds.drop_vars(record_vars).isel(track=track_sel).load()
+            for var, var_values in zip(record_vars, values):
+                ds_sel[var] = ('record', var_values[positions])
+                ds_sel[var].attrs.update(ds[var].attrs)
+            # restore the original order of the record variables
+            ds_sel = ds_sel[record_vars + [var for var in ds_sel.data_vars
+                                           if var not in record_vars]]
+        return cls._from_dataset(ds_sel)
+
+    @classmethod
+    def _from_dataset(cls, ds):
+        """Create new TCTracksRagged object from an xarray Dataset in the layout of
+        `write_netcdf`"""
+        sizes = ds['row_size'].values.astype(np.int64)
+        offsets = np.zeros(sizes.size + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+
+        variables = dict()
+        var_present = dict()
+        skip_vars = ['row_size'] + ds.attrs.get('index_variables', "").split()
+        for var, arr in ds.data_vars.items():
+            if arr.dims != ('record',):
+                continue
+            values = arr.values
+            if values.dtype == object:
+                values = values.astype(str)
+            variables[var] = values
+            if 'present_variable' in arr.attrs:
+                present_var = arr.attrs['present_variable']
+                var_present[var] = ds[present_var].values.astype(bool)
+                skip_vars.append(present_var)
+
+        attrs = dict()
+        for col, arr in ds.data_vars.items():
+            if arr.dims != ('track',) or col in skip_vars:
+                continue
+            values = arr.values
+            if arr.attrs.get('empty_is_missing', 0):
+                values = np.where(values == '', None, values)
+            attrs[col] = values
+        return cls(variables=variables, offsets=offsets, attrs=pd.DataFrame(attrs),
+                   var_present=var_present)
+
+    def select(self, index):
+        """Select a subset of the tracks.
+
+        Parameters
+        ----------
+        index : np.ndarray of int or bool
+            Indices of the tracks to select, or a boolean mask of shape (ntracks,).
+
+        Returns
+        -------
+        ragged : TCTracksRagged
+            A new instance containing only the selected tracks (in the order of `index`).
+        """
+        index = np.asarray(index)
+        if index.dtype == bool:
+            index = index.nonzero()[0]
+        sizes = self.sizes[index]
+        offsets = np.zeros(sizes.size + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+        positions = _ragged_positions(self.offsets[index], sizes)
+        return TCTracksRagged(
+            variables={var: values[positions] for var, values in self.variables.items()},
+            offsets=offsets,
+            attrs=self.attrs.iloc[index].reset_index(drop=True),
+            var_present={var: mask[index] for var, mask in self.var_present.items()},
+        )
+
+    @classmethod
+    def concat(cls, ragged_list):
+        """Concatenate several TCTracksRagged objects.
+
+        Parameters
+        ----------
+        ragged_list : list of TCTracksRagged
+
+        Returns
+        -------
+        ragged : TCTracksRagged
+        """
+        ragged_list = [ragged for ragged in ragged_list if ragged.size > 0]
+        if not ragged_list:
+            return cls()
+        sizes = np.concatenate([ragged.sizes for ragged in ragged_list])
+        offsets = np.zeros(sizes.size + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+
+        var_names = list(dict.fromkeys(
+            var for ragged in ragged_list for var in ragged.variables.keys()))
+        variables = dict()
+        var_present = dict()
+        for var in var_names:
+            dtype = np.result_type(*[ragged.variables[var] for ragged in ragged_list
+                                     if var in ragged.variables])
+            fill_value = _ragged_fill_value(dtype)
+            variables[var] = np.concatenate([
+                ragged.variables[var] if var in ragged.variables
+                else np.full(ragged.offsets[-1], fill_value, dtype=dtype)
+                for ragged in ragged_list
+            ])
+            present = np.concatenate([
+                ragged.var_present.get(var, np.full(ragged.size, var in ragged.variables))
+                for ragged in ragged_list
+            ])
+            if not present.all():
+                var_present[var] = present
+
+        attrs = pd.concat([ragged.attrs for ragged in ragged_list], ignore_index=True)
+        return cls(variables=variables, offsets=offsets, attrs=attrs, var_present=var_present)
+
+    def subset(self, filterdict):
+        """Subset tracks based on track attributes.
+
+        Select all tracks matching exactly the given attribute values. See `TCTracks.subset`.
+
+        Parameters
+        ----------
+        filterdict : dict or OrderedDict
+            Keys are attribute names, values are the corresponding attribute values to match.
+
+        Returns
+        -------
+        ragged : TCTracksRagged
+            A new instance containing only the matching tracks.
+        """
+        match = np.ones(self.size, dtype=bool)
+        for key, pattern in filterdict.items():
+            if key == "basin":
+                in_basin = (self.variables['basin'] == pattern)
+                match &= np.bincount(self.track_index, weights=in_basin,
+                                     minlength=self.size) > 0
+            else:
+                match &= (self.attrs[key] == pattern).values
+        return self.select(match)
+
+    def get_bounds(self, deg_buffer=0.1):
+        """Get bounds as (lon_min, lat_min, lon_max, lat_max) tuple.
+
+        Parameters
+        ----------
+        deg_buffer : float
+            A buffer to add around the bounding box
+
+        Returns
+        -------
+        bounds : tuple (lon_min, lat_min, lon_max, lat_max)
+        """
+        return u_coord.latlon_bounds(
+            self.variables['lat'], self.variables['lon'], buffer=deg_buffer)
+
+    def equal_timestep(self, time_step_h=1):
+        """Resample all tracks at the specified temporal resolution in a single pass
+
+        This is the vectorized counterpart of `TCTracks.equal_timestep`, with the same placement
+        of the new time steps (multiples of `time_step_h`, relative to midnight of the first day of
+        each track). Numeric variables are interpolated linearly, while non-numeric variables
+        (such as the basin) take the value of the nearest original time step. The eye position is
+        interpolated with a linear, quadratic or cubic spline, depending on the number of original
+        time steps. Longitudinal coordinates are handled correctly for tracks crossing the
+        antimeridian. The track attribute "category" is updated. All tracks are interpolated,
+        including tracks that are already at the specified resolution.
+
+        The time coordinates are required to be of type `numpy.datetime64`, and all tracks need to
+        have at least two time steps.
+
+        Parameters
+        ----------
+        time_step_h : float or int, optional
+            Temporal resolution in hours (positive, may be non-integer-valued). Default: 1.
+        """
+        if time_step_h <= 0:
+            raise ValueError(f"time_step_h is not a positive number: {time_step_h}")
+        if self.size == 0:
+            return
+        if not np.issubdtype(self.variables['time'].dtype, np.datetime64):
+            raise ValueError("Batched interpolation requires numpy.datetime64 time coordinates.")
+        sizes = self.sizes
+        if np.any(sizes < 2):
+            raise ValueError("Batched interpolation requires at least two time steps per track.")
+
+        # integer arithmetic (in ns) to determine the new time steps relative to midnight
+        ns_per_hour = 3600 * 10**9
+        ns_per_day = 24 * ns_per_hour
+        step_ns = int(round(time_step_h * ns_per_hour))
+        starts, ends = self.offsets[:-1], self.offsets[1:] - 1
+        time_ns = self.variables['time'].astype('datetime64[ns]').astype(np.int64)
+        day0 = (time_ns[starts] // ns_per_day) * ns_per_day
+        rel_ns = time_ns - np.repeat(day0, sizes)
+        k_min = -(-rel_ns[starts] // step_ns)
+        k_max = rel_ns[ends] // step_ns
+        new_sizes = np.fmax(0, k_max - k_min + 1)
+        new_offsets = np.zeros(self.size + 1, dtype=np.int64)
+        np.cumsum(new_sizes, out=new_offsets[1:])
+        new_track_idx = np.repeat(np.arange(self.size), new_sizes)
+        new_k = (np.arange(new_offsets[-1], dtype=np.int64)
+                 - np.repeat(new_offsets[:-1], new_sizes)
+                 + np.repeat(k_min, new_sizes))
+        new_rel_ns = new_k * step_ns
+        new_time = (np.repeat(day0, new_sizes) + new_rel_ns).astype('datetime64[ns]')
+
+        # relative times in hours, separated between tracks by a large gap so that a single call
+        # to `np.interp` never interpolates across different tracks
+        x_old = rel_ns / ns_per_hour
+        x_new = new_rel_ns / ns_per_hour
+        x_gap = 10 + max(x_old.max(), 0)
+        xg_old = x_old + self.track_index * x_gap
+        xg_new = x_new + new_track_idx * x_gap
+
+        # indices of the nearest original time step (ties are resolved towards the later step)
+        right = np.clip(np.searchsorted(xg_old, xg_new, side='left'), 0, xg_old.size - 1)
+        left = np.clip(right - 1, 0, xg_old.size - 1)
+        nearest = np.where(xg_new - xg_old[left] < xg_old[right] - xg_new, left, right)
+
+        # handle change of sign in longitude: use positive degrees east if crossing 180 degrees
+        lon = u_coord.lon_normalize(self.variables['lon'].astype(np.float64), center=0)
+        crossing = ((np.bincount(self.track_index, weights=lon < -170, minlength=self.size) > 0)
+                    & (np.bincount(self.track_index, weights=lon > 170, minlength=self.size) > 0))
+        lon[crossing[self.track_index] & (lon < 0)] += 360
+
+        new_variables = {'time': new_time}
+        for var, values in self.variables.items():
+            if var in ['time', 'lat', 'lon']:
+                continue
+            if var == 'time_step':
+                new_variables[var] = np.full(new_time.size, time_step_h, dtype=np.float64)
+            elif values.dtype.kind in "uifc":
+                new_variables[var] = np.interp(xg_new, xg_old, values.astype(np.float64))
+            else:
+                new_variables[var] = values[nearest]
+
+        # the eye position is interpolated with splines of higher order if possible
+        latlon = np.stack([self.variables['lat'].astype(np.float64), lon], axis=-1)
+        new_latlon = np.stack([np.interp(xg_new, xg_old, latlon[:, i]) for i in range(2)],
+                              axis=-1)
+        for i_track in np.nonzero((sizes > 2) & (new_sizes > 0))[0]:
+            sl_old = slice(self.offsets[i_track], self.offsets[i_track + 1])
+            sl_new = slice(new_offsets[i_track], new_offsets[i_track + 1])
+            new_latlon[sl_new] = scipy.interpolate.interp1d(
+                x_old[sl_old], latlon[sl_old], axis=0, assume_sorted=True,
+                kind='quadratic' if sizes[i_track] == 3 else 'cubic',
+            )(x_new[sl_new])
+        new_lon = new_latlon[:, 1]
+        new_lon[new_lon > 180] -= 360
+        new_variables['lat'] = new_latlon[:, 0]
+        new_variables['lon'] = new_lon
+        new_variables = {var: new_variables[var] for var in self.variables.keys()}
+
+        attrs = self.attrs.copy()
+        if 'max_sustained_wind' in new_variables:
+            max_wind = np.full(self.size, np.nan)
+            nonempty = new_sizes > 0
+            max_wind[nonempty] = np.fmax.reduceat(
+                new_variables['max_sustained_wind'], new_offsets[:-1][nonempty])
+            wind_units = (attrs['max_sustained_wind_unit'].values
+                          if 'max_sustained_wind_unit' in attrs.columns
+                          else np.full(self.size, 'kn'))
+            attrs['category'] = [
+                set_category(wind, unit) if np.isfinite(wind) else -1
+                for wind, unit in zip(max_wind, wind_units)
+            ]
+
+        self.variables = new_variables
+        self.offsets = new_offsets
+        self.attrs = attrs
+
+
+def _track_geometries(lons, lats, sizes, split_antimeridian=False):
+    """Construct the (Multi)LineString geometries of all tracks at once
+
+    Parameters
+    ----------
+    lons, lats : np.ndarray
+        Flat (ragged) coordinates of all tracks.
+    sizes : np.ndarray of int
+        Number of positions of each track.
+    split_antimeridian : bool, optional
+        If True, tracks that come close to the antimeridian (with longitudes both larger than 170
+        and smaller than -170) are split into multiple Lines at each crossing of the antimeridian,
+        and returned as MultiLineString. A step between two positions is considered to cross the
+        antimeridian if it is shorter than 180 degrees in the range [0, 360), i.e., steps that
+        cross the prime meridian are not split. Default: False
+
+    Returns
+    -------
+    geoms : np.ndarray of shapely geometries
+        For each track, a LineString or MultiLineString (or Point if the track consists of a
+        single position).
+    """
+    ntracks = sizes.size
+    geoms = np.full(ntracks, None, dtype=object)
+    if ntracks == 0:
+        return geoms
+    offsets = np.zeros(ntracks + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+    track_idx = np.repeat(np.arange(ntracks), sizes)
+
+    # LineString only works with more than one lat/lon pair
+    single = (sizes == 1)
+    geoms[single] = shapely.points(lons[offsets[:-1][single]], lats[offsets[:-1][single]])
+
+    split = np.zeros(ntracks, dtype=bool)
+    if split_antimeridian:
+        # for splitting, restrict to tracks that come close to the antimeridian
+        split = ((sizes > 1)
+                 & (np.bincount(track_idx, weights=lons > 170, minlength=ntracks) > 0)
+                 & (np.bincount(track_idx, weights=lons < -170, minlength=ntracks) > 0))
+
+    line = (sizes > 1) & ~split
+    msk = line[track_idx]
+    if msk.any():
+        geoms[line] = shapely.linestrings(
+            np.stack([lons[msk], lats[msk]], axis=-1),
+            indices=np.unique(track_idx[msk], return_inverse=True)[1])
+
+    msk = split[track_idx]
+    if msk.any():
+        # work with longitudes in [0, 360) so that the antimeridian is at 180
+        x, y, tid = lons[msk] % 360, lats[msk], track_idx[msk]
+        east = (x > 180)
+        cross = ((tid[:-1] == tid[1:]) & (east[:-1] != east[1:])
+                 & (np.abs(x[1:] - x[:-1]) < 180))
+        i_cross = cross.nonzero()[0]
+        t_cross = (180 - x[i_cross]) / (x[i_cross + 1] - x[i_cross])
+        y_cross = y[i_cross] + t_cross * (y[i_cross + 1] - y[i_cross])
+
+        # insert each intersection point twice: as the end of one line and the start of the next
+        n_out = x.size + 2 * i_cross.size
+        pos = np.arange(x.size) + 2 * np.concatenate([[0], np.cumsum(cross)])
+        pos_cross = pos[i_cross]
+        out_x, out_y = np.zeros(n_out), np.zeros(n_out)
+        out_tid = np.zeros(n_out, dtype=np.int64)
+        out_east = np.zeros(n_out, dtype=bool)
+        out_x[pos], out_y[pos], out_tid[pos], out_east[pos] = x, y, tid, east
+        for i in [1, 2]:
+            out_x[pos_cross + i], out_y[pos_cross + i] = 180, y_cross
+            out_tid[pos_cross + i] = tid[i_cross]
+            # each intersection point is on the side of its neighboring position
+            out_east[pos_cross + i] = east[i_cross + i - 1]
+        part_start = np.zeros(n_out, dtype=bool)
+        part_start[pos[np.r_[True, tid[1:] != tid[:-1]]]] = True
+        part_start[pos_cross + 2] = True
+        part_id = np.cumsum(part_start) - 1
+        nparts = part_id[-1] + 1
+
+        # positions east of the antimeridian are shifted to negative longitudes, and lines that
+        # are degenerated to a point on the antimeridian are dropped
+        part_keep = np.bincount(part_id, weights=out_x != 180, minlength=nparts) > 0
+        out_x[out_east] -= 360
+        keep = part_keep[part_id]
+        lines = shapely.linestrings(
+            np.stack([out_x[keep], out_y[keep]], axis=-1),
+            indices=np.unique(part_id[keep], return_inverse=True)[1])
+        geoms[split] = shapely.multilinestrings(
+            lines, indices=np.unique(out_tid[part_start][part_keep], return_inverse=True)[1])
+    return geoms
+
+def _track_summary_row(track):
+    """Values of the columns `TRACK_SUMMARY_COLUMNS` for a single track"""
+    # users that pickle TCTracks objects might still have data with the legacy basin attribute
+    if isinstance(track.basin, str):
+        genesis_basin, basins = track.basin, frozenset([track.basin])
+    else:
+        basin = track.basin.values
+        genesis_basin = str(basin[0]) if basin.size > 0 else ''
+        basins = frozenset(np.unique(basin).tolist())
+    size = track.time.size
+    if size == 0:
+        return [genesis_basin, basins, -1, 0] + 4 * [np.nan] + [np.zeros((0, 4))]
+    year = int(track.time.dt.year.values[0])
+    bounds = u_coord.latlon_bounds(track.lat.values, track.lon.values)
+    return [genesis_basin, basins, year, size] + list(bounds) + [_track_lon_gaps(track)]
+
+
+def _track_fingerprint(track):
+    """Hash of the variables of a track that `_track_summary_row` depends on"""
+    hasher = hashlib.sha1(str(track.time.size).encode())
+    for var in ["time", "lat", "lon"]:
+        hasher.update(np.ascontiguousarray(track[var].values).tobytes())
+    # users that pickle TCTracks objects might still have data with the legacy basin attribute
+    basin = track.basin if isinstance(track.basin, str) else track.basin.values
+    hasher.update(np.asarray(basin, dtype=str).tobytes())
+    return hasher.hexdigest()
+
+
+def _track_lon_gaps(track):
+    """Longitudinal gaps of at least `LON_GAP_MIN` degrees between the positions of a track
+
+    The positions are normalized and sorted as in `climada.util.coordinates.lon_bounds`. The gap
+    from the largest longitude to the smallest one (plus 360) is always included.
+
+    Returns
+    -------
+    lon_gaps : np.array of shape (n, 4)
+        For each gap, the longitudes of the positions at the start and the end of the gap, the
+        end of the gap as used in `lon_bounds` (plus 360 if the gap crosses the antimeridian),
+        and whether the gap crosses the antimeridian (1.0) or not (0.0).
+    """
+    lon_uniq = np.unique(u_coord.lon_normalize(track.lon.values.copy()))
+    lon_end = np.concatenate([lon_uniq[1:], [360 + lon_uniq[0]]])
+    wraps = np.zeros(lon_uniq.size)
+    wraps[-1] = 1
+    gap_msk = (lon_end - lon_uniq) >= LON_GAP_MIN
+    gap_msk[-1] = True
+    lon_end_norm = np.concatenate([lon_uniq[1:], lon_uniq[:1]])
+    return np.stack([lon_uniq, lon_end_norm, lon_end, wraps], axis=1)[gap_msk]
+
+
+def _lon_bounds_union(lon_gaps, buffer=0.0):
+    """Longitudinal bounds of the union of several sets of longitudes
+
+    The result is the same as the one of `climada.util.coordinates.lon_bounds` applied to the
+    union of all sets, but it is computed from the (large) gaps of the single sets. A gap in the
+    union that is at least `LON_GAP_MIN` degrees wide starts and ends at positions that start or
+    end such gaps in the single sets, and it is contained in a gap of each of the sets.
+
+    Parameters
+    ----------
+    lon_gaps : iterable of np.array
+        For each set, the longitudinal gaps as returned by `_track_lon_gaps`.
+    buffer : float, optional
+        Buffer to add to both sides of the bounding box. Default: 0.0.
+
+    Returns
+    -------
+    bounds : tuple (lon_min, lon_max)
+    """
+    lon_gaps = list(lon_gaps)
+    set_idx = np.concatenate([np.full(gaps.shape[0], i) for i, gaps in enumerate(lon_gaps)])
+    gap_start, _, gap_end, gap_wraps = np.concatenate(lon_gaps, axis=0).T
+    gap_wraps = gap_wraps > 0
+
+    # candidate gaps between the start and end points of all single gaps
+    lon_uniq = np.unique(np.concatenate([gaps[:, :2].ravel() for gaps in lon_gaps]))
+    lon_uniq = np.concatenate([lon_uniq, [360 + lon_uniq[0]]])
+    lon_diff = np.diff(lon_uniq)
+    # in order of decreasing width, the first one in case of ties (like `np.argmax`)
+    for i_cand in np.lexsort((np.arange(lon_diff.size), -lon_diff)):
+        if lon_diff[i_cand] < LON_GAP_MIN:
+            break
+        start, end = lon_uniq[i_cand], lon_uniq[i_cand + 1]
+        contained = np.where(gap_start <= start, end <= gap_end,
+                             gap_wraps & (end + 360 <= gap_end))
+        if np.unique(set_idx[contained]).size == len(lon_gaps):
+            lon_min, lon_max = end, start
+            if lon_min > 180:
+                lon_min -= 360
+            else:
+                lon_max += 360
+            lon_min -= buffer
+            lon_max += buffer
+            if lon_min <= -180:
+                lon_min += 360
+                lon_max += 360
+            return (lon_min, lon_max)
+    # the union covers the whole range [-180, 180] rather evenly
+    return (max(lon_uniq[0] - buffer, -180), min(lon_uniq[-2] + buffer, 180))
+
+
+def _read_ragged_nc_var(file_name, var, run_starts, run_ends):
+    """Read runs of records of a single variable from a ragged NetCDF file
+
+    Parameters
+    ----------
+    file_name : str or Path
+        Path to a file written by `TCTracksRagged.write_netcdf`.
+    var : str
+        Name of the variable.
+    run_starts, run_ends : np.ndarray of int
+        Ranges of records to read, see `_ragged_read_runs`.
+
+    Returns
+    -------
+    values : np.ndarray
+        The concatenated values of all runs.
+    """
+    with xr.open_dataset(file_name) as ds:
+        return _read_ragged_nc_runs(ds, var, run_starts, run_ends)
+
+def _read_ragged_nc_runs(ds, var, run_starts, run_ends):
+    """Read runs of records of a single variable from an open ragged NetCDF dataset
+
+    See `_read_ragged_nc_var` for a description of the parameters.
+    """
+    if run_starts.size == 0:
+        return ds[var][0:0].values
+    return np.concatenate([ds[var][start:end].values
+                           for start, end in zip(run_starts, run_ends)])
+
+def _ragged_read_runs(starts, sizes):
+    """Contiguous runs of records that cover a selection of tracks in a ragged array
+
+    Consecutive selected tracks are read in a single run if the gap between them is not larger
+    than the mean size of the selected tracks. Hence, the number of records read is at most twice
+    the number of records of the selected tracks.
+
+    Parameters
+    ----------
+    starts : np.ndarray of int
+        Position of the first record of each selected track, in ascending order.
+    sizes : np.ndarray of int
+        Number of records of each selected track.
+
+    Returns
+    -------
+    run_starts, run_ends : np.ndarray of int
+        First and last (exclusive) record of each run.
+    """
+    nonempty = sizes > 0
+    starts, sizes = starts[nonempty], sizes[nonempty]
+    if starts.size == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    ends = starts + sizes
+    new_run = np.concatenate([[True], starts[1:] - ends[:-1] > sizes.mean()])
+    return starts[new_run], ends[np.concatenate([new_run[1:], [True]])]
+
+def _ragged_positions(starts, sizes):
+    """Flat positions of the records of a selection of tracks in a ragged array
+
+    Parameters
+    ----------
+    starts : np.ndarray of int
+        Position of the first record of each selected track.
+    sizes : np.ndarray of int
+        Number of records of each selected track.
+
+    Returns
+    -------
+    positions : np.ndarray of int
+        Array of shape (sizes.sum(),) with the positions of all records of the selected tracks.
+    """
+    new_starts = np.zeros(sizes.size, dtype=np.int64)
+    np.cumsum(sizes[:-1], out=new_starts[1:])
+    return np.repeat(starts - new_starts, sizes) + np.arange(sizes.sum(), dtype=np.int64)
+
+def _ragged_fill_nearest(values, offsets, limit):
+    """Fill NaNs in a ragged array with the nearest valid value of the same track
+
+    This is equivalent to `.ffill(limit=limit).bfill(limit=limit)` applied to each track
+    separately: NaNs are first replaced by the last valid value before them, if there are at most
+    `limit` positions in between, and the remaining NaNs are replaced by the next valid value.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Flat array of values of all tracks.
+    offsets : np.ndarray of int
+        Position of the first record of each track, and the total number of records.
+    limit : int
+        Maximum number of consecutive NaNs to fill in each direction.
+
+    Returns
+    -------
+    values : np.ndarray
+        A filled copy of `values`.
+    """
+    values = values.copy()
+    sizes = np.diff(offsets)
+    idx = np.arange(values.size)
+
+    track_start = np.repeat(offsets[:-1], sizes)
+    last_valid = np.maximum.accumulate(np.where(np.isnan(values), -1, idx))
+    msk = np.isnan(values) & (last_valid >= track_start) & (idx - last_valid <= limit)
+    values[msk] = values[last_valid[msk]]
+
+    track_end = np.repeat(offsets[1:], sizes) - 1
+    next_valid = np.minimum.accumulate(np.where(np.isnan(values), values.size, idx)[::-1])[::-1]
+    msk = np.isnan(values) & (next_valid <= track_end) & (next_valid - idx <= limit)
+    values[msk] = values[next_valid[msk]]
+    return values
+
+def _ragged_fill_value(dtype):
+    """Fill value for records of tracks where a variable is missing"""
+    if np.issubdtype(dtype, np.floating):
+        return np.nan
+    if np.issubdtype(dtype, np.datetime64):
+        return np.datetime64('NaT')
+    if np.issubdtype(dtype, np.str_):
+        return ''
+    if np.issubdtype(dtype, np.object_):
+        return None
+    return 0
+
+def _ragged_attr_missing(val):
+    """Whether a track attribute value in the attributes table is a placeholder (NaN or None)"""
+    return val is None or (np.isscalar(val) and pd.isna(val))
+
 def _xr_to_netcdf_multi(path, ds_dict, encoding=None):
     """Write multiple xarray Datasets to separate groups in a single NetCDF4 file
 
@@ -1600,6 +2606,145 @@ def _xr_nc4_groups_from_store(store):
     with store._manager.acquire_context(False) as root:
         return iter_groups(root)
 
+def _ibtracs_cache_path(ibtracs_path, ibtracs_date, suffix=".nc", **params):
+    """Path of the cache file for processed IBTrACS data
+
+    The file name is derived from a hash of the processing parameters, the version of the raw
+    IBTrACS file (its creation date, size and modification time) and `IBTRACS_CACHE_VERSION`.
+
+    Parameters
+    ----------
+    ibtracs_path : Path
+        Path to the raw IBTrACS NetCDF file.
+    ibtracs_date : str
+        The "date_created" attribute of the raw IBTrACS NetCDF file.
+    suffix : str, optional
+        File name suffix of the cache file. Default: ".nc"
+    params : dict
+        Parameters of `TCTracks.from_ibtracs_netcdf` (or `ibtracs_fit_param`) that affect the
+        cached data.
+
+    Returns
+    -------
+    cache_path : Path
+    """
+    stat = ibtracs_path.stat()
+    key = repr((IBTRACS_CACHE_VERSION, ibtracs_path.name, ibtracs_date, stat.st_size,
+                stat.st_mtime_ns, sorted(params.items())))
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return Path(IBTRACS_CACHE_DIR, f"{ibtracs_path.stem}_{digest}{suffix}")
+
+def _ibtracs_tracks_from_ds(ibtracs_ds, provider, phys_vars, basin, genesis_basin,
+                            estimate_missing, log_progress=False):
+    """Convert preprocessed IBTrACS storms to TC tracks
+
+    This is the last processing step of `TCTracks.from_ibtracs_netcdf`, applied to each storm
+    separately.
+
+    Parameters
+    ----------
+    ibtracs_ds : xr.Dataset
+        Preprocessed IBTrACS data, with the additional variables "valid_t", "category", "id_no"
+        and "storm_idx".
+    provider : list of str
+        The data providers as passed to `TCTracks.from_ibtracs_netcdf`.
+    phys_vars : list of str
+        The physical variables for which the providing agency is reported.
+    basin, genesis_basin : str or None
+        The basin filters as passed to `TCTracks.from_ibtracs_netcdf`.
+    estimate_missing : bool
+        Whether to estimate missing radius values.
+    log_progress : bool, optional
+        Whether to log the progress. Default: False
+
+    Returns
+    -------
+    tracks : list of tuple (int, xr.Dataset)
+        For each storm that is not discarded by the basin filters, the value of "storm_idx" and
+        the track.
+    """
+    # Fill missing radii and environmental pressure values on the flat arrays of all valid track
+    # positions at once (storms in order, time steps in ascending order within each storm).
+    valid_t = ibtracs_ds.valid_t.values
+    offsets = np.concatenate([[0], np.cumsum(valid_t.sum(axis=1))])
+    pres = ibtracs_ds.pres.values[valid_t]
+    rmw = _ragged_fill_nearest(ibtracs_ds.rmw.values[valid_t], offsets, limit=1)
+    rmw[np.isnan(rmw)] = 0
+    roci = _ragged_fill_nearest(ibtracs_ds.roci.values[valid_t], offsets, limit=1)
+    roci[np.isnan(roci)] = 0
+    poci = _ragged_fill_nearest(ibtracs_ds.poci.values[valid_t], offsets, limit=4)
+    basin_uniq, basin_inv = np.unique(ibtracs_ds.basin.values[valid_t], return_inverse=True)
+    basin_penv = np.array([BASIN_ENV_PRESSURE[b.decode("utf-8")] for b in basin_uniq])
+    poci = np.where(np.isnan(poci), basin_penv[basin_inv], poci)
+    if estimate_missing:
+        rmw = estimate_rmw(rmw, pres)
+        roci = np.fmax(rmw, estimate_roci(roci, pres))
+    # ensure environmental pressure >= central pressure
+    poci = np.fmax(poci, pres)
+
+    last_perc = 0
+    all_tracks = []
+    for i_track, t_msk in enumerate(ibtracs_ds.valid_t.data):
+        perc = 100 * len(all_tracks) / ibtracs_ds.sid.size
+        if log_progress and perc - last_perc >= 10:
+            LOGGER.info("Progress: %d%%", perc)
+            last_perc = perc
+        track_ds = ibtracs_ds.sel(storm=i_track, date_time=t_msk)
+        tr_genesis_basin = track_ds.basin.values[0].astype(str).item()
+
+        # Now that the valid time steps have been selected, we discard this track if it
+        # doesn't fit the specified basin definitions:
+        if genesis_basin is not None and tr_genesis_basin != genesis_basin:
+            continue
+        if basin is not None and basin.encode() not in track_ds.basin.values:
+            continue
+
+        # A track that crosses the antimeridian in IBTrACS might be truncated by `t_msk` in
+        # such a way that the remaining part is not crossing the antimeridian:
+        if (track_ds.lon.values > 180).all():
+            track_ds['lon'] -= 360
+
+        # set time_step in hours
+        track_ds['time_step'] = xr.ones_like(track_ds.time, dtype=float)
+        if track_ds.time.size > 1:
+            track_ds.time_step.values[1:] = (track_ds.time.diff(dim="date_time")
+                                             / np.timedelta64(1, 'h'))
+            track_ds.time_step.values[0] = track_ds.time_step[1]
+
+        t_slice = slice(offsets[i_track], offsets[i_track + 1])
+
+        provider_str = f"ibtracs_{provider[0]}"
+        if len(provider) > 1:
+            provider_str = "ibtracs_mixed:" + ",".join(
+                "{}({})".format(v, track_ds[f'{v}_agency'].astype(str).item())
+                for v in phys_vars)
+
+        all_tracks.append((track_ds.storm_idx.item(), xr.Dataset({
+            'time_step': ('time', track_ds.time_step.data),
+            'radius_max_wind': ('time', rmw[t_slice]),
+            'radius_oci': ('time', roci[t_slice]),
+            'max_sustained_wind': ('time', track_ds.wind.data),
+            'central_pressure': ('time', track_ds.pres.data),
+            'environmental_pressure': ('time', poci[t_slice]),
+            'basin': ('time', track_ds.basin.data.astype("<U2")),
+        }, coords={
+            'time': track_ds.time.dt.round('s').data,
+            'lat': ('time', track_ds.lat.data),
+            'lon': ('time', track_ds.lon.data),
+        }, attrs={
+            'max_sustained_wind_unit': 'kn',
+            'central_pressure_unit': 'mb',
+            'name': track_ds.name.astype(str).item(),
+            'sid': track_ds.sid.astype(str).item(),
+            'orig_event_flag': True,
+            'data_provider': provider_str,
+            'id_no': track_ds.id_no.item(),
+            'category': track_ds.category.item(),
+        })))
+    if log_progress and last_perc != 100:
+        LOGGER.info("Progress: 100%")
+    return all_tracks
+
 def _read_one_gettelman(nc_data, i_track):
     """Read a single track from Andrew Gettelman's NetCDF dataset
 
@@ -1900,8 +3045,8 @@ def track_land_params(track, land_geom):
     ----------
     track : xr.Dataset
         tropical cyclone track
-    land_geom : shapely.geometry.multipolygon.MultiPolygon
-        land geometry
+    land_geom : shapely.geometry.multipolygon.MultiPolygon or climada.util.coordinates.LandMask
+        land geometry, or rasterized land mask for faster computation
     """
     track['on_land'] = ('time',
                         u_coord.coord_on_land(track.lat.values, track.lon.values, land_geom))
@@ -1927,40 +3072,45 @@ def _dist_since_lf(track):
     if not sea_land_idx.size:
         return (dist_since_lf + 1) * np.nan
 
-    orig_lf = np.empty((sea_land_idx.size, 2))
-    for i_lf, lf_point in enumerate(sea_land_idx):
-        if lf_point > 0:
-            # Assume the landfall started between this and the previous point
-            orig_lf[i_lf][0] = track.lat[lf_point - 1] + \
-                (track.lat[lf_point] - track.lat[lf_point - 1]) / 2
-            orig_lf[i_lf][1] = track.lon[lf_point - 1] + \
-                (track.lon[lf_point] - track.lon[lf_point - 1]) / 2
-        else:
-            # track starts over land, assume first 'landfall' starts here
-            orig_lf[i_lf][0] = track.lat[lf_point]
-            orig_lf[i_lf][1] = track.lon[lf_point]
-
-
-    dist = DistanceMetric.get_metric('haversine')
-    nodes1 = np.radians(np.array([track.lat.values[1:],
-                                  track.lon.values[1:]]).transpose())
-    nodes0 = np.radians(np.array([track.lat.values[:-1],
-                                  track.lon.values[:-1]]).transpose())
-    dist_since_lf[1:] = dist.pairwise(nodes1, nodes0).diagonal()
-    dist_since_lf[~track.on_land.values] = 0.0
-    nodes1 = np.array([track.lat.values[sea_land_idx],
-                       track.lon.values[sea_land_idx]]).transpose() / 180 * np.pi
-    dist_since_lf[sea_land_idx] = \
-        dist.pairwise(nodes1, orig_lf / 180 * np.pi).diagonal()
+    lat, lon = track.lat.values, track.lon.values
+    on_land = track.on_land.values
+    # Assume the landfall started between this and the previous point, unless the
+    # track starts over land, in which case the first 'landfall' starts there
+    prev_idx = np.fmax(sea_land_idx - 1, 0)
+    orig_lf_lat = 0.5 * (lat[prev_idx] + lat[sea_land_idx])
+    orig_lf_lon = 0.5 * (lon[prev_idx] + lon[sea_land_idx])
+
+    dist_since_lf[1:] = _haversine_rad(lat[1:], lon[1:], lat[:-1], lon[:-1])
+    dist_since_lf[~on_land] = 0.0
+    dist_since_lf[sea_land_idx] = _haversine_rad(lat[sea_land_idx], lon[sea_land_idx],
+                                                 orig_lf_lat, orig_lf_lon)
     for sea_land, land_sea in zip(sea_land_idx, land_sea_idx):
         dist_since_lf[sea_land:land_sea] = \
             np.cumsum(dist_since_lf[sea_land:land_sea])
 
     dist_since_lf *= EARTH_RADIUS_KM
-    dist_since_lf[~track.on_land.values] = np.nan
+    dist_since_lf[~on_land] = np.nan
 
     return dist_since_lf
 
+def _haversine_rad(lat1, lon1, lat2, lon2):
+    """Element-wise great circle distance (in radians) between points given in degrees
+
+    Parameters
+    ----------
+    lat1, lon1, lat2, lon2 : np.array
+        Coordinates of the start and end points, in degrees.
+
+    Returns
+    -------
+    dist : np.array
+        Angular distance between each pair of start and end points, in radians.
+    """
+    lat1, lon1, lat2, lon2 = [np.radians(ar) for ar in [lat1, lon1, lat2, lon2]]
+    sin_dlat = np.sin(0.5 * (lat2 - lat1))
+    sin_dlon = np.sin(0.5 * (lon2 - lon1))
+    return 2 * np.arcsin(np.sqrt(sin_dlat**2 + np.cos(lat1) * np.cos(lat2) * sin_dlon**2))
+
 def _get_landfall_idx(track, include_starting_landfall=False):
     """Get the position of the start and end of landfalls for a TC track.
 
@@ -2143,7 +3293,7 @@ def estimate_rmw(rmw, cen_pres):
                                            - slope_1 * np.fmax(0, cen_pres[msk] - pres_l_i)))
     return np.where(rmw <= 0, np.nan, rmw)
 
-def ibtracs_fit_param(explained, explanatory, year_range=(1980, 2019), order=1):
+def ibtracs_fit_param(explained, explanatory, year_range=(1980, 2019), order=1, cache=False):
     """Statistically fit an ibtracs parameter to other ibtracs variables.
 
     A linear ordinary least squares fit is done using the statsmodels package.
@@ -2158,6 +3308,10 @@ def ibtracs_fit_param(explained, explanatory, year_range=(1980, 2019), order=1):
         First and last year to include in the analysis.
     order : int or tuple
         The maximal order of the explanatory variables.
+    cache : bool, optional
+        If True, the fit result is stored in the folder `IBTRACS_CACHE_DIR` and reused by later
+        calls with the same parameters, as long as the IBTrACS file is unchanged. If the cache
+        file cannot be read, the fit is computed again. Default: False
 
     Returns
     -------
@@ -2175,6 +3329,49 @@ def ibtracs_fit_param(explained, explanatory, year_range=(1980, 2019), order=1):
     fn_nc = SYSTEM_DIR.joinpath('IBTrACS.ALL.v04r00.nc')
     ibtracs_ds = xr.open_dataset(fn_nc)
 
+    if cache:
+        cache_path = _ibtracs_cache_path(
+            fn_nc, ibtracs_ds.attrs.get('date_created'), suffix=".pickle", explained=explained,
+            explanatory=explanatory, year_range=tuple(year_range), order=order)
+        sm_results = None
+        if cache_path.is_file():
+            LOGGER.info("Reading fit result from cache: %s", cache_path)
+            try:
+                sm_results = sm.regression.linear_model.OLSResults.load(str(cache_path))
+            except Exception as err:  # pylint: disable=broad-except
+                # e.g. a cache file written with another version of statsmodels
+                LOGGER.warning("Failed to read cached fit result %s, fitting again: %s",
+                               cache_path, err)
+        if sm_results is None:
+            sm_results = _ibtracs_fit_param_ds(
+                ibtracs_ds, explained, explanatory, wmo_vars, year_range, order)
+            LOGGER.info("Writing fit result to cache: %s", cache_path)
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # the temporary file is specific to this process to allow for concurrent writes
+            tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+            sm_results.save(str(tmp_path))
+            tmp_path.replace(cache_path)
+    else:
+        sm_results = _ibtracs_fit_param_ds(
+            ibtracs_ds, explained, explanatory, wmo_vars, year_range, order)
+
+    # print results
+    print(sm_results.params)
+    print("r^2:", sm_results.rsquared)
+
+    return sm_results
+
+def _ibtracs_fit_param_ds(ibtracs_ds, explained, explanatory, wmo_vars, year_range, order):
+    """Statistically fit an ibtracs parameter to other ibtracs variables in a dataset
+
+    See `ibtracs_fit_param` for a description of the parameters.
+
+    Returns
+    -------
+    result : OLSResults
+    """
+    variables = explanatory + [explained]
+
     # choose specified year range
     years = ibtracs_ds.sid.str.slice(0, 4).astype(int)
     match = (years >= year_range[0]) & (years <= year_range[1])
@@ -2241,13 +3438,7 @@ def ibtracs_fit_param(explained, explanatory, year_range=(1980, 2019), order=1):
         d_explanatory['const'] = 1.0
 
     # run statistical fit
-    sm_results = sm.OLS(d_explained, d_explanatory).fit()
-
-    # print results
-    print(sm_results.params)
-    print("r^2:", sm_results.rsquared)
-
-    return sm_results
+    return sm.OLS(d_explained, d_explanatory).fit()
 
 def ibtracs_track_agency(ds_sel):
     """Get preferred IBTrACS agency for each entry in the dataset.
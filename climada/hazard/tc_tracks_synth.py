@@ -27,6 +27,7 @@ from matplotlib.lines import Line2D
 import matplotlib.pyplot as plt
 import numba
 import numpy as np
+import pandas as pd
 
 from climada import CONFIG
 import climada.util.coordinates
@@ -89,7 +90,8 @@ def calc_perturbed_trajectories(tracks,
                                 seed=CONFIG.hazard.trop_cyclone.random_seed.int(),
                                 decay=True,
                                 use_global_decay_params=True,
-                                pool=None):
+                                pool=None,
+                                land_mask_res=0.05):
     """
     Generate synthetic tracks based on directed random walk. An ensemble of nb_synth_tracks
     synthetic tracks is computed for every track contained in self.
@@ -159,6 +161,11 @@ def calc_perturbed_trajectories(tracks,
     pool : pathos.pool, optional
         Pool that will be used for parallel computation when applicable. If not given, the
         pool attribute of `tracks` will be used. Default: None
+    land_mask_res : float, optional
+        Resolution (in degrees) of the rasterized land mask that is used to determine which
+        track points are over land when applying landfall decay. Only points close to the
+        coastline are checked against the exact land geometry. If None, all points are checked
+        against the exact land geometry. Default: 0.05
     """
     LOGGER.info('Computing %s synthetic tracks.', nb_synth_tracks * tracks.size)
 
@@ -191,23 +198,10 @@ def calc_perturbed_trajectories(tracks,
                       if track.time.size > 1 else np.random.uniform(size=nb_synth_tracks * 2)
                       for track in tracks.data]
 
-    if pool:
-        chunksize = min(tracks.size // pool.ncpus, 1000)
-        new_ens = pool.map(_one_rnd_walk, tracks.data,
-                           itertools.repeat(nb_synth_tracks, tracks.size),
-                           itertools.repeat(max_shift_ini, tracks.size),
-                           itertools.repeat(max_dspeed_rel, tracks.size),
-                           itertools.repeat(max_ddirection, tracks.size),
-                           random_vec, chunksize=chunksize)
-    else:
-        new_ens = [_one_rnd_walk(track, nb_synth_tracks, max_shift_ini,
-                                 max_dspeed_rel, max_ddirection, rand)
-                   for track, rand in zip(tracks.data, random_vec)]
-
-    cutoff_track_ids_tc = [x[1] for x in new_ens]
-    cutoff_track_ids_tc = sum(cutoff_track_ids_tc, [])
-    cutoff_track_ids_ts = [x[2] for x in new_ens]
-    cutoff_track_ids_ts = sum(cutoff_track_ids_ts, [])
+    new_ens, cutoff_track_ids_tc, cutoff_track_ids_ts = _rnd_walk_batch(
+        tracks.data, nb_synth_tracks, max_shift_ini, max_dspeed_rel, max_ddirection,
+        time_step_h, random_vec)
+
     if len(cutoff_track_ids_tc) > 0:
         LOGGER.info('The following generated synthetic tracks moved beyond '
                     'the range of [-70, 70] degrees latitude. Cut out '
@@ -218,14 +212,15 @@ def calc_perturbed_trajectories(tracks,
                      'the range of [-70, 70] degrees latitude. Cut out '
                      'at TC category <= 1: %s.',
                      ', '.join(cutoff_track_ids_ts))
-    new_ens = [x[0] for x in new_ens]
-    tracks.data = sum(new_ens, [])
+    tracks.data = new_ens
 
     if decay:
         extent = tracks.get_extent()
         land_geom = climada.util.coordinates.get_land_geometry(
             extent=extent, resolution=10
         )
+        if land_mask_res is not None:
+            land_geom = climada.util.coordinates.LandMask(land_geom, resolution=land_mask_res)
         if use_global_decay_params:
             tracks.data = _apply_land_decay(tracks.data, LANDFALL_DECAY_V,
                                             LANDFALL_DECAY_P, land_geom, pool=pool)
@@ -356,6 +351,185 @@ def _one_rnd_walk(track, nb_synth_tracks, max_shift_ini, max_dspeed_rel, max_ddi
     return ens_track, cutoff_track_ids_tc, cutoff_track_ids_ts
 
 
+def _rnd_walk_batch(data, nb_synth_tracks, max_shift_ini, max_dspeed_rel, max_ddirection,
+                    time_step_h, random_vec):
+    """
+    Apply random walk to all tracks at once.
+
+    This is equivalent to applying `_one_rnd_walk` to each track, but the perturbed positions of
+    all ensemble members of all tracks are computed in a single compiled loop, and the synthetic
+    tracks are constructed in bulk from the columnar representation of the tracks.
+
+    Parameters
+    ----------
+    data : list(xr.Dataset)
+        List of tracks, all at the temporal resolution `time_step_h`.
+    nb_synth_tracks : int
+        Number of ensemble members per track.
+    max_shift_ini : float
+        Amplitude of max random starting point shift in decimal degree.
+    max_dspeed_rel : float
+        Amplitude of translation speed perturbation in relative terms.
+    max_ddirection : float
+        Amplitude of track direction (bearing angle) perturbation per hour, in radians.
+    time_step_h : float
+        Temporal resolution of the tracks, in hours.
+    random_vec : list(np.ndarray)
+        For each track, the vector of random perturbations as expected by `_one_rnd_walk`.
+
+    Returns
+    -------
+    ens_track : list(xr.Dataset)
+        For each track, the original track followed by its synthetic tracks.
+    cutoff_track_ids_tc : List of str
+        List containing information about the tracks that were cut off at high
+        latitudes with wind speed of TC category 2-5.
+    cutoff_track_ids_ts : List of str
+        List containing information about the tracks that were cut off at high
+        latitudes with a wind speed up to TC category 1.
+    """
+    if not data:
+        return [], [], []
+    ragged = climada.hazard.tc_tracks.TCTracksRagged.from_list(data)
+    lon, lat = ragged.variables['lon'], ragged.variables['lat']
+
+    # bearings and angular distances of all segments, including (meaningless) segments that
+    # connect the end of one track with the start of the next one
+    bearings = _get_bearing_angle(lon, lat)
+    angular_dist = climada.util.coordinates.dist_approx(lat[:-1, None], lon[:-1, None],
+                                                        lat[1:, None], lon[1:, None],
+                                                        method="geosphere",
+                                                        units="degree")[:, 0, 0]
+
+    # scale random numbers as in `_one_rnd_walk`, element-wise for all tracks at once
+    rnd_vec = np.concatenate(random_vec)
+    rnd_offsets = np.zeros(len(random_vec) + 1, dtype=np.int64)
+    np.cumsum([vec.size for vec in random_vec], out=rnd_offsets[1:])
+    xy_ini = max_shift_ini * (2 * rnd_vec - 1)
+    ang_pert = time_step_h * np.degrees(max_ddirection * (2 * rnd_vec - 1))
+    trans_pert = 1 + max_dspeed_rel * (2 * rnd_vec - 1)
+
+    new_lon, new_lat, last_idx = _rnd_walk_positions(
+        lon, lat, ragged.offsets, bearings, angular_dist, rnd_offsets, xy_ini, ang_pert,
+        trans_pert, nb_synth_tracks)
+    # make sure longitude values are within (-180, 180)
+    climada.util.coordinates.lon_normalize(new_lon, center=0.0)
+
+    # report tracks that have been cut off at high latitudes
+    cutoff_track_ids_ts = []
+    cutoff_track_ids_tc = []
+    wind = ragged.variables['max_sustained_wind']
+    for i_track, i_ens in zip(*np.nonzero(last_idx < ragged.sizes[:, None])):
+        max_wind_end = wind[ragged.offsets[i_track] + last_idx[i_track, i_ens]]
+        ss_scale_end = climada.hazard.tc_tracks.set_category(
+            max_wind_end, data[i_track].max_sustained_wind_unit)
+        cutoff_txt = (f"{data[i_track].attrs['name']}_gen{i_ens + 1}"
+                      f" ({climada.hazard.tc_tracks.CAT_NAMES[ss_scale_end]})")
+        if ss_scale_end > 1:
+            cutoff_track_ids_tc.append(cutoff_txt)
+        else:
+            cutoff_track_ids_ts.append(cutoff_txt)
+
+    # construct all synthetic tracks from the ragged arrays of the original tracks
+    synth_track_idx = np.repeat(np.arange(ragged.size), nb_synth_tracks)
+    synth_ens_idx = np.tile(np.arange(nb_synth_tracks), ragged.size)
+    synth_sizes = last_idx.ravel()
+    synth_offsets = np.zeros(synth_sizes.size + 1, dtype=np.int64)
+    np.cumsum(synth_sizes, out=synth_offsets[1:])
+    # pylint: disable=protected-access
+    positions = climada.hazard.tc_tracks._ragged_positions(
+        ragged.offsets[synth_track_idx], synth_sizes)
+    synth_variables = {var: values[positions] for var, values in ragged.variables.items()}
+    ens_rep = np.repeat(synth_ens_idx, synth_sizes)
+    synth_variables['lon'] = new_lon[ens_rep, positions]
+    synth_variables['lat'] = new_lat[ens_rep, positions]
+
+    synth_attrs = ragged.attrs.iloc[synth_track_idx].reset_index(drop=True)
+    gen_suffix = pd.Series([f"_gen{i_ens + 1}" for i_ens in synth_ens_idx])
+    synth_attrs['orig_event_flag'] = False
+    synth_attrs['name'] = synth_attrs['name'].astype(str) + gen_suffix
+    synth_attrs['sid'] = synth_attrs['sid'].astype(str) + gen_suffix
+    synth_attrs['id_no'] = synth_attrs['id_no'] + (synth_ens_idx + 1) / 100
+
+    synth_ragged = climada.hazard.tc_tracks.TCTracksRagged(
+        variables=synth_variables, offsets=synth_offsets, attrs=synth_attrs,
+        var_present={var: mask[synth_track_idx] for var, mask in ragged.var_present.items()})
+    synth_data = synth_ragged.to_list()
+
+    ens_track = []
+    for i_track, track in enumerate(data):
+        ens_track.append(track)
+        ens_track.extend(synth_data[i_track * nb_synth_tracks:(i_track + 1) * nb_synth_tracks])
+    return ens_track, cutoff_track_ids_tc, cutoff_track_ids_ts
+
+
+@numba.njit
+def _rnd_walk_positions(lon, lat, offsets, bearings, angular_dist, rnd_offsets, xy_ini,
+                        ang_pert, trans_pert, nb_synth_tracks):
+    """
+    Compute the perturbed positions of all ensemble members of all tracks.
+
+    The random perturbations are read from the same positions in the random vectors as in
+    `_one_rnd_walk`, so that the results are identical.
+
+    Parameters
+    ----------
+    lon, lat : numpy.ndarray of shape (nrecords,)
+        Flat (ragged) coordinates of all tracks, in decimal degrees.
+    offsets : numpy.ndarray of shape (ntracks + 1,)
+        Start position of each track in the flat arrays.
+    bearings, angular_dist : numpy.ndarray of shape (nrecords - 1,)
+        Bearing angle and angular distance (in decimal degrees) of each segment.
+    rnd_offsets : numpy.ndarray of shape (ntracks + 1,)
+        Start position of each track's random vector in the flat random arrays.
+    xy_ini, ang_pert, trans_pert : numpy.ndarray
+        Flat random vectors scaled to starting point shifts (in decimal degrees), bearing
+        perturbations (in decimal degrees) and relative translation speed perturbations.
+    nb_synth_tracks : int
+        Number of ensemble members per track.
+
+    Returns
+    -------
+    new_lon, new_lat : numpy.ndarray of shape (nb_synth_tracks, nrecords)
+        Perturbed coordinates for each ensemble member.
+    last_idx : numpy.ndarray of shape (ntracks, nb_synth_tracks)
+        Number of positions to keep for each synthetic track (tracks are cut off after crossing
+        the latitudinal thresholds +-70 degrees).
+    """
+    ntracks = offsets.size - 1
+    new_lon = np.zeros((nb_synth_tracks, lon.size))
+    new_lat = np.zeros((nb_synth_tracks, lon.size))
+    last_idx = np.zeros((ntracks, nb_synth_tracks), dtype=np.int64)
+    for i_track in range(ntracks):
+        start = offsets[i_track]
+        n_dat = offsets[i_track + 1] - start
+        n_seg = n_dat - 1
+        i_rnd = rnd_offsets[i_track]
+        for i_ens in range(nb_synth_tracks):
+            new_lon[i_ens, start] = lon[start] + xy_ini[i_rnd + i_ens]
+            new_lat[i_ens, start] = lat[start] + xy_ini[i_rnd + nb_synth_tracks + i_ens]
+            i_start_ang = i_rnd + 2 * nb_synth_tracks + i_ens * n_seg
+            i_start_trans = i_rnd + 2 * nb_synth_tracks + nb_synth_tracks * n_seg + i_ens * n_seg
+            ang_pert_cum = 0.0
+            last = n_dat
+            for i in range(n_seg):
+                ang_pert_cum += ang_pert[i_start_ang + i]
+                lon_2, lat_2 = _get_destination_points(
+                    new_lon[i_ens, start + i], new_lat[i_ens, start + i],
+                    bearings[start + i] + ang_pert_cum,
+                    trans_pert[i_start_trans + i] * angular_dist[start + i])
+                new_lon[i_ens, start + i + 1] = lon_2
+                new_lat[i_ens, start + i + 1] = lat_2
+                # if track crosses latitudinal thresholds (+-70°),
+                # keep up to this segment (i+1), set i+2 as last point,
+                # and discard all further points > i+2.
+                if i + 2 < last and (lat_2 > 70 or lat_2 < -70):
+                    last = i + 2
+                    break
+            last_idx[i_track, i_ens] = last
+    return new_lon, new_lat, last_idx
+
+
 def _random_uniform_ac(n_ts, autocorr, time_step_h):
     """
     Generate a series of autocorrelated uniformly distributed random numbers.
@@ -389,8 +563,7 @@ def _random_uniform_ac(n_ts, autocorr, time_step_h):
     n_ts_hourly = int(np.ceil(n_ts_hourly_exact))
     x = np.random.normal(size=n_ts_hourly)
     theta = np.arccos(autocorr)
-    for i in range(1, len(x)):
-        x[i] = _h_ac(x[i - 1], x[i], theta)
+    _apply_h_ac(x, theta)
     # scale x to have magnitude [0,1]
     x = (x + np.sqrt(3)) / (2 * np.sqrt(3))
     # resample at target time step
@@ -399,6 +572,23 @@ def _random_uniform_ac(n_ts, autocorr, time_step_h):
     return x_ts
 
 
+@numba.njit
+def _apply_h_ac(x, theta):
+    """
+    Apply the autocorrelation transform `_h_ac` sequentially to a series, in place
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        Series of random standard normal values. Each value (except for the first) is replaced
+        by `_h_ac` applied to the (transformed) previous value and the original value.
+    theta : float
+        arccos of autocorrelation.
+    """
+    for i in range(1, x.size):
+        x[i] = _h_ac(x[i - 1], x[i], theta)
+
+
 @numba.njit
 def _h_ac(x, y, theta):
     """
@@ -555,7 +745,7 @@ def _calc_land_decay(hist_tracks, land_geom, s_rel=True, check_plot=False,
     ----------
     hist_tracks : list
         List of xarray Datasets describing TC tracks.
-    land_geom : shapely.geometry.multipolygon.MultiPolygon
+    land_geom : shapely.geometry.multipolygon.MultiPolygon or climada.util.coordinates.LandMask
         land geometry
     s_rel : bool, optional
         use environmental presure to calc S value
@@ -621,7 +811,7 @@ def _apply_land_decay(tracks, v_rel, p_rel, land_geom, s_rel=True,
     p_rel : dict
         (category: (S, B)}, where pressure decay
         = S-(S-1)*exp(-x*B)
-    land_geom : shapely.geometry.multipolygon.MultiPolygon
+    land_geom : shapely.geometry.multipolygon.MultiPolygon or climada.util.coordinates.LandMask
         land geometry
     s_rel : bool, optional
         use environmental presure to calc S value
@@ -669,7 +859,7 @@ def _decay_values(track, land_geom, s_rel):
     ----------
     track : xr.Dataset
         track
-    land_geom : shapely.geometry.multipolygon.MultiPolygon
+    land_geom : shapely.geometry.multipolygon.MultiPolygon or climada.util.coordinates.LandMask
         land geometry
     s_rel : bool
         use environmental presure for S value (true) or central presure (false)
@@ -848,7 +1038,7 @@ def _apply_decay_coeffs(track, v_rel, p_rel, land_geom, s_rel):
     p_rel : dict
         (category: (S, B)},
         where pressure decay = S-(S-1)*exp(-x*B)
-    land_geom : shapely.geometry.multipolygon.MultiPolygon
+    land_geom : shapely.geometry.multipolygon.MultiPolygon or climada.util.coordinates.LandMask
         land geometry
     s_rel : bool
         use environmental presure for S value (true) or
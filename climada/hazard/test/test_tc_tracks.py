@@ -19,8 +19,12 @@ with CLIMADA. If not, see <https://www.gnu.org/licenses/>.
 Test tc_tracks module.
 """
 
+from pathlib import Path
+import tempfile
 import unittest
+import unittest.mock
 import xarray as xr
+from pathos.pools import ThreadPool
 import numpy as np
 import pandas as pd
 import geopandas as gpd
@@ -284,6 +288,79 @@ class TestIbtracs(unittest.TestCase):
                     break
         self.assertTrue(passed)
 
+    def test_ibtracs_cache(self):
+        """Check that tracks are read from the cache"""
+        with tempfile.TemporaryDirectory() as tmpdir, \
+                unittest.mock.patch.object(tc, 'IBTRACS_CACHE_DIR', Path(tmpdir)):
+            tc_track = tc.TCTracks.from_ibtracs_netcdf(
+                provider='usa', year_range=(1993, 1994), basin='EP', cache=True)
+            self.assertEqual(len(list(Path(tmpdir).glob("*.nc"))), 1)
+            with self.assertLogs('climada.hazard.tc_tracks', level='INFO') as cm:
+                tc_read = tc.TCTracks.from_ibtracs_netcdf(
+                    provider='usa', year_range=(1993, 1994), basin='EP', cache=True)
+            self.assertIn('Reading processed IBTrACS data from cache', cm.output[0])
+            # other parameters are cached separately
+            tc.TCTracks.from_ibtracs_netcdf(
+                provider='usa', year_range=(1993, 1994), basin='NA', cache=True)
+            self.assertEqual(len(list(Path(tmpdir).glob("*.nc"))), 2)
+            self.assertEqual(len(list(Path(tmpdir).glob("*.tmp"))), 0)
+
+            # unreadable cache files are replaced
+            for cache_path in Path(tmpdir).glob("*.nc"):
+                cache_path.write_bytes(b"corrupt")
+            with self.assertLogs('climada.hazard.tc_tracks', level='WARNING') as cm:
+                tc_reprocessed = tc.TCTracks.from_ibtracs_netcdf(
+                    provider='usa', year_range=(1993, 1994), basin='EP', cache=True)
+            self.assertIn('Failed to read cached IBTrACS data', cm.output[0])
+            tc_read_again = tc.TCTracks.from_ibtracs_netcdf(
+                provider='usa', year_range=(1993, 1994), basin='EP', cache=True)
+
+        for tc_other in [tc_read, tc_reprocessed, tc_read_again]:
+            self.assertEqual(tc_track.size, tc_other.size)
+            for tr, tr_other in zip(tc_track.data, tc_other.data):
+                xr.testing.assert_identical(tr, tr_other)
+
+    def test_ibtracs_pool(self):
+        """Check that processing the storms in parallel chunks gives the same tracks"""
+        tc_track = tc.TCTracks.from_ibtracs_netcdf(provider='usa', year_range=(1993, 1994))
+        pool = ThreadPool(nodes=3)
+        tc_track_pool = tc.TCTracks.from_ibtracs_netcdf(
+            provider='usa', year_range=(1993, 1994), pool=pool)
+        pool.close()
+        pool.join()
+        pool.clear()
+        self.assertEqual(tc_track.size, tc_track_pool.size)
+        for tr, tr_pool in zip(tc_track.data, tc_track_pool.data):
+            xr.testing.assert_identical(tr, tr_pool)
+
+    def test_ibtracs_fit_param_cache(self):
+        """Check that fit results are read from the cache"""
+        fit_kwargs = dict(explained='rmw', explanatory=['pres'], year_range=(2010, 2012))
+        fit_fresh = tc.ibtracs_fit_param(**fit_kwargs)
+        with tempfile.TemporaryDirectory() as tmpdir, \
+                unittest.mock.patch.object(tc, 'IBTRACS_CACHE_DIR', Path(tmpdir)):
+            fit_cached = tc.ibtracs_fit_param(**fit_kwargs, cache=True)
+            self.assertEqual(len(list(Path(tmpdir).glob("*.pickle"))), 1)
+            self.assertEqual(len(list(Path(tmpdir).glob("*.tmp"))), 0)
+            with self.assertLogs('climada.hazard.tc_tracks', level='INFO') as cm:
+                fit_read = tc.ibtracs_fit_param(**fit_kwargs, cache=True)
+            self.assertIn('Reading fit result from cache', cm.output[0])
+            # other parameters are cached separately
+            tc.ibtracs_fit_param(**fit_kwargs, order=2, cache=True)
+            self.assertEqual(len(list(Path(tmpdir).glob("*.pickle"))), 2)
+
+            # unreadable cache files are replaced
+            for cache_path in Path(tmpdir).glob("*.pickle"):
+                cache_path.write_bytes(b"corrupt")
+            with self.assertLogs('climada.hazard.tc_tracks', level='WARNING') as cm:
+                fit_refitted = tc.ibtracs_fit_param(**fit_kwargs, cache=True)
+            self.assertIn('Failed to read cached fit result', cm.output[0])
+            fit_read_again = tc.ibtracs_fit_param(**fit_kwargs, cache=True)
+
+        for fit in [fit_cached, fit_read, fit_refitted, fit_read_again]:
+            pd.testing.assert_series_equal(fit.params, fit_fresh.params)
+            self.assertAlmostEqual(fit.rsquared, fit_fresh.rsquared)
+
 class TestIO(unittest.TestCase):
     """Test reading of tracks from files of different formats"""
     def test_netcdf_io(self):
@@ -329,6 +406,76 @@ class TestIO(unittest.TestCase):
                 np.testing.assert_array_equal(tr[v].values, tr_read[v].values)
             self.assertEqual(tr.sid, tr_read.sid)
 
+    def test_ragged_netcdf_io(self):
+        """Test writing and reading tracks to/from a single NetCDF file"""
+        tc_track = tc.TCTracks.from_processed_ibtracs_csv([TEST_TRACK, TEST_TRACK_SHORT])
+        tc_track.data[1]['on_land'] = ('time', np.ones(tc_track.data[1].time.size, dtype=bool))
+        tc_track.data[1].attrs['name'] = None
+        ragged = tc_track.to_ragged()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, "tracks.nc")
+            ragged.write_netcdf(path)
+            ragged_read = tc.TCTracksRagged.from_netcdf(path)
+
+        np.testing.assert_array_equal(ragged.offsets, ragged_read.offsets)
+        self.assertEqual(list(ragged.variables.keys()), list(ragged_read.variables.keys()))
+        np.testing.assert_array_equal(ragged_read.var_present['on_land'], [False, True])
+        self.assertIsNone(ragged_read.attrs['name'][1])
+        tc_track.data[1].attrs.pop('name')
+        for tr, tr_read in zip(tc_track.data, ragged_read.to_list()):
+            xr.testing.assert_identical(tr, tr_read)
+
+    def test_ragged_netcdf_select(self):
+        """Test reading a selection of tracks from a single NetCDF file"""
+        tc_track = tc.TCTracks.from_processed_ibtracs_csv(
+            [TEST_TRACK, TEST_TRACK_SHORT, TC_ANDREW_FL])
+        tc_track.data[1]['basin'][:] = "EP"
+        tc_track.data[1]['basin'][0] = "NA"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, "tracks.nc")
+            tc_track.write_ragged_netcdf(path)
+            tc_read = tc.TCTracks.from_ragged_netcdf(path)
+            tc_idx = tc.TCTracks.from_ragged_netcdf(path, index=[2, 1])
+            tc_slice = tc.TCTracks.from_ragged_netcdf(path, index=slice(1, None))
+            tc_basin = tc.TCTracks.from_ragged_netcdf(path, basin="EP")
+            tc_year = tc.TCTracks.from_ragged_netcdf(path, year_range=(1990, 2000))
+            tc_none = tc.TCTracks.from_ragged_netcdf(path, basin="EP", year_range=(1990, 2000))
+            tc_sparse = tc.TCTracks.from_ragged_netcdf(path, index=[0, 2])
+
+        self.assertEqual(tc_read.size, 3)
+        for tr, tr_read in zip(tc_track.data, tc_read.data):
+            xr.testing.assert_identical(tr, tr_read)
+        self.assertEqual(tc_idx.size, 2)
+        xr.testing.assert_identical(tc_idx.data[0], tc_track.data[1])
+        xr.testing.assert_identical(tc_idx.data[1], tc_track.data[2])
+        self.assertEqual(tc_slice.size, 2)
+        xr.testing.assert_identical(tc_slice.data[1], tc_track.data[2])
+        self.assertEqual(tc_basin.size, 1)
+        xr.testing.assert_identical(tc_basin.data[0], tc_track.data[1])
+        self.assertEqual(tc_year.size, 1)
+        xr.testing.assert_identical(tc_year.data[0], tc_track.data[2])
+        self.assertEqual(tc_none.size, 0)
+        self.assertEqual(tc_sparse.size, 2)
+        xr.testing.assert_identical(tc_sparse.data[0], tc_track.data[0])
+        xr.testing.assert_identical(tc_sparse.data[1], tc_track.data[2])
+
+    def test_ragged_read_runs(self):
+        """Test that only the records of the selected tracks are read from a ragged array"""
+        # tracks far apart from each other are read separately
+        run_starts, run_ends = tc._ragged_read_runs(np.array([0, 100, 500]), np.array([10, 20, 10]))
+        np.testing.assert_array_equal(run_starts, [0, 100, 500])
+        np.testing.assert_array_equal(run_ends, [10, 120, 510])
+
+        # adjacent tracks and small gaps are merged, empty tracks are ignored
+        run_starts, run_ends = tc._ragged_read_runs(
+            np.array([0, 10, 30, 35, 42, 1000]), np.array([10, 20, 5, 0, 10, 10]))
+        np.testing.assert_array_equal(run_starts, [0, 1000])
+        np.testing.assert_array_equal(run_ends, [52, 1010])
+
+        run_starts, run_ends = tc._ragged_read_runs(np.array([5]), np.array([0]))
+        self.assertEqual(run_starts.size, 0)
+        self.assertEqual(run_ends.size, 0)
+
     def test_from_processed_ibtracs_csv(self):
         tc_track = tc.TCTracks.from_processed_ibtracs_csv(TEST_TRACK)
 
@@ -508,9 +655,24 @@ class TestIO(unittest.TestCase):
         split.set_index('sid', inplace=True)
         self.assertIsInstance(split.loc['1980052S16155'].geometry, MultiLineString)
         self.assertIsInstance(split.loc['2018079S09162'].geometry, LineString)
-        self.assertEqual(len(split.loc['1980052S16155'].geometry), 8)
+        # one more line than crossings of the antimeridian
+        lon_wrap = anti_track.get_track('1980052S16155').lon.values % 360
+        n_crossings = np.count_nonzero(np.diff(lon_wrap > 180))
+        self.assertGreater(n_crossings, 0)
+        self.assertEqual(len(split.loc['1980052S16155'].geometry.geoms), n_crossings + 1)
+        for line in split.loc['1980052S16155'].geometry.geoms:
+            self.assertTrue(line.bounds[0] >= 0 or line.bounds[2] <= 0)
         self.assertFalse(split.loc['2018079S09162'].geometry.is_simple)
 
+        # crossings of the prime meridian are not split
+        prime_lon = np.array([175, -175, -100, -10, -1, 1, 10, 100, 175], dtype=float)
+        prime_track = anti_track.data[0].isel(time=range(prime_lon.size)).assign_coords(
+            lon=("time", prime_lon))
+        geom = tc.TCTracks([prime_track]).to_geodataframe().geometry[0]
+        self.assertEqual(len(geom.geoms), 2)
+        np.testing.assert_array_almost_equal(
+            np.array(geom.geoms[1].coords)[:, 0], np.r_[-180, prime_lon[1:]])
+
         nosplit = anti_track.to_geodataframe(split_lines_antimeridian=False)
         nosplit.set_index('sid', inplace=True)
         self.assertIsInstance(nosplit.loc['1980052S16155'].geometry, LineString)
@@ -546,6 +708,103 @@ class TestFuncs(unittest.TestCase):
         tc_track = tc.TCTracks.from_ibtracs_netcdf(storm_id=storms)
         self.assertEqual(tc_track.subset({'basin': 'SP'}).size, 2)
 
+    def test_summary(self):
+        """Test the cached per-track summary table."""
+        tc_track = tc.TCTracks.from_processed_ibtracs_csv(TEST_TRACK)
+        summary = tc_track.summary
+        self.assertEqual(summary.shape[0], 1)
+        self.assertEqual(summary['sid'][0], '1951239N12334')
+        self.assertEqual(summary['genesis_basin'][0], 'NA')
+        self.assertEqual(summary['basins'][0], {'NA'})
+        self.assertEqual(summary['year'][0], 1951)
+        self.assertEqual(summary['size'][0], tc_track.data[0].time.size)
+        np.testing.assert_array_almost_equal(
+            summary.loc[0, ['lon_min', 'lat_min', 'lon_max', 'lat_max']].values.astype(float),
+            u_coord.latlon_bounds(tc_track.data[0].lat.values, tc_track.data[0].lon.values))
+
+        # only the row of the appended track is computed, the other row is taken from the cache
+        cached_summary = tc_track._summary_cache[1]
+        tc_track_short = tc.TCTracks.from_processed_ibtracs_csv(TEST_TRACK_SHORT)
+        tc_track_short.data[0].attrs['sid'] = 'short'
+        tc_track.append(tc_track_short.data)
+        with unittest.mock.patch.object(tc, '_track_summary_row',
+                                        wraps=tc._track_summary_row) as summary_row:
+            summary = tc_track.summary
+            self.assertEqual(summary_row.call_count, 1)
+        self.assertEqual(summary.shape[0], 2)
+        self.assertEqual(list(summary['sid']), ['1951239N12334', 'short'])
+        pd.testing.assert_frame_equal(summary.iloc[:1, -8:],
+                                      cached_summary[tc.TRACK_SUMMARY_COLUMNS])
+        # the cache doesn't keep the tracks alive
+        self.assertFalse(any(isinstance(fp, xr.Dataset) for fp in tc_track._summary_cache[0]))
+
+        # in-place modifications of the track variables are detected
+        tc_track.data[0].lon.values[:] += 10
+        tc_track.data[0].basin.values[:] = 'EP'
+        summary = tc_track.summary
+        self.assertEqual(summary['genesis_basin'][0], 'EP')
+        np.testing.assert_array_almost_equal(
+            summary.loc[0, ['lon_min', 'lon_max']].values.astype(float),
+            u_coord.lon_bounds(tc_track.data[0].lon.values))
+        self.assertEqual(tc_track.subset({'basin': 'EP'}).data, [tc_track.data[0]])
+
+        # attributes are always up to date
+        tc_track.data[1].attrs['category'] = 5
+        self.assertEqual(tc_track.subset({'category': 5}).data, [tc_track.data[1]])
+        self.assertEqual(tc_track.subset({'basin': 'NA'}).size, 2)
+        self.assertEqual(tc_track.subset({'basin': 'SP'}).size, 0)
+
+        # bounds of the union of tracks are the same as the ones of all positions
+        lon_tracks = [
+            [[170, 175, 180, 185], [-175, -165, -160], [150, 155, 160]],
+            [[-20, -10, 0, 10], [100, 110, 120]],
+            [[100, 150, 200, 250, 290], [-20, -5, 10]],
+            [[0, 100], [200, 350]],
+            [[0, 100], [200, 210, 350]],
+            [[-180 + 1.5 * i for i in range(120)], [179.5]],
+            [[-179, 175, 178], [5]],
+        ]
+        for lons in lon_tracks:
+            tracks = tc.TCTracks([tc_track.data[1].isel(time=[0] * len(lon)).assign_coords(
+                lon=("time", np.array(lon, dtype=float))) for lon in lons])
+            lon_all = np.concatenate([track.lon.values for track in tracks.data])
+            lat_all = np.concatenate([track.lat.values for track in tracks.data])
+            for buffer in [0, 1]:
+                self.assertEqual(tracks.get_bounds(deg_buffer=buffer),
+                                 u_coord.latlon_bounds(lat_all, lon_all, buffer=buffer))
+
+    def test_ragged_roundtrip(self):
+        """Test conversion to and from the columnar (ragged) representation."""
+        tc_track = tc.TCTracks.from_processed_ibtracs_csv(TEST_TRACK)
+        tc_track_short = tc.TCTracks.from_processed_ibtracs_csv(TEST_TRACK_SHORT)
+        tc_track_short.data[0]['on_land'] = ('time', np.ones(tc_track_short.data[0].time.size,
+                                                              dtype=bool))
+        tc_track.append(tc_track_short.data)
+
+        ragged = tc_track.to_ragged()
+        self.assertEqual(ragged.size, 2)
+        np.testing.assert_array_equal(
+            ragged.sizes, [tr.time.size for tr in tc_track.data])
+        self.assertEqual(ragged.variables['lat'].size, ragged.offsets[-1])
+        np.testing.assert_array_equal(ragged.var_present['on_land'], [False, True])
+        np.testing.assert_array_almost_equal(ragged.get_bounds(), tc_track.get_bounds())
+
+        tc_track_rt = tc.TCTracks.from_ragged(ragged)
+        self.assertEqual(tc_track_rt.size, 2)
+        for track, track_rt in zip(tc_track.data, tc_track_rt.data):
+            xr.testing.assert_identical(track, track_rt)
+
+        ragged_sel = ragged.select([1])
+        self.assertEqual(ragged_sel.size, 1)
+        self.assertEqual(ragged_sel.attrs['sid'][0], '1951239N12334')
+        xr.testing.assert_identical(ragged_sel.get_track(0), tc_track.data[1])
+        self.assertEqual(ragged.subset({'sid': '1951239N12334'}).size, 1)
+
+        ragged_cat = tc.TCTracksRagged.concat([ragged, ragged_sel])
+        self.assertEqual(ragged_cat.size, 3)
+        np.testing.assert_array_equal(ragged_cat.var_present['on_land'], [False, True, True])
+        xr.testing.assert_identical(ragged_cat.get_track(2), tc_track.data[1])
+
     def test_get_extent(self):
         """Test extent/bounds attributes."""
         storms = ['1988169N14259', '2002073S16161', '2002143S07157']
@@ -621,6 +880,26 @@ class TestFuncs(unittest.TestCase):
             with self.assertRaises(ValueError, msg=msg) as _cm:
                 tc_track.equal_timestep(time_step_h=time_step_h)
 
+    def test_interp_ragged_pass(self):
+        """Compare batched interpolation with the interpolation of single tracks."""
+        tc_track = tc.TCTracks.from_processed_ibtracs_csv(TEST_TRACK)
+        tc_track_short = tc.TCTracks.from_processed_ibtracs_csv(TEST_TRACK_SHORT)
+        tc_track_short.data[0].time.values[:] += np.timedelta64(22, "m")
+        tc_track.append(tc_track_short.data)
+
+        for time_step_h in [1, 2.509374054925788]:
+            ragged = tc_track.to_ragged()
+            ragged.equal_timestep(time_step_h=time_step_h)
+            for i, track in enumerate(tc_track.data):
+                track_ref = tc.TCTracks._one_interp_data(track, time_step_h)
+                track_int = ragged.get_track(i)
+                np.testing.assert_array_equal(track_int.time, track_ref.time)
+                np.testing.assert_array_equal(track_int.basin, track_ref.basin)
+                np.testing.assert_array_equal(track_int.time_step, time_step_h)
+                self.assertEqual(track_int.category, track_ref.category)
+                for var in ["lat", "lon", "central_pressure", "max_sustained_wind"]:
+                    np.testing.assert_allclose(track_int[var].values, track_ref[var].values)
+
     def test_interp_track_lonnorm_pass(self):
         """Interpolate track with non-normalized longitude to min_time_step."""
         tc_track = tc.TCTracks.from_processed_ibtracs_csv(TEST_TRACK)
@@ -862,6 +1141,19 @@ class TestFuncs(unittest.TestCase):
         self.assertAlmostEqual(rad_max_wind[192], 58, places=0)
         self.assertAlmostEqual(rad_max_wind[200], 71, places=0)
 
+    def test_ragged_fill_nearest(self):
+        """Test filling of missing values in ragged arrays, track by track."""
+        nan = np.nan
+        values = np.array([nan, 1, nan, nan, 5, nan, nan, nan, nan, 7, nan, nan])
+        offsets = np.array([0, 5, 8, 12])
+        np.testing.assert_array_equal(
+            tc._ragged_fill_nearest(values, offsets, limit=1),
+            [1, 1, 1, 5, 5, nan, nan, nan, 7, 7, 7, nan])
+        np.testing.assert_array_equal(
+            tc._ragged_fill_nearest(values, offsets, limit=2),
+            [1, 1, 1, 1, 5, nan, nan, nan, 7, 7, 7, 7])
+        self.assertTrue(np.isnan(values[0]))
+
     def test_tracks_in_exp_pass(self):
         """Check if tracks in exp are filtered correctly"""
 
@@ -580,6 +580,36 @@ class TestSynth(unittest.TestCase):
                 np.testing.assert_array_equal(orig_track[varname].values,
                                               syn_track[varname].values)
 
+    def test_random_walk_batch_pass(self):
+        """Test batched random walk against the random walk of single tracks."""
+        tc_track = tc.TCTracks.from_processed_ibtracs_csv([TEST_TRACK, TEST_TRACK_SHORT])
+        tc_track.equal_timestep()
+        nb_synth_tracks = 3
+        np.random.seed(42)
+        random_vec = [np.random.uniform(size=nb_synth_tracks * (2 + 2 * (track.time.size - 1)))
+                      for track in tc_track.data]
+        ens_batch, cutoff_tc, cutoff_ts = tc_synth._rnd_walk_batch(
+            tc_track.data, nb_synth_tracks, 2, 0.3, np.pi / 360, 1, random_vec)
+
+        ens_single, cutoff_tc_single, cutoff_ts_single = [], [], []
+        for track, rnd_vec in zip(tc_track.data, random_vec):
+            ens, cut_tc, cut_ts = tc_synth._one_rnd_walk(
+                track, nb_synth_tracks, 2, 0.3, np.pi / 360, rnd_vec)
+            ens_single.extend(ens)
+            cutoff_tc_single.extend(cut_tc)
+            cutoff_ts_single.extend(cut_ts)
+
+        self.assertEqual(cutoff_tc, cutoff_tc_single)
+        self.assertEqual(cutoff_ts, cutoff_ts_single)
+        self.assertEqual(len(ens_batch), (nb_synth_tracks + 1) * tc_track.size)
+        for track_batch, track_single in zip(ens_batch, ens_single):
+            self.assertEqual(track_batch.attrs, track_single.attrs)
+            np.testing.assert_array_equal(track_batch.time.values, track_single.time.values)
+            np.testing.assert_allclose(track_batch.lon.values, track_single.lon.values)
+            np.testing.assert_allclose(track_batch.lat.values, track_single.lat.values)
+            np.testing.assert_array_equal(track_batch.max_sustained_wind.values,
+                                          track_single.max_sustained_wind.values)
+
     def test_random_walk_single_point(self):
         found = False
         for year in range(1951, 1981):
@@ -25,11 +25,13 @@ from pathlib import Path
 from tempfile import TemporaryDirectory
 import numpy as np
 from scipy import sparse
+from pathos.pools import ThreadPool
+from PIL import Image
 
 from climada.util import ureg
 from climada.hazard.tc_tracks import TCTracks
 from climada.hazard.trop_cyclone import (
-    TropCyclone, _close_centroids, _vtrans, _B_holland_1980, _bs_holland_2008,
+    TropCyclone, CoastalCentroids, _close_centroids, _vtrans, _B_holland_1980, _bs_holland_2008,
     _v_max_s_holland_2008, _x_holland_2010, _stat_holland_1980, _stat_holland_2010,
     _stat_er_2011,
 )
@@ -184,6 +186,144 @@ class TestReader(unittest.TestCase):
         self.assertEqual(tc_haz.fraction.nonzero()[0].size, 0)
         self.assertEqual(tc_haz.intensity.nonzero()[0].size, 0)
 
+    def test_thread_pool_pass(self):
+        """Test from_tracks with a thread pool against sequential computation."""
+        tc_track = TCTracks.from_processed_ibtracs_csv([TEST_TRACK, TEST_TRACK_SHORT, TEST_TRACK])
+        tc_haz = TropCyclone.from_tracks(tc_track, centroids=CENTR_TEST_BRB,
+                                         store_windfields=True)
+        pool = ThreadPool(nodes=2)
+        tc_haz_pool = TropCyclone.from_tracks(tc_track, centroids=CENTR_TEST_BRB, pool=pool,
+                                              store_windfields=True)
+        pool.close()
+        pool.join()
+        pool.clear()
+        tc_haz_pool.check()
+
+        self.assertEqual(tc_haz_pool.size, 3)
+        np.testing.assert_array_equal(tc_haz_pool.event_id, [1, 2, 3])
+        self.assertEqual(tc_haz_pool.event_name, tc_haz.event_name)
+        self.assertEqual(tc_haz_pool.tag.file_name, tc_haz.tag.file_name)
+        self.assertEqual(len(tc_haz_pool.windfields), 3)
+        np.testing.assert_array_equal(tc_haz_pool.frequency, tc_haz.frequency)
+        np.testing.assert_array_equal(tc_haz_pool.intensity.toarray(), tc_haz.intensity.toarray())
+        np.testing.assert_array_equal(tc_haz_pool.windfields[2].toarray(),
+                                      tc_haz.windfields[2].toarray())
+        self.assertIsNot(tc_haz_pool.centroids, CENTR_TEST_BRB)
+        self.assertTrue(tc_haz_pool.centroids.equal(CENTR_TEST_BRB))
+
+    def test_video_intensity_pool(self):
+        """Test video_intensity with a thread pool against the sequential computation."""
+        tc_track = TCTracks.from_processed_ibtracs_csv(TEST_TRACK)
+        track_name = tc_track.data[0].name
+        with TemporaryDirectory() as tmpdir:
+            file_name = str(Path(tmpdir, "seq.gif"))
+            tc_list, tr_coord = TropCyclone.video_intensity(
+                track_name, tc_track, CENTR_TEST_BRB, file_name=file_name)
+            with Image.open(file_name) as image:
+                seq_frames, seq_image_size = image.n_frames, image.size
+
+            file_name = str(Path(tmpdir, "pool.gif"))
+            pool = ThreadPool(nodes=2)
+            tc_list_pool, tr_coord_pool = TropCyclone.video_intensity(
+                track_name, tc_track, CENTR_TEST_BRB, file_name=file_name, pool=pool)
+            pool.close()
+            pool.join()
+            pool.clear()
+            with Image.open(file_name) as image:
+                self.assertEqual(image.n_frames, seq_frames)
+                self.assertEqual(image.size, seq_image_size)
+
+        self.assertGreater(len(tc_list), 1)
+        self.assertEqual(len(tc_list_pool), len(tc_list))
+        self.assertEqual(seq_frames, len(tc_list))
+        for tc_haz, tc_haz_pool in zip(tc_list, tc_list_pool):
+            self.assertEqual(tc_haz_pool.event_name, tc_haz.event_name)
+            np.testing.assert_array_equal(tc_haz_pool.intensity.toarray(),
+                                          tc_haz.intensity.toarray())
+        for coord in ['lat', 'lon']:
+            for coord_seq, coord_pool in zip(tr_coord[coord], tr_coord_pool[coord]):
+                np.testing.assert_array_equal(coord_pool, coord_seq)
+
+    def test_append_tracks_pass(self):
+        """Test append_tracks against from_tracks on all tracks."""
+        tc_track = TCTracks.from_processed_ibtracs_csv([TEST_TRACK, TEST_TRACK_SHORT])
+        later_track = tc_track.data[0].copy(deep=True)
+        later_track['time'] = later_track.time + np.timedelta64(5 * 365, 'D')
+        later_track.attrs['sid'] = 'later_track'
+        tc_track.data.append(later_track)
+
+        tc_haz = TropCyclone.from_tracks(tc_track, centroids=CENTR_TEST_BRB)
+        tc_haz_inc = TropCyclone.from_tracks(TCTracks(tc_track.data[:1]),
+                                             centroids=CENTR_TEST_BRB)
+        tc_haz_inc.append_tracks(TCTracks(tc_track.data[1:]))
+        tc_haz_inc.check()
+
+        self.assertEqual(tc_haz_inc.size, 3)
+        np.testing.assert_array_equal(tc_haz_inc.event_id, [1, 2, 3])
+        self.assertEqual(tc_haz_inc.event_name, tc_haz.event_name)
+        self.assertEqual(tc_haz_inc.basin, tc_haz.basin)
+        np.testing.assert_array_equal(tc_haz_inc.date, tc_haz.date)
+        np.testing.assert_array_equal(tc_haz_inc.category, tc_haz.category)
+        np.testing.assert_array_equal(tc_haz_inc.orig, tc_haz.orig)
+        np.testing.assert_allclose(tc_haz_inc.frequency, tc_haz.frequency)
+        np.testing.assert_allclose(tc_haz_inc.frequency, 1 / 6)
+        self.assertEqual(tc_haz_inc.intensity.shape, (3, 296))
+        np.testing.assert_allclose(tc_haz_inc.intensity.toarray(), tc_haz.intensity.toarray())
+        self.assertEqual(tc_haz_inc.fraction.shape, (3, 296))
+
+        # the year range can be given explicitly and is required for non-uniform frequencies
+        tc_haz_inc = TropCyclone.from_tracks(TCTracks(tc_track.data[:2]),
+                                             centroids=CENTR_TEST_BRB)
+        tc_haz_inc.frequency[0] *= 2
+        with self.assertRaises(ValueError):
+            tc_haz_inc.append_tracks(TCTracks(tc_track.data[2:]))
+        self.assertEqual(tc_haz_inc.size, 2)
+        tc_haz_inc.append_tracks(TCTracks(tc_track.data[2:]), year_range=(1951, 1951))
+        np.testing.assert_allclose(tc_haz_inc.frequency, 1 / 6)
+
+    def test_coastal_centroids_pass(self):
+        """Test selection of coastal centroids with CoastalCentroids"""
+        centroids = Centroids.from_lat_lon(
+            np.array([10, 10, 10, 10, 70, 10, 20]),
+            np.array([178, -179, 180, 0, 179, 190, -175]))
+        centroids.dist_coast = np.array([0, 5e5, 0, 0, 0, 2e6, 0])
+        coastal_centroids = CoastalCentroids(centroids)
+        np.testing.assert_array_equal(coastal_centroids.lon, [178, -179, 180, 0, 179, -170, -175])
+
+        # bounds crossing the antimeridian
+        np.testing.assert_array_equal(
+            coastal_centroids.select((175, 5, 185, 15)), [0, 1, 2])
+        np.testing.assert_array_equal(
+            coastal_centroids.select((-185, 5, -175, 25)), [0, 1, 2, 6])
+        np.testing.assert_array_equal(
+            coastal_centroids.select((175, 5, 195, 15), max_dist_inland_km=100), [0, 2])
+        np.testing.assert_array_equal(
+            coastal_centroids.select((175, 5, 195, 15), ignore_distance_to_coast=True),
+            [0, 1, 2, 5])
+        np.testing.assert_array_equal(
+            coastal_centroids.select((-180, -90, 180, 90), max_latitude=90), [0, 1, 2, 3, 4, 6])
+        self.assertEqual(len(coastal_centroids._selections), 4)
+
+        # wind fields on prepared centroids are the same
+        tc_track = TCTracks.from_processed_ibtracs_csv([TEST_TRACK, TEST_TRACK_SHORT])
+        tc_haz = TropCyclone.from_tracks(tc_track, centroids=CENTR_TEST_BRB)
+        coastal_centroids = CoastalCentroids(CENTR_TEST_BRB)
+        for track in tc_track.data:
+            tc_haz_prep = TropCyclone.from_tracks(TCTracks([track]), centroids=coastal_centroids)
+            self.assertIsNot(tc_haz_prep.centroids, CENTR_TEST_BRB)
+            self.assertTrue(tc_haz_prep.centroids.equal(CENTR_TEST_BRB))
+            idx = tc_haz.event_name.index(track.sid)
+            np.testing.assert_array_equal(tc_haz_prep.intensity.toarray()[0],
+                                          tc_haz.intensity.toarray()[idx])
+        self.assertEqual(len(coastal_centroids._selections), 1)
+
+        # the indexed distance to coast is not stored in the given centroids
+        centroids = Centroids.from_lat_lon(np.array([13.1, 20.0]), np.array([-59.6, -40.0]))
+        coastal_centroids = CoastalCentroids(centroids)
+        np.testing.assert_array_equal(coastal_centroids.coastal_idx()[0], [0])
+        self.assertEqual(coastal_centroids.dist_coast.size, 2)
+        self.assertEqual(centroids.dist_coast.size, 0)
+
 class TestWindfieldHelpers(unittest.TestCase):
     """Test helper functions of TC wind field model"""
 
@@ -428,6 +568,42 @@ class TestClimateSce(unittest.TestCase):
         res_frequency[3] = 0.5 * (1 + (1.025 - 1) * scale)
         self.assertTrue(np.allclose(tc_cc.frequency, res_frequency))
 
+    def test_apply_scenarios_batch(self):
+        """Test apply_climate_scenarios_knu against apply_climate_scenario_knu."""
+        intensity = np.zeros((4, 10))
+        intensity[0, :] = np.arange(10)
+        intensity[1, 5] = 10
+        intensity[2, :] = np.arange(10, 20)
+        intensity[3, 3] = 3
+        tc = TropCyclone(
+            intensity=sparse.csr_matrix(intensity),
+            basin=['NA', 'NA', 'WP', 'NI'],
+            category=np.array([2, 0, 4, 1]),
+            event_id=np.arange(4),
+            frequency=np.ones(4) * 0.5,
+        )
+
+        tc_cc_dict = tc.apply_climate_scenarios_knu([2050, 2080], [26, 85])
+        self.assertEqual(list(tc_cc_dict.keys()), [(2050, 26), (2050, 85), (2080, 26), (2080, 85)])
+        for (ref_year, rcp_scenario), tc_cc in tc_cc_dict.items():
+            tc_cc_single = tc.apply_climate_scenario_knu(ref_year, rcp_scenario)
+            np.testing.assert_array_almost_equal(
+                tc_cc.intensity.toarray(), tc_cc_single.intensity.toarray())
+            np.testing.assert_array_almost_equal(tc_cc.frequency, tc_cc_single.frequency)
+            self.assertEqual(tc_cc.tag.description, tc_cc_single.tag.description)
+        self.assertFalse(np.allclose(tc_cc_dict[(2050, 26)].intensity.toarray(),
+                                     tc_cc_dict[(2080, 85)].intensity.toarray()))
+        np.testing.assert_array_equal(tc.intensity.toarray(), intensity)
+        np.testing.assert_array_equal(tc.frequency, np.ones(4) * 0.5)
+
+        # the returned hazards don't share any mutable attributes
+        tc_cc_a, tc_cc_b = tc_cc_dict[(2050, 26)], tc_cc_dict[(2080, 85)]
+        for attr_name in ['centroids', 'fraction', 'basin', 'category', 'date', 'event_name']:
+            self.assertIsNot(getattr(tc_cc_a, attr_name), getattr(tc_cc_b, attr_name))
+            self.assertIsNot(getattr(tc_cc_a, attr_name), getattr(tc, attr_name))
+        tc_cc_a.basin[0] = 'SP'
+        self.assertEqual(tc_cc_b.basin[0], 'NA')
+
     def test_negative_freq_error(self):
         """Test _apply_knutson_criterion with infeasible input."""
         criterion = [{'basin': 'SP', 'category': [0, 1],
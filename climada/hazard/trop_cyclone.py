@@ -19,10 +19,11 @@ with CLIMADA. If not, see <https://www.gnu.org/licenses/>.
 Define TC wind hazard (TropCyclone class).
 """
 
-__all__ = ['TropCyclone']
+__all__ = ['TropCyclone', 'CoastalCentroids']
 
 import copy
 import datetime as dt
+import functools
 import itertools
 import logging
 import time
@@ -31,13 +32,14 @@ from typing import Optional, Tuple, List, Union
 import numpy as np
 from scipy import sparse
 import matplotlib.animation as animation
+import matplotlib.pyplot as plt
 from tqdm import tqdm
 import pathos.pools
 import xarray as xr
 
 from climada.hazard.base import Hazard
 from climada.hazard.tag import Tag as TagHazard
-from climada.hazard.tc_tracks import TCTracks, estimate_rmw
+from climada.hazard.tc_tracks import TCTracks, TCTracksRagged, estimate_rmw
 from climada.hazard.tc_clim_change import get_knutson_criterion, calc_scale_knutson
 from climada.hazard.centroids.centr import Centroids
 from climada.util import ureg
@@ -167,9 +169,9 @@ class TropCyclone(Hazard):
     @classmethod
     def from_tracks(
         cls,
-        tracks: TCTracks,
-        centroids: Optional[Centroids] = None,
-        pool: Optional[pathos.pools.ProcessPool] = None,
+        tracks: Union[TCTracks, TCTracksRagged],
+        centroids: Optional[Union[Centroids, "CoastalCentroids"]] = None,
+        pool: Optional[Union[pathos.pools.ProcessPool, pathos.pools.ThreadPool]] = None,
         description: str = '',
         model: str = 'H08',
         ignore_distance_to_coast: bool = False,
@@ -199,12 +201,19 @@ class TropCyclone(Hazard):
 
         Parameters
         ----------
-        tracks : climada.hazard.TCTracks
-            Tracks of storm events.
-        centroids : Centroids, optional
-            Centroids where to model TC. Default: global centroids at 360 arc-seconds resolution.
+        tracks : climada.hazard.TCTracks or climada.hazard.TCTracksRagged
+            Tracks of storm events. In the columnar representation (`TCTracksRagged`), each
+            track is only converted to an xarray Dataset when its wind field is computed.
+        centroids : Centroids or CoastalCentroids, optional
+            Centroids where to model TC. For many successive calls on the same centroids, pass
+            a `CoastalCentroids` instance to reuse the selection of coastal centroids.
+            Default: global centroids at 360 arc-seconds resolution.
         pool : pathos.pool, optional
-            Pool that will be used for parallel computation of wind fields. Default: None
+            Pool that will be used for parallel computation of wind fields. Since the wind field
+            computations consist of vectorized numpy operations that release the GIL, a
+            `pathos.pools.ThreadPool` can be used as well. This avoids the overhead of starting
+            processes and of pickling the centroids and results, which pays off for small sets of
+            tracks such as the members of a forecast ensemble. Default: None
         description : str, optional
             Description of the event set. Default: "".
         model : str, optional
@@ -251,18 +260,11 @@ class TropCyclone(Hazard):
         if centroids is None:
             centroids = Centroids.from_base_grid(res_as=360, land=False)
 
-        if not centroids.coord.size:
-            centroids.set_meta_to_lat_lon()
-
-        if ignore_distance_to_coast:
-            # Select centroids with lat <= max_latitude
-            coastal_idx = (np.abs(centroids.lat) <= max_latitude).nonzero()[0]
+        if isinstance(centroids, CoastalCentroids):
+            coastal_centroids = centroids
+            centroids = coastal_centroids.centroids
         else:
-            # Select centroids which are inside max_dist_inland_km and lat <= max_latitude
-            if not centroids.dist_coast.size:
-                centroids.set_dist_coast()
-            coastal_idx = ((centroids.dist_coast <= max_dist_inland_km * 1000)
-                           & (np.abs(centroids.lat) <= max_latitude)).nonzero()[0]
+            coastal_centroids = CoastalCentroids(centroids)
 
         # Filter early with a larger threshold, but inaccurate (lat/lon) distances.
         # Later, there will be another filtering step with more accurate distances in km.
@@ -270,22 +272,24 @@ class TropCyclone(Hazard):
             u_const.ONE_LAT_KM * np.cos(np.radians(max_latitude))
         )
 
-        # Restrict to coastal centroids within reach of any of the tracks
-        t_lon_min, t_lat_min, t_lon_max, t_lat_max = tracks.get_bounds(deg_buffer=max_dist_eye_deg)
-        t_mid_lon = 0.5 * (t_lon_min + t_lon_max)
-        coastal_centroids = centroids.coord[coastal_idx]
-        u_coord.lon_normalize(coastal_centroids[:, 1], center=t_mid_lon)
-        coastal_idx = coastal_idx[((t_lon_min <= coastal_centroids[:, 1])
-                                   & (coastal_centroids[:, 1] <= t_lon_max)
-                                   & (t_lat_min <= coastal_centroids[:, 0])
-                                   & (coastal_centroids[:, 0] <= t_lat_max))]
+        # Restrict to centroids which are inside max_dist_inland_km, lat <= max_latitude and
+        # within reach of any of the tracks
+        coastal_idx = coastal_centroids.select(
+            tracks.get_bounds(deg_buffer=max_dist_eye_deg),
+            max_latitude=max_latitude,
+            max_dist_inland_km=max_dist_inland_km,
+            ignore_distance_to_coast=ignore_distance_to_coast)
 
         LOGGER.info('Mapping %s tracks to %s coastal centroids.', str(tracks.size),
                     str(coastal_idx.size))
+        if isinstance(tracks, TCTracksRagged):
+            tracks_data = tracks.iter_tracks()
+        else:
+            tracks_data = tracks.data
         if pool:
-            chunksize = min(num_tracks // pool.ncpus, 1000)
+            chunksize = max(min(num_tracks // pool.nodes, 1000), 1)
             tc_haz_list = pool.map(
-                cls.from_single_track, tracks.data,
+                cls.from_single_track, tracks_data,
                 itertools.repeat(centroids, num_tracks),
                 itertools.repeat(coastal_idx, num_tracks),
                 itertools.repeat(model, num_tracks),
@@ -297,8 +301,8 @@ class TropCyclone(Hazard):
         else:
             last_perc = 0
             tc_haz_list = []
-            for track in tracks.data:
-                perc = 100 * len(tc_haz_list) / len(tracks.data)
+            for track in tracks_data:
+                perc = 100 * len(tc_haz_list) / num_tracks
                 if perc - last_perc >= 10:
                     LOGGER.info("Progress: %d%%", perc)
                     last_perc = perc
@@ -311,14 +315,121 @@ class TropCyclone(Hazard):
                 LOGGER.info("Progress: 100%")
 
         LOGGER.debug('Concatenate events.')
-        haz = cls.concat(tc_haz_list)
+        haz = cls._concat_same_centroids(tc_haz_list, centroids)
         haz.pool = pool
         haz.intensity_thres = intensity_thres
         LOGGER.debug('Compute frequency.')
-        haz.frequency_from_tracks(tracks.data)
+        haz.frequency_from_tracks(
+            tracks if isinstance(tracks, TCTracksRagged) else tracks.data)
         haz.tag.description = description
         return haz
 
+    def append_tracks(
+        self,
+        tracks: Union[TCTracks, TCTracksRagged],
+        pool: Optional[pathos.pools.ProcessPool] = None,
+        model: str = 'H08',
+        ignore_distance_to_coast: bool = False,
+        metric: str = "equirect",
+        max_latitude: float = 61,
+        max_dist_inland_km: float = 1000,
+        max_dist_eye_km: float = DEF_MAX_DIST_EYE_KM,
+        year_range: Optional[Tuple[int, int]] = None,
+    ):
+        """
+        Add the windfields of additional tracks to this hazard (in place).
+
+        Only the windfields of the new tracks are computed, on the centroids of this hazard and
+        with its intensity threshold. Since the centroids are shared, the new events are stacked
+        below the existing ones without any mapping of centroids. The event ids of the existing
+        events are kept, the new events are numbered consecutively after the largest event id.
+
+        Afterwards, the frequencies of all events are reset as `frequency_from_tracks` would do
+        for the combined set of tracks, so any modification of the frequencies of the existing
+        events (e.g. by `apply_climate_scenario_knu`) is discarded. The year range covered by the
+        existing events is taken from `year_range`. If it is not given, it is reconstructed from
+        the dates of the existing events and their frequency, which is only possible if the
+        frequencies are uniform as set by `from_tracks`.
+
+        Windfields are stored for the new tracks if, and only if, they are stored for the
+        existing events.
+
+        Parameters
+        ----------
+        tracks : climada.hazard.TCTracks or climada.hazard.TCTracksRagged
+            Additional tracks of storm events.
+        pool : pathos.pool, optional
+            Pool that will be used for parallel computation of wind fields. Default: None
+        model, ignore_distance_to_coast, metric, max_latitude, max_dist_inland_km,
+        max_dist_eye_km : optional
+            Parameters for the wind field computation, see `from_tracks`. Should be the same as
+            those used for the existing events.
+        year_range : tuple (int, int), optional
+            First and last year of the tracks of the existing events. Default: reconstructed from
+            the dates and the (uniform) frequencies of the existing events.
+
+        Raises
+        ------
+        ValueError
+            If `year_range` is not given and the frequencies of the existing events are not
+            uniform, or do not correspond to an integer number of years.
+        """
+        if tracks.size == 0:
+            return
+        if self.centroids.size == 0:
+            raise ValueError("The hazard has no centroids to compute the windfields on.")
+
+        old_size = self.size
+        if old_size > 0 and year_range is not None:
+            old_year_min, old_year_max = year_range
+        elif old_size > 0:
+            if not np.allclose(self.frequency, self.frequency[0]):
+                raise ValueError("The frequencies of the existing events are not uniform, the"
+                                 " year range of their tracks must be given as `year_range`.")
+            num_orig = np.count_nonzero(self.orig)
+            ens_size = (old_size / num_orig) if num_orig > 0 else 1
+            old_year_delta = 1 / (self.frequency[0] * ens_size)
+            if not np.isclose(old_year_delta, np.round(old_year_delta)):
+                raise ValueError("The frequencies of the existing events do not correspond to a"
+                                 " number of years, the year range of their tracks must be given"
+                                 " as `year_range`.")
+            old_year_min = dt.date.fromordinal(int(self.date.min())).year
+            old_year_max = old_year_min + int(np.round(old_year_delta)) - 1
+
+        new_haz = self.from_tracks(
+            tracks, centroids=self.centroids, pool=pool, model=model,
+            ignore_distance_to_coast=ignore_distance_to_coast,
+            store_windfields=len(self.windfields) > 0,
+            metric=metric, intensity_thres=self.intensity_thres, max_latitude=max_latitude,
+            max_dist_inland_km=max_dist_inland_km, max_dist_eye_km=max_dist_eye_km)
+        new_haz.event_id = self.event_id.max(initial=0) + np.arange(1, new_haz.size + 1)
+
+        LOGGER.debug('Append %d events to %d existing events.', new_haz.size, old_size)
+        self.tag.append(new_haz.tag)
+        self.units = new_haz.units
+        for attr_name, new_val in vars(new_haz).items():
+            old_val = getattr(self, attr_name, None)
+            if old_size == 0 and isinstance(new_val, (sparse.csr_matrix, np.ndarray, list)):
+                setattr(self, attr_name, new_val)
+            elif isinstance(new_val, sparse.csr_matrix):
+                setattr(self, attr_name, sparse.vstack([old_val, new_val], format='csr'))
+            elif isinstance(new_val, np.ndarray) and new_val.ndim == 1:
+                setattr(self, attr_name, np.concatenate([old_val, new_val]))
+            elif isinstance(new_val, list):
+                setattr(self, attr_name, old_val + new_val)
+
+        if isinstance(tracks, TCTracksRagged):
+            years = xr.DataArray(tracks.variables['time']).dt.year.values
+            year_min, year_max = years.min(), years.max()
+        else:
+            year_min = np.amin([t.time.dt.year.values.min() for t in tracks.data])
+            year_max = np.amax([t.time.dt.year.values.max() for t in tracks.data])
+        if old_size > 0:
+            year_min, year_max = min(year_min, old_year_min), max(year_max, old_year_max)
+        num_orig = np.count_nonzero(self.orig)
+        ens_size = (self.size / num_orig) if num_orig > 0 else 1
+        self.frequency = np.ones(self.size) / ((year_max - year_min + 1) * ens_size)
+
     def apply_climate_scenario_knu(
         self,
         ref_year: int = 2050,
@@ -364,6 +475,43 @@ class TropCyclone(Hazard):
         'from Knutson et al 2015.' % (str(ref_year), str(rcp_scenario))
         return haz_cc
 
+    def apply_climate_scenarios_knu(
+        self,
+        ref_years: List[int],
+        rcp_scenarios: List[int],
+    ):
+        """
+        From current TC hazard instance, return new hazard sets with future events for all
+        combinations of the given RCP scenarios and years.
+
+        This is equivalent to calling `apply_climate_scenario_knu` for each combination, but the
+        scaling factors are evaluated for all combinations at once. Each returned hazard set is
+        independent of the others and of self.
+
+        Parameters
+        ----------
+        ref_years : list of int
+            years between 2000 ad 2100.
+        rcp_scenarios : list of int
+            26 for RCP 2.6, 45 for RCP 4.5, 60 for RCP 6.0 and 85 for RCP 8.5.
+
+        Returns
+        -------
+        haz_cc_dict : dict
+            For each pair `(ref_year, rcp_scenario)`, a new instance of
+            climada.hazard.TropCyclone with frequencies and intensity scaled according
+            to the Knutson criterion for the given year and RCP. Self is not modified.
+        """
+        chg_int_freq = get_knutson_criterion()
+        keys = list(itertools.product(ref_years, rcp_scenarios))
+        scale_rcp_years = [calc_scale_knutson(ref_year, rcp_scenario)
+                           for ref_year, rcp_scenario in keys]
+        haz_cc_list = self._apply_knutson_criteria(chg_int_freq, scale_rcp_years)
+        for (ref_year, rcp_scenario), haz_cc in zip(keys, haz_cc_list):
+            haz_cc.tag.description = 'climate change scenario for year %s and RCP %s '\
+            'from Knutson et al 2015.' % (str(ref_year), str(rcp_scenario))
+        return dict(zip(keys, haz_cc_list))
+
     def set_climate_scenario_knu(self, *args, **kwargs):
         """This function is deprecated, use TropCyclone.apply_climate_scenario_knu instead."""
         LOGGER.warning("The use of TropCyclone.set_climate_scenario_knu is deprecated."
@@ -380,6 +528,7 @@ class TropCyclone(Hazard):
         writer: animation = animation.PillowWriter(bitrate=500),
         figsize: Tuple[float, float] = (9, 13),
         adapt_fontsize: bool = True,
+        pool: Optional[pathos.pools.ProcessPool] = None,
         **kwargs
     ):
         """
@@ -403,6 +552,11 @@ class TropCyclone(Hazard):
         adapt_fontsize : bool, optional
             If set to true, the size of the fonts will be adapted to the size of the figure.
             Otherwise the default matplotlib font size is used. Default is True.
+        pool : pathos.pool, optional
+            Pool that will be used to compute the wind fields of the track pieces and to render
+            the frames of the video in parallel. The track pieces are split into one chunk per
+            worker, so that the centroids are sent to each worker only once. The rendered frames
+            are encoded afterwards, see `climada.util.plot.save_frames_video`. Default: None
         kwargs : optional
             arguments for pcolormesh matplotlib function used in event plots
 
@@ -426,7 +580,7 @@ class TropCyclone(Hazard):
             & (centroids.total_bounds[1] - 1 < track.lat.values)
         ).reshape(-1)
 
-        tc_list = []
+        tr_sel_list = []
         tr_coord = {'lat': [], 'lon': []}
         for node in range(idx_plt.size - 2):
             tr_piece = track.sel(
@@ -437,8 +591,21 @@ class TropCyclone(Hazard):
             tr_sel.append(tr_piece)
             tr_coord['lat'].append(tr_sel.data[0].lat.values[:-1])
             tr_coord['lon'].append(tr_sel.data[0].lon.values[:-1])
+            tr_sel_list.append(tr_sel)
 
-            tc_tmp = cls.from_tracks(tr_sel, centroids=centroids)
+        # select the coastal centroids only once, not for every frame
+        coastal_centroids = CoastalCentroids(centroids)
+        coastal_centroids.coastal_idx()
+        if pool:
+            n_chunks = min(len(tr_sel_list), pool.nodes)
+            bounds = np.linspace(0, len(tr_sel_list), n_chunks + 1).astype(int)
+            tc_list = list(itertools.chain.from_iterable(pool.map(
+                cls._from_track_pieces,
+                [tr_sel_list[start:end] for start, end in zip(bounds[:-1], bounds[1:])],
+                itertools.repeat(coastal_centroids, n_chunks))))
+        else:
+            tc_list = cls._from_track_pieces(tr_sel_list, coastal_centroids)
+        for tc_tmp, tr_sel in zip(tc_list, tr_sel_list):
             tc_tmp.event_name = [
                 track.name + ' ' + time.strftime(
                     "%d %h %Y %H:%M",
@@ -446,7 +613,6 @@ class TropCyclone(Hazard):
                                 / 1000000000)
                 )
             ]
-            tc_list.append(tc_tmp)
 
         if 'cmap' not in kwargs:
             kwargs['cmap'] = 'Greys'
@@ -456,12 +622,18 @@ class TropCyclone(Hazard):
             kwargs['vmax'] = np.array([tc_.intensity.max() for tc_ in tc_list]).max()
 
         def run(node):
-            tc_list[node].plot_intensity(1, axis=axis, **kwargs)
-            axis.plot(tr_coord['lon'][node], tr_coord['lat'][node], 'k')
-            axis.set_title(tc_list[node].event_name[0])
+            _plot_video_intensity_frame(
+                axis, tc_list[node], tr_coord['lon'][node], tr_coord['lat'][node], kwargs)
             pbar.update()
 
-        if file_name:
+        if file_name and pool:
+            LOGGER.info('Generating video %s', file_name)
+            u_plot.save_frames_video(
+                functools.partial(_save_video_intensity_frame, figsize=figsize,
+                                  adapt_fontsize=adapt_fontsize, kwargs=kwargs),
+                list(zip(tc_list, tr_coord['lon'], tr_coord['lat'])),
+                file_name, writer, pool=pool)
+        elif file_name:
             LOGGER.info('Generating video %s', file_name)
             fig, axis, _fontsize = u_plot.make_map(figsize=figsize, adapt_fontsize=adapt_fontsize)
             pbar = tqdm(total=idx_plt.size - 2)
@@ -472,18 +644,29 @@ class TropCyclone(Hazard):
             pbar.close()
         return tc_list, tr_coord
 
-    def frequency_from_tracks(self, tracks: List):
+    @classmethod
+    def _from_track_pieces(cls, tr_sel_list, centroids):
+        """Wind fields of a chunk of track pieces of `video_intensity`, one hazard per piece"""
+        return [cls.from_tracks(tr_sel, centroids=centroids) for tr_sel in tr_sel_list]
+
+    def frequency_from_tracks(self, tracks: Union[List, TCTracksRagged]):
         """
         Set hazard frequency from tracks data.
 
         Parameters
         ----------
-        tracks : list of xarray.Dataset
+        tracks : list of xarray.Dataset or TCTracksRagged
         """
-        if not tracks:
+        if isinstance(tracks, TCTracksRagged):
+            if tracks.size == 0:
+                return
+            years = xr.DataArray(tracks.variables['time']).dt.year.values
+            year_max, year_min = years.max(), years.min()
+        elif not tracks:
             return
-        year_max = np.amax([t.time.dt.year.values.max() for t in tracks])
-        year_min = np.amin([t.time.dt.year.values.min() for t in tracks])
+        else:
+            year_max = np.amax([t.time.dt.year.values.max() for t in tracks])
+            year_min = np.amin([t.time.dt.year.values.min() for t in tracks])
         year_delta = year_max - year_min + 1
         num_orig = np.count_nonzero(self.orig)
         ens_size = (self.event_id.size / num_orig) if num_orig > 0 else 1
@@ -541,8 +724,9 @@ class TropCyclone(Hazard):
             mod_id = MODEL_VANG[model]
         except KeyError as err:
             raise ValueError(f'Model not implemented: {model}.') from err
-        ncentroids = centroids.coord.shape[0]
-        coastal_centr = centroids.coord[coastal_idx]
+        # only stack the coordinates of the coastal centroids, not of all centroids
+        ncentroids = centroids.lat.size
+        coastal_centr = np.stack([centroids.lat[coastal_idx], centroids.lon[coastal_idx]], axis=1)
         windfields, reachable_centr_idx = compute_windfields(
             track, coastal_centr, mod_id, metric=metric, max_dist_eye_km=max_dist_eye_km)
         reachable_coastal_centr_idx = coastal_idx[reachable_centr_idx]
@@ -590,6 +774,49 @@ class TropCyclone(Hazard):
                          else str(track.basin.values[0])]
         return new_haz
 
+    @classmethod
+    def _concat_same_centroids(cls, haz_list: List, centroids: Centroids):
+        """
+        Concatenate single track hazards that have been computed on the same centroids
+
+        This is equivalent to `Hazard.concat`, but since the columns of the intensity matrices
+        already refer to the same centroids, no union and mapping of centroids is required.
+
+        Parameters
+        ----------
+        haz_list : list of TropCyclone
+            Hazards as returned by `from_single_track`.
+        centroids : Centroids
+            Centroids on which all hazards in `haz_list` have been computed. The returned hazard
+            gets a (deep) copy of them.
+
+        Returns
+        -------
+        haz : TropCyclone
+        """
+        haz = cls()
+        haz.centroids = copy.deepcopy(centroids)
+        if len(haz_list) == 0:
+            return haz
+        for tc_haz in haz_list:
+            haz.tag.append(tc_haz.tag)
+        for attr_name, attr_val in vars(haz_list[0]).items():
+            if attr_name in ["tag", "centroids"]:
+                continue
+            if isinstance(attr_val, sparse.csr_matrix):
+                setattr(haz, attr_name, sparse.vstack(
+                    [getattr(tc_haz, attr_name) for tc_haz in haz_list], format='csr'))
+            elif isinstance(attr_val, np.ndarray) and attr_val.ndim == 1:
+                setattr(haz, attr_name, np.concatenate(
+                    [getattr(tc_haz, attr_name) for tc_haz in haz_list]))
+            elif isinstance(attr_val, list):
+                setattr(haz, attr_name, list(itertools.chain.from_iterable(
+                    getattr(tc_haz, attr_name) for tc_haz in haz_list)))
+            else:
+                setattr(haz, attr_name, copy.deepcopy(attr_val))
+        haz.sanitize_event_ids()
+        return haz
+
     def _apply_knutson_criterion(
         self,
         chg_int_freq: List,
@@ -611,54 +838,282 @@ class TropCyclone(Hazard):
             Tropical cyclone with frequency and intensity scaled inspired by
             the Knutson criterion. Returns a new instance of TropCyclone.
         """
+        return self._apply_knutson_criteria(chg_int_freq, [scaling_rcp_year])[0]
 
-        tc_cc = copy.deepcopy(self)
+    def _apply_knutson_criteria(
+        self,
+        chg_int_freq: List,
+        scaling_rcp_years: List[float],
+    ):
+        """
+        Apply changes to intensities and cumulative frequencies for several scale parameters.
 
-        # Criterion per basin
-        for basin in np.unique(tc_cc.basin):
+        The criteria are evaluated once per combination of basin and category. The resulting
+        factors are then applied to the rows of the intensity matrix without any sparse matrix
+        products.
 
-            bas_sel = (np.array(tc_cc.basin) == basin)
+        Each returned hazard is a separate (deep) copy of self, with its own `intensity` and
+        `frequency`. The original intensity and frequency of self are not copied in between.
 
-            # Apply intensity change
-            inten_chg = [chg
-                         for chg in chg_int_freq
-                         if (chg['variable'] == 'intensity' and
-                             chg['basin'] == basin)
-                         ]
-            for chg in inten_chg:
-                sel_cat_chg = np.isin(tc_cc.category, chg['category']) & bas_sel
-                inten_scaling = 1 + (chg['change'] - 1) * scaling_rcp_year
-                tc_cc.intensity = sparse.diags(
-                    np.where(sel_cat_chg, inten_scaling, 1)
-                    ).dot(tc_cc.intensity)
+        Parameters
+        ----------
+        chg_int_freq : list(dict))
+            list of criteria from climada.hazard.tc_clim_change
+        scaling_rcp_years : list of float
+            scale parameters because of chosen years and RCPs
+
+        Returns
+        -------
+        tc_cc_list : list of climada.hazard.TropCyclone
+            For each scale parameter, a tropical cyclone with frequency and intensity scaled
+            inspired by the Knutson criterion.
+        """
+        basins, event_basin = np.unique(np.array(self.basin, dtype=str), return_inverse=True)
+        categories, event_cat = np.unique(self.category, return_inverse=True)
+        event_bas_cat = event_basin * categories.size + event_cat
+        row_sizes = np.diff(self.intensity.indptr)
+
+        # don't copy the attributes that are replaced anyway
+        memo = {id(self.intensity): None, id(self.frequency): None}
+        tc_template = copy.deepcopy(self, memo)
+
+        tc_cc_list = []
+        for i_scale, scaling_rcp_year in enumerate(scaling_rcp_years):
+            inten_fact, freq_fact = _knutson_factors(
+                chg_int_freq, scaling_rcp_year, basins, categories)
+            inten_fact = inten_fact.ravel()[event_bas_cat]
+            freq_fact = freq_fact.ravel()[event_bas_cat]
 
             # Apply frequency change
-            freq_chg = [chg
-                        for chg in chg_int_freq
-                        if (chg['variable'] == 'frequency' and
-                            chg['basin'] == basin)
-                        ]
-            freq_chg.sort(reverse=False, key=lambda x: len(x['category']))
-
-            # Scale frequencies by category
-            cat_larger_list = []
-            for chg in freq_chg:
-                cat_chg_list = [cat
-                                for cat in chg['category']
-                                if cat not in cat_larger_list
-                                ]
-                sel_cat_chg = np.isin(tc_cc.category, cat_chg_list) & bas_sel
-                if sel_cat_chg.any():
-                    freq_scaling = 1 + (chg['change'] - 1) * scaling_rcp_year
-                    tc_cc.frequency[sel_cat_chg] *= freq_scaling
-                cat_larger_list += cat_chg_list
-
-        if (tc_cc.frequency < 0).any():
-            raise ValueError("The application of the given climate scenario"
-                             "resulted in at least one negative frequency.")
-
-        return tc_cc
+            frequency = self.frequency.copy()
+            freq_chg = (freq_fact != 1).nonzero()[0]
+            frequency[freq_chg] *= freq_fact[freq_chg]
+            if (frequency < 0).any():
+                raise ValueError("The application of the given climate scenario"
+                                 "resulted in at least one negative frequency.")
+
+            # Apply intensity change by scaling the stored values of each row
+            intensity = self.intensity.copy()
+            intensity.data *= np.repeat(inten_fact, row_sizes)
+
+            # the template is used for the last scale parameter, all others get their own copy
+            tc_cc = (tc_template if i_scale == len(scaling_rcp_years) - 1
+                     else copy.deepcopy(tc_template))
+            tc_cc.intensity = intensity
+            tc_cc.frequency = frequency
+            tc_cc_list.append(tc_cc)
+        return tc_cc_list
+
+
+class CoastalCentroids():
+    """Centroids prepared for repeated computations of TC wind fields
+
+    The selection of coastal centroids in `TropCyclone.from_tracks` requires the distance to coast
+    of all centroids, and a filter by latitude and by the bounds of the tracks. Instances of this
+    class compute the distance to coast only once and cache the coastal selection for each
+    combination of `max_latitude` and `max_dist_inland_km`. The cached selections are sorted by
+    (normalized) longitude so that the centroids within the bounds of a set of tracks are found
+    by binary search. Pass an instance as `centroids` to `TropCyclone.from_tracks` to reuse it
+    across many calls, e.g., per basin, per ensemble member or per climate scenario.
+
+    Attributes
+    ----------
+    centroids : Centroids
+        The centroids. The resulting hazards refer to this object.
+    lat : np.ndarray
+        Latitudinal coordinates of the centroids.
+    lon : np.ndarray
+        Longitudinal coordinates of the centroids, normalized to the range (-180, 180].
+    """
+
+    def __init__(self, centroids: Centroids):
+        """Prepare the given centroids
+
+        Parameters
+        ----------
+        centroids : Centroids
+            Centroids where to model TC. If the coordinates are not set, they are set in this
+            object (as a side effect). If the distance to coast is not set, it is computed with
+            the indexed method (see `Centroids.set_dist_coast`) for the selection of coastal
+            centroids only, and the centroids' `dist_coast` attribute is left unchanged.
+        """
+        if not centroids.coord.size:
+            centroids.set_meta_to_lat_lon()
+        self.centroids = centroids
+        self.lat = centroids.coord[:, 0]
+        self.lon = u_coord.lon_normalize(centroids.coord[:, 1].copy())
+        self._dist_coast = None
+        self._selections = dict()
+
+    @property
+    def dist_coast(self) -> np.ndarray:
+        """Distance to coast (in meters) of the centroids
+
+        Taken from the centroids if set. Otherwise, it is computed once with the indexed method
+        since the selection doesn't require the accuracy of the UTM-based distances.
+        """
+        if self.centroids.dist_coast.size:
+            return self.centroids.dist_coast
+        if self._dist_coast is None:
+            ne_x, ne_y = self.centroids._ne_crs_xy()  # pylint: disable=protected-access
+            LOGGER.debug('Computing distance to coast for %s centroids.', str(ne_x.size))
+            self._dist_coast = u_coord.dist_to_coast(ne_y, ne_x, method="index")
+        return self._dist_coast
+
+    def coastal_idx(
+        self,
+        max_latitude: float = 61,
+        max_dist_inland_km: float = 1000,
+        ignore_distance_to_coast: bool = False,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Indices of coastal centroids, sorted by longitude
+
+        The result is cached for each combination of parameters.
 
+        Parameters
+        ----------
+        max_latitude : float, optional
+            Only centroids with absolute latitude not larger than this are selected. Default: 61
+        max_dist_inland_km : float, optional
+            Only centroids with a distance (in km) to the coast not larger than this are selected.
+            Default: 1000
+        ignore_distance_to_coast : boolean, optional
+            If True, centroids far from coast are not ignored. Default: False.
+
+        Returns
+        -------
+        coastal_idx : np.ndarray of int
+            Indices of the selected centroids, sorted by longitude.
+        coastal_lon : np.ndarray
+            Normalized longitudes of the selected centroids (sorted).
+        """
+        key = (max_latitude, None if ignore_distance_to_coast else max_dist_inland_km)
+        if key not in self._selections:
+            coastal_msk = np.abs(self.lat) <= max_latitude
+            if not ignore_distance_to_coast:
+                coastal_msk &= self.dist_coast <= max_dist_inland_km * 1000
+            coastal_idx = coastal_msk.nonzero()[0]
+            coastal_idx = coastal_idx[np.argsort(self.lon[coastal_idx], kind="stable")]
+            self._selections[key] = (coastal_idx, self.lon[coastal_idx])
+        return self._selections[key]
+
+    def select(
+        self,
+        bounds: Tuple[float, float, float, float],
+        max_latitude: float = 61,
+        max_dist_inland_km: float = 1000,
+        ignore_distance_to_coast: bool = False,
+    ) -> np.ndarray:
+        """Indices of coastal centroids within the given bounds
+
+        Parameters
+        ----------
+        bounds : tuple (lon_min, lat_min, lon_max, lat_max)
+            Bounds as returned by `TCTracks.get_bounds`. The longitudinal range may cross the
+            antimeridian, i.e., the bounds are not required to be normalized.
+        max_latitude, max_dist_inland_km, ignore_distance_to_coast
+            See `coastal_idx`.
+
+        Returns
+        -------
+        np.ndarray of int
+            Sorted indices of the selected centroids.
+        """
+        lon_min, lat_min, lon_max, lat_max = bounds
+        coastal_idx, coastal_lon = self.coastal_idx(
+            max_latitude=max_latitude, max_dist_inland_km=max_dist_inland_km,
+            ignore_distance_to_coast=ignore_distance_to_coast)
+        if lon_max - lon_min >= 360:
+            sel_idx = coastal_idx
+        else:
+            lon_min_norm = u_coord.lon_normalize(np.array([lon_min], dtype=float))[0]
+            lon_max_norm = lon_min_norm + (lon_max - lon_min)
+            start = np.searchsorted(coastal_lon, lon_min_norm, side="left")
+            if lon_max_norm <= 180:
+                end = np.searchsorted(coastal_lon, lon_max_norm, side="right")
+                sel_idx = coastal_idx[start:end]
+            else:
+                # the range crosses the antimeridian
+                end = np.searchsorted(coastal_lon, lon_max_norm - 360, side="right")
+                sel_idx = np.concatenate([coastal_idx[start:], coastal_idx[:end]])
+        sel_lat = self.lat[sel_idx]
+        return np.sort(sel_idx[(lat_min <= sel_lat) & (sel_lat <= lat_max)])
+
+
+def _knutson_factors(
+    chg_int_freq: List,
+    scaling_rcp_year: float,
+    basins: np.ndarray,
+    categories: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Intensity and frequency factors for each combination of basin and category
+
+    Parameters
+    ----------
+    chg_int_freq : list(dict))
+        list of criteria from climada.hazard.tc_clim_change
+    scaling_rcp_year : float
+        scale parameter because of chosen year and RCP
+    basins : np.ndarray of str
+        Basins to compute factors for.
+    categories : np.ndarray of int
+        Categories to compute factors for.
+
+    Returns
+    -------
+    inten_fact, freq_fact : np.ndarray of shape (nbasins, ncategories)
+        Factors to apply to the intensities and frequencies of events by basin and category.
+    """
+    inten_fact = np.ones((basins.size, categories.size))
+    freq_fact = np.ones((basins.size, categories.size))
+    for i_basin, basin in enumerate(basins):
+        # intensity changes are applied one after the other
+        for chg in chg_int_freq:
+            if chg['variable'] == 'intensity' and chg['basin'] == basin:
+                sel_cat_chg = np.isin(categories, chg['category'])
+                inten_fact[i_basin, sel_cat_chg] *= 1 + (chg['change'] - 1) * scaling_rcp_year
+
+        # for frequencies, only the most specific change applies to each category
+        freq_chg = [chg
+                    for chg in chg_int_freq
+                    if (chg['variable'] == 'frequency' and
+                        chg['basin'] == basin)
+                    ]
+        freq_chg.sort(reverse=False, key=lambda x: len(x['category']))
+        cat_larger_list = []
+        for chg in freq_chg:
+            cat_chg_list = [cat
+                            for cat in chg['category']
+                            if cat not in cat_larger_list
+                            ]
+            sel_cat_chg = np.isin(categories, cat_chg_list)
+            freq_fact[i_basin, sel_cat_chg] *= 1 + (chg['change'] - 1) * scaling_rcp_year
+            cat_larger_list += cat_chg_list
+    return inten_fact, freq_fact
+
+def _plot_video_intensity_frame(axis, tc_haz, lon, lat, kwargs):
+    """Plot one frame of `TropCyclone.video_intensity`: wind field and piece of track"""
+    tc_haz.plot_intensity(1, axis=axis, **kwargs)
+    axis.plot(lon, lat, 'k')
+    axis.set_title(tc_haz.event_name[0])
+
+def _save_video_intensity_frame(frame, path, figsize, adapt_fontsize, kwargs):
+    """Plot one frame of `TropCyclone.video_intensity` in a new figure and save it to a file
+
+    Parameters
+    ----------
+    frame : tuple (TropCyclone, np.ndarray, np.ndarray)
+        Wind field, and longitudinal and latitudinal coordinates of the piece of track.
+    path : str
+        File to save the frame to.
+    figsize, adapt_fontsize, kwargs :
+        See `TropCyclone.video_intensity`.
+    """
+    fig, axis, _fontsize = u_plot.make_map(figsize=figsize, adapt_fontsize=adapt_fontsize)
+    _plot_video_intensity_frame(axis, *frame, kwargs)
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
 
 def compute_windfields(
     track: xr.Dataset,
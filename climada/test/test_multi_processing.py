@@ -43,8 +43,7 @@ class TestCoordinates(unittest.TestCase):
             df_val['latitude'] = np.ones(10) * 40.0
             df_val['longitude'] = np.ones(10) * 0.50
 
-            # set_df_geometry_points with a scheduler other than None uses dask.dataframe
-            # methods to execute calculations in parallel
+            # the scheduler is ignored, the points are constructed in a single vectorized call
             u_coord.set_df_geometry_points(df_val, scheduler=scheduler, crs='epsg:2202')
             np.testing.assert_allclose(df_val.geometry.x.values, np.ones(10) * 0.5)
             np.testing.assert_allclose(df_val.geometry.y.values, np.ones(10) * 40.)
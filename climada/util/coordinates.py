@@ -21,21 +21,24 @@ Define functions to handle with coordinates
 
 import ast
 import copy
+import functools
+import hashlib
 import logging
 import math
-from multiprocessing import cpu_count
+import os
 from pathlib import Path
+import pickle
 import re
 import warnings
 import zipfile
 
 from cartopy.io import shapereader
-import dask.dataframe as dd
 import geopandas as gpd
 import numba
 import numpy as np
 import pandas as pd
 import pycountry
+import pyproj
 import rasterio
 import rasterio.crs
 import rasterio.features
@@ -43,7 +46,7 @@ import rasterio.mask
 import rasterio.warp
 import scipy.spatial
 import scipy.interpolate
-from shapely.geometry import Polygon, MultiPolygon, Point, box
+from shapely.geometry import MultiPolygon, box
 import shapely.ops
 import shapely.vectorized
 from sklearn.neighbors import BallTree
@@ -81,6 +84,25 @@ NEAREST_NEIGHBOR_THRESHOLD = 100
 """Distance threshold in km for coordinate assignment. Nearest neighbors with greater distances
 are not considered."""
 
+COUNTRY_MASK_RES = 0.1
+"""Default resolution (in degrees) of the rasterized country geometries (`CountryMask`) used
+by `get_country_code`."""
+
+LAND_MASK_RES = 0.1
+"""Default resolution (in degrees) of the rasterized global land geometry (`LandMask`) used by
+`coord_on_land`."""
+
+POINTS_TO_RASTER_GRID_TOL = 1.0e-3
+"""Tolerance (relative to the raster resolution) up to which points are considered to be centered
+in raster cells by `points_to_raster`."""
+
+RASTER_SAMPLE_TILE_SIZE = 1024
+"""Size (in raster cells) of the square tiles in which `read_raster_sample` and
+`read_raster_sample_with_gradients` read the raster data around the sample points."""
+
+NATEARTH_CACHE_DIR = SYSTEM_DIR.joinpath('natural_earth')
+"""Directory of the on-disk cache of parsed Natural Earth layers (see `natural_earth_layer`)"""
+
 def latlon_to_geosph_vector(lat, lon, rad=False, basis=False):
     """Convert lat/lon coodinates to radial vectors (on geosphere)
 
@@ -464,19 +486,16 @@ def get_coastlines(bounds=None, resolution=110):
         Polygons of coast intersecting given bounds.
     """
     resolution = nat_earth_resolution(resolution)
-    shp_file = shapereader.natural_earth(resolution=resolution,
-                                         category='physical',
-                                         name='coastline')
-    coast_df = gpd.read_file(shp_file)
-    coast_df.crs = NE_CRS
+    coast_df = natural_earth_layer(resolution, 'physical', 'coastline')
     if bounds is None:
         return coast_df[['geometry']]
-    tot_coast = np.zeros(1)
-    while not np.any(tot_coast):
-        tot_coast = coast_df.envelope.intersects(box(*bounds))
+    tot_coast = np.zeros(0, dtype=int)
+    while tot_coast.size == 0:
+        # the spatial index compares envelopes, just like `coast_df.envelope.intersects`
+        tot_coast = np.sort(coast_df.sindex.query(box(*bounds)))
         bounds = (bounds[0] - 20, bounds[1] - 20,
                   bounds[2] + 20, bounds[3] + 20)
-    return coast_df[tot_coast][['geometry']]
+    return coast_df.iloc[tot_coast][['geometry']]
 
 def convert_wgs_to_utm(lon, lat):
     """Get EPSG code of UTM projection for input point in EPSG 4326
@@ -523,7 +542,7 @@ def utm_zones(wgs_bounds):
             zones.append((epsg + 100, bounds))
     return zones
 
-def dist_to_coast(coord_lat, lon=None, signed=False):
+def dist_to_coast(coord_lat, lon=None, signed=False, method="utm"):
     """Compute (signed) distance to coast from input points in meters.
 
     Parameters
@@ -542,12 +561,22 @@ def dist_to_coast(coord_lat, lon=None, signed=False):
     signed : bool
         If True, distance is signed with positive values off shore and negative values on land.
         Default: False
+    method : str, optional
+        One of the following:
+            * "utm": Planar distance in the UTM zone of each point to the Natural Earth
+              coastlines (10m) within 20 degrees of the points.
+            * "index": Great-circle distance to the Natural Earth coastlines (10m), computed with
+              the cached index returned by `get_coast_distance`. Much faster for large numbers
+              of points, see `CoastDistance` for the accuracy.
+        Default: "utm"
 
     Returns
     -------
     dist : np.array
         (Signed) distance to coast in meters.
     """
+    if method not in ["utm", "index"]:
+        raise ValueError(f"Unknown method for distance to coast: {method}")
     if isinstance(coord_lat, (gpd.GeoDataFrame, gpd.GeoSeries)):
         if not equal_crs(coord_lat.crs, NE_CRS):
             raise ValueError('Input CRS is not %s' % str(NE_CRS))
@@ -565,6 +594,12 @@ def dist_to_coast(coord_lat, lon=None, signed=False):
                                  % (lat.size, lon.size))
         geom = gpd.GeoDataFrame(geometry=gpd.points_from_xy(lon, lat), crs=NE_CRS)
 
+    if method == "index":
+        dist = get_coast_distance().dist(geom.geometry.y.values, geom.geometry.x.values)
+        if signed:
+            dist[coord_on_land(geom.geometry.y, geom.geometry.x)] *= -1
+        return dist
+
     pad = 20
     bounds = (geom.total_bounds[0] - pad, geom.total_bounds[1] - pad,
               geom.total_bounds[2] + pad, geom.total_bounds[3] + pad)
@@ -596,6 +631,141 @@ def dist_to_coast(coord_lat, lon=None, signed=False):
         dist[coord_on_land(geom.geometry.y, geom.geometry.x)] *= -1
     return dist
 
+class CoastDistance():
+    """Index of coastline segments for fast computation of great-circle distances to the coast
+
+    The coastlines are split into great-circle arcs that are not longer than `max_segment_km`.
+    The midpoints of the arcs (as unit vectors in 3-D space) are indexed in a k-d tree. For each
+    point, the exact distances to the arcs with the `k` nearest midpoints are computed, and the
+    smallest one is returned. This is the exact distance to the coastlines unless the closest arc
+    is not among the candidates, in which case the error is at most `max_segment_km / 2`.
+
+    Attributes
+    ----------
+    max_segment_km : float
+        Maximum length of the arcs in km.
+    arcs : np.array of shape (narcs, 2, 3)
+        Start and end points of the arcs as unit vectors.
+    tree : scipy.spatial.cKDTree
+        Tree over the midpoints of the arcs.
+    """
+
+    def __init__(self, coastlines, max_segment_km=1.0):
+        """Split the coastlines into arcs and index them
+
+        Parameters
+        ----------
+        coastlines : gpd.GeoSeries or list of shapely geometries
+            Linear geometries in epsg:4326, e.g. from `get_coastlines`.
+        max_segment_km : float, optional
+            Maximum length of the arcs in km. Default: 1
+        """
+        if max_segment_km <= 0:
+            raise ValueError(f"Maximum segment length must be positive: {max_segment_km}")
+        self.max_segment_km = max_segment_km
+        lines = shapely.get_parts(np.asarray(coastlines, dtype=object))
+        coords, line_idx = shapely.get_coordinates(lines, return_index=True)
+        if coords.shape[0] < 2:
+            raise ValueError("No coastline segments found.")
+        vert = latlon_to_geosph_vector(coords[:, 1], coords[:, 0])
+        # only consecutive vertices of the same line form a segment
+        seg_msk = line_idx[1:] == line_idx[:-1]
+        vert_a, vert_b = vert[:-1][seg_msk], vert[1:][seg_msk]
+        seg_km = _unit_vector_angle(vert_a, vert_b) * EARTH_RADIUS_KM
+        n_sub = np.fmax(np.ceil(seg_km / max_segment_km), 1).astype(np.int64)
+        # split each segment into n_sub parts by (normalized) linear interpolation
+        seg_idx = np.repeat(np.arange(n_sub.size), n_sub)
+        sub_idx = np.arange(seg_idx.size) - np.repeat(np.cumsum(n_sub) - n_sub, n_sub)
+        frac = np.stack([sub_idx, sub_idx + 1], axis=1) / n_sub[seg_idx, None]
+        vert_a, vert_b = vert_a[seg_idx, None, :], vert_b[seg_idx, None, :]
+        arcs = vert_a + frac[:, :, None] * (vert_b - vert_a)
+        self.arcs = arcs / np.linalg.norm(arcs, axis=-1, keepdims=True)
+        mid = self.arcs.sum(axis=1)
+        mid /= np.fmax(np.linalg.norm(mid, axis=-1, keepdims=True), 1e-300)
+        self.tree = scipy.spatial.cKDTree(mid)
+
+    def dist(self, lat, lon, k=8, chunk_size=100000):
+        """Great-circle distance to the coast in meters
+
+        Parameters
+        ----------
+        lat : np.array
+            latitude of points in epsg:4326
+        lon : np.array
+            longitude of points in epsg:4326
+        k : int, optional
+            Number of candidate arcs per point. Default: 8
+        chunk_size : int, optional
+            Number of points that are processed at once (to limit memory). Default: 100000
+
+        Returns
+        -------
+        dist : np.array
+            Distance to the coast in meters.
+        """
+        shape = np.shape(lat)
+        lat = np.asarray(lat, dtype=float).ravel()
+        lon = np.asarray(lon, dtype=float).ravel()
+        k = min(k, self.arcs.shape[0])
+        dist = np.zeros(lat.size)
+        for start in range(0, lat.size, chunk_size):
+            pnt = latlon_to_geosph_vector(
+                lat[start:start + chunk_size], lon[start:start + chunk_size])
+            _, cand = self.tree.query(pnt, k=k, workers=-1)
+            cand = cand.reshape(pnt.shape[0], k)
+            ang = _dist_to_arcs(pnt[:, None, :], self.arcs[cand, 0], self.arcs[cand, 1])
+            dist[start:start + chunk_size] = ang.min(axis=1)
+        return (dist * EARTH_RADIUS_KM * 1000).reshape(shape)
+
+def _unit_vector_angle(vec_a, vec_b):
+    """Angle (in radians) between unit vectors along the last axis"""
+    return np.arctan2(
+        np.linalg.norm(np.cross(vec_a, vec_b), axis=-1),
+        np.einsum('...i,...i->...', vec_a, vec_b))
+
+def _dist_to_arcs(pnt, vert_a, vert_b):
+    """Angular distance (in radians) of points to great-circle arcs, all as unit vectors
+
+    Parameters
+    ----------
+    pnt, vert_a, vert_b : np.array of shape (..., 3)
+        Points, and start and end points of the arcs. Arrays are broadcast against each other.
+
+    Returns
+    -------
+    np.array of shape (...)
+    """
+    dist = np.fmin(_unit_vector_angle(pnt, vert_a), _unit_vector_angle(pnt, vert_b))
+    normal = np.cross(vert_a, vert_b)
+    normal_len = np.linalg.norm(normal, axis=-1, keepdims=True)
+    valid = normal_len[..., 0] > 0
+    normal = normal / np.where(normal_len > 0, normal_len, 1)
+    # projection onto the great circle through the arc
+    sin_perp = np.einsum('...i,...i->...', pnt, normal)
+    proj = pnt - sin_perp[..., None] * normal
+    on_arc = (valid
+              & (np.einsum('...i,...i->...', np.cross(vert_a, proj), normal) >= 0)
+              & (np.einsum('...i,...i->...', np.cross(proj, vert_b), normal) >= 0))
+    dist_perp = np.arcsin(np.fmin(np.abs(sin_perp), 1))
+    return np.where(on_arc, np.fmin(dist, dist_perp), dist)
+
+@functools.lru_cache(maxsize=2)
+def get_coast_distance(max_segment_km=1.0):
+    """Index of all Natural Earth coastlines (10m), cached per maximum segment length
+
+    Parameters
+    ----------
+    max_segment_km : float, optional
+        Maximum length of the indexed arcs in km, see `CoastDistance`. Default: 1
+
+    Returns
+    -------
+    CoastDistance
+    """
+    LOGGER.info('Indexing coastlines with maximum segment length %s km.', max_segment_km)
+    return CoastDistance(get_coastlines(resolution=10).geometry.values,
+                         max_segment_km=max_segment_km)
+
 def _get_dist_to_coast_nasa_tif():
     """Get the path to the NASA raster file for distance to coast.
     If the file (300 MB) is missing it will be automatically downloaded.
@@ -686,8 +856,11 @@ def coord_on_land(lat, lon, land_geom=None):
         latitude of points in epsg:4326
     lon : np.array
         longitude of points in epsg:4326
-    land_geom : shapely.geometry.multipolygon.MultiPolygon, optional
-         If given, use these as profiles of land. Otherwise, the global landmass is used.
+    land_geom : shapely.geometry.multipolygon.MultiPolygon or LandMask or CountryMask, optional
+         If given, use these as profiles of land. Otherwise, the global landmass (the union of
+         all countries, see `get_land_geometry`) is used, in the form of the cached `LandMask`
+         returned by `get_land_mask`. If a rasterized `LandMask` or `CountryMask` is given, the
+         classification is mostly a raster lookup.
 
     Returns
     -------
@@ -699,20 +872,12 @@ def coord_on_land(lat, lon, land_geom=None):
                          % (lat.size, lon.size))
     if lat.size == 0:
         return np.empty((0,), dtype=bool)
-    delta_deg = 1
-    lons = lon.copy()
     if land_geom is None:
-        # ensure extent of longitude is consistent
-        bounds = lon_bounds(lons)
-        lon_mid = 0.5 * (bounds[0] + bounds[1])
-        # normalize lon
-        lon_normalize(lons, center=lon_mid)
-        bounds = latlon_bounds(lat, lons, buffer=delta_deg)
-        # load land geometry with appropriate same extent
-        land_geom = get_land_geometry(
-            extent=toggle_extent_bounds(bounds),
-            resolution=10)
-    elif not land_geom.is_empty:
+        land_geom = get_land_mask()
+    if isinstance(land_geom, (LandMask, CountryMask)):
+        return land_geom.contains(lat, lon)
+    lons = lon.copy()
+    if not land_geom.is_empty:
         # ensure lon values are within extent of provided land_geom
         land_bounds = land_geom.bounds
         if lons.max() > land_bounds[2] or lons.min() < land_bounds[0]:
@@ -722,6 +887,259 @@ def coord_on_land(lat, lon, land_geom=None):
 
     return shapely.vectorized.contains(land_geom, lons, lat)
 
+class LandMask():
+    """Rasterized land geometry for fast land/sea classification of points
+
+    The land geometry is rasterized once. Points in raster cells that are entirely on land or
+    entirely on sea are classified by a raster lookup. Only points in cells that are crossed by
+    the coastline (and their direct neighbors) are checked against the exact geometry.
+
+    Attributes
+    ----------
+    geom : shapely.geometry.multipolygon.MultiPolygon
+        The land geometry.
+    resolution : float
+        Resolution of the raster in degrees.
+    mask : np.array of shape (height, width) and dtype uint8
+        Raster with values `SEA`, `LAND` or `COAST`.
+    transform : rasterio.Affine
+        Affine transformation defining the raster.
+    """
+    SEA = 0
+    LAND = 1
+    COAST = 2
+
+    def __init__(self, land_geom, resolution=0.05):
+        """Rasterize the given land geometry
+
+        Parameters
+        ----------
+        land_geom : shapely.geometry.multipolygon.MultiPolygon
+            Land geometry, e.g. from `get_land_geometry`.
+        resolution : float, optional
+            Resolution of the raster in degrees. Finer resolutions reduce the number of points
+            that need to be checked against the exact geometry. Default: 0.05
+        """
+        if resolution <= 0:
+            raise ValueError(f"Resolution of land mask must be positive: {resolution}")
+        self.geom = land_geom
+        self.resolution = resolution
+        if land_geom.is_empty:
+            self.mask = np.zeros((0, 0), dtype=np.uint8)
+            self.transform = None
+            return
+        xmin, ymin, xmax, ymax = land_geom.bounds
+        width = max(int(np.ceil((xmax - xmin) / resolution)), 1)
+        height = max(int(np.ceil((ymax - ymin) / resolution)), 1)
+        self.transform = rasterio.Affine(resolution, 0, xmin, 0, -resolution, ymax)
+        self.mask = rasterio.features.rasterize(
+            [(land_geom, self.LAND)], out_shape=(height, width), transform=self.transform,
+            fill=self.SEA, dtype=np.uint8)
+        coast = rasterio.features.rasterize(
+            [(land_geom.boundary, 1)], out_shape=(height, width), transform=self.transform,
+            fill=0, all_touched=True, dtype=np.uint8).astype(bool)
+        # also flag direct neighbors to be robust against cell centers on the coastline
+        coast_ext = coast.copy()
+        coast_ext[1:, :] |= coast[:-1, :]
+        coast_ext[:-1, :] |= coast[1:, :]
+        coast_ext[:, 1:] |= coast[:, :-1]
+        coast_ext[:, :-1] |= coast[:, 1:]
+        self.mask[coast_ext] = self.COAST
+
+    def contains(self, lat, lon):
+        """Check if points are on land.
+
+        Parameters
+        ----------
+        lat : np.array
+            latitude of points in epsg:4326
+        lon : np.array
+            longitude of points in epsg:4326
+
+        Returns
+        -------
+        on_land : np.array(bool)
+            Entries are True if corresponding coordinate is on land and False otherwise.
+        """
+        shape = np.shape(lat)
+        lat = np.asarray(lat, dtype=float).ravel()
+        lons = np.array(lon, dtype=float).ravel()
+        on_land = np.zeros(lat.shape, dtype=bool)
+        if self.mask.size == 0 or lat.size == 0:
+            return on_land.reshape(shape)
+        xmin, _, xmax, _ = self.geom.bounds
+        if np.nanmax(lons) > xmax or np.nanmin(lons) < xmin:
+            # normalize longitude to land_geom extent
+            lon_normalize(lons, center=0.5 * (xmin + xmax))
+        height, width = self.mask.shape
+        col = np.floor((lons - self.transform.c) / self.transform.a)
+        row = np.floor((lat - self.transform.f) / self.transform.e)
+        inside = (col >= 0) & (col < width) & (row >= 0) & (row < height)
+        col, row = col[inside].astype(int), row[inside].astype(int)
+        cell_val = self.mask[row, col]
+        on_land[inside] = (cell_val == self.LAND)
+        coast_idx = np.flatnonzero(inside)[cell_val == self.COAST]
+        if coast_idx.size > 0:
+            on_land[coast_idx] = shapely.vectorized.contains(
+                self.geom, lons[coast_idx], lat[coast_idx])
+        return on_land.reshape(shape)
+
+@functools.lru_cache(maxsize=2)
+def get_land_mask(resolution=LAND_MASK_RES):
+    """Rasterized union of all Natural Earth countries (10m), cached per resolution
+
+    Parameters
+    ----------
+    resolution : float, optional
+        Resolution of the raster in degrees. Default: `LAND_MASK_RES`
+
+    Returns
+    -------
+    LandMask
+    """
+    LOGGER.info('Rasterizing land geometry at resolution %s.', resolution)
+    return LandMask(get_land_geometry(resolution=10), resolution=resolution)
+
+class CountryMask():
+    """Rasterized country geometries for fast lookup of country codes and land/sea classification
+
+    The country geometries are rasterized once with their numeric codes. Points in raster cells
+    that are not crossed by a country boundary (or coastline) are classified by a raster lookup.
+    Only points in cells that are crossed by a boundary (and their direct neighbors) are checked
+    against the exact geometries. As in `get_country_code`, points within overlapping geometries
+    are assigned to the country with the largest area.
+
+    Attributes
+    ----------
+    countries : gpd.GeoDataFrame
+        The country geometries, sorted by area (descending), with the numeric codes in column
+        "region_id".
+    resolution : float
+        Resolution of the raster in degrees.
+    mask : np.array of shape (height, width) and dtype int16
+        Raster with the numeric country codes, 0 for the ocean, or `BOUNDARY`.
+    transform : rasterio.Affine
+        Affine transformation defining the (global) raster.
+    """
+    BOUNDARY = -1
+
+    def __init__(self, countries=None, resolution=COUNTRY_MASK_RES):
+        """Rasterize the given country geometries
+
+        Parameters
+        ----------
+        countries : gpd.GeoDataFrame, optional
+            Natural Earth country geometries as returned by `get_country_geometries`.
+            Default: all countries at 10m resolution.
+        resolution : float, optional
+            Resolution of the raster in degrees. Finer resolutions reduce the number of points
+            that need to be checked against the exact geometries. Default: `COUNTRY_MASK_RES`
+        """
+        if resolution <= 0:
+            raise ValueError(f"Resolution of country mask must be positive: {resolution}")
+        if countries is None:
+            countries = get_country_geometries(resolution=10)
+        with warnings.catch_warnings():
+            # area is only used to sort the countries, the geographic CRS doesn't matter here
+            warnings.simplefilter('ignore', UserWarning)
+            countries = countries.assign(area=countries.geometry.area)
+        countries = countries.sort_values(by=['area'], ascending=False).reset_index(drop=True)
+        countries['region_id'] = [
+            natearth_country_to_int(country) for country in countries.itertuples()]
+        self.countries = countries
+        self.resolution = resolution
+        self._tree = shapely.STRtree(countries.geometry.values)
+
+        width = int(np.ceil(360 / resolution))
+        height = int(np.ceil(180 / resolution))
+        self.transform = rasterio.Affine(resolution, 0, -180, 0, -resolution, 90)
+        # burn the smallest countries first, so that the largest ones take precedence
+        self.mask = rasterio.features.rasterize(
+            list(zip(countries.geometry.values[::-1], countries.region_id.values[::-1])),
+            out_shape=(height, width), transform=self.transform, fill=0, dtype=np.int16)
+        boundary = rasterio.features.rasterize(
+            [(geom.boundary, 1) for geom in countries.geometry.values],
+            out_shape=(height, width), transform=self.transform, fill=0, all_touched=True,
+            dtype=np.uint8).astype(bool)
+        # also flag direct neighbors to be robust against cell centers on the boundaries
+        boundary_ext = boundary.copy()
+        boundary_ext[1:, :] |= boundary[:-1, :]
+        boundary_ext[:-1, :] |= boundary[1:, :]
+        boundary_ext[:, 1:] |= boundary[:, :-1]
+        boundary_ext[:, :-1] |= boundary[:, 1:]
+        self.mask[boundary_ext] = self.BOUNDARY
+
+    def region_id(self, lat, lon):
+        """Numeric (ISO 3166) country code for every point
+
+        Parameters
+        ----------
+        lat : np.array
+            latitude of points in epsg:4326
+        lon : np.array
+            longitude of points in epsg:4326
+
+        Returns
+        -------
+        region_id : np.array(int)
+            Numeric code for each point, 0 for points in the ocean.
+        """
+        shape = np.shape(lat)
+        lat = np.asarray(lat, dtype=float).ravel()
+        lons = lon_normalize(np.array(lon, dtype=float).ravel())
+        height, width = self.mask.shape
+        col = np.floor((lons - self.transform.c) / self.transform.a)
+        row = np.floor((lat - self.transform.f) / self.transform.e)
+        inside = (col >= 0) & (col < width) & (row >= 0) & (row < height)
+        region_id = np.full(lat.shape, self.BOUNDARY, dtype=int)
+        region_id[inside] = self.mask[row[inside].astype(int), col[inside].astype(int)]
+        exact_idx = (region_id == self.BOUNDARY).nonzero()[0]
+        region_id[exact_idx] = 0
+        if exact_idx.size > 0:
+            pnt_idx, geom_idx = self._tree.query(
+                shapely.points(lons[exact_idx], lat[exact_idx]), predicate='within')
+            # the countries are sorted by area, use the largest one that contains the point
+            order = np.lexsort((geom_idx, pnt_idx))
+            pnt_idx, geom_idx = pnt_idx[order], geom_idx[order]
+            first = np.ones(pnt_idx.size, dtype=bool)
+            first[1:] = pnt_idx[1:] != pnt_idx[:-1]
+            region_id[exact_idx[pnt_idx[first]]] = (
+                self.countries.region_id.values[geom_idx[first]])
+        return region_id.reshape(shape)
+
+    def contains(self, lat, lon):
+        """Check if points are on land, i.e., within any of the countries.
+
+        Parameters
+        ----------
+        lat : np.array
+            latitude of points in epsg:4326
+        lon : np.array
+            longitude of points in epsg:4326
+
+        Returns
+        -------
+        on_land : np.array(bool)
+            Entries are True if corresponding coordinate is on land and False otherwise.
+        """
+        return self.region_id(lat, lon) != 0
+
+@functools.lru_cache(maxsize=2)
+def get_country_mask(resolution=COUNTRY_MASK_RES):
+    """Rasterized geometries of all Natural Earth countries (10m), cached per resolution
+
+    Parameters
+    ----------
+    resolution : float, optional
+        Resolution of the raster in degrees. Default: `COUNTRY_MASK_RES`
+
+    Returns
+    -------
+    CountryMask
+    """
+    LOGGER.info('Rasterizing country geometries at resolution %s.', resolution)
+    return CountryMask(resolution=resolution)
+
 def nat_earth_resolution(resolution):
     """Check if resolution is available in Natural Earth. Build string.
 
@@ -744,6 +1162,74 @@ def nat_earth_resolution(resolution):
         raise ValueError('Natural Earth does not accept resolution %s m.' % resolution)
     return str(resolution) + 'm'
 
+@functools.lru_cache(maxsize=16)
+def natural_earth_layer(resolution, category, name):
+    """Parsed Natural Earth layer, cached in memory and on disk
+
+    The shapefile is downloaded (if required) and parsed only once. The parsed layer is stored in
+    `NATEARTH_CACHE_DIR` and reused by later processes as long as it is more recent than the
+    shapefile. If the cached file cannot be read, the shapefile is parsed again and the cache is
+    rewritten. Within a process, the same GeoDataFrame object (including its spatial index
+    ``sindex``) is returned on every call, so it must not be modified by the caller. The public
+    getters (`get_coastlines`, `get_country_geometries`, `get_admin1_info`, ...) only return
+    copies or subsets of it.
+
+    In the 'admin_0_countries' layer, the gaps in the 'ISO_A3' and 'ISO_N3' columns (indicated
+    by the value '-99') are filled, see `natearth_country_to_int`.
+
+    Parameters
+    ----------
+    resolution : str
+        Natural Earth name of resolution, e.g. '110m', see `nat_earth_resolution`.
+    category : str
+        Natural Earth category, e.g. 'physical' or 'cultural'.
+    name : str
+        Natural Earth layer name, e.g. 'coastline' or 'admin_0_countries'.
+
+    Returns
+    -------
+    layer : GeoDataFrame
+        The Natural Earth layer in `NE_CRS`.
+    """
+    shp_file = Path(shapereader.natural_earth(resolution=resolution,
+                                              category=category,
+                                              name=name))
+    cache_file = NATEARTH_CACHE_DIR.joinpath(f"{shp_file.stem}.pkl")
+    if cache_file.is_file() and cache_file.stat().st_mtime >= shp_file.stat().st_mtime:
+        LOGGER.debug('Reading %s', cache_file)
+        try:
+            with cache_file.open('rb') as file:
+                return pickle.load(file)
+        except Exception as err:  # pylint: disable=broad-except
+            # e.g. a cache file written with other versions of pandas, shapely or geopandas
+            LOGGER.warning('Failed to read cached Natural Earth layer %s, reading %s instead: %s',
+                           cache_file, shp_file, err)
+
+    LOGGER.debug('Reading %s', shp_file)
+    layer = gpd.read_file(shp_file, encoding='UTF-8')
+    if not layer.crs:
+        layer.crs = NE_CRS
+
+    if name == 'admin_0_countries':
+        # fill gaps in nat_earth
+        gap_mask = (layer['ISO_A3'] == '-99')
+        layer.loc[gap_mask, 'ISO_A3'] = layer.loc[gap_mask, 'ADM0_A3']
+
+        gap_mask = (layer['ISO_N3'] == '-99')
+        for idx, country in layer[gap_mask].iterrows():
+            layer.loc[idx, "ISO_N3"] = f"{natearth_country_to_int(country):03d}"
+
+    try:
+        NATEARTH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file first so that other processes never read a partial file
+        tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+        with tmp_file.open('wb') as file:
+            pickle.dump(layer, file, pickle.HIGHEST_PROTOCOL)
+        tmp_file.replace(cache_file)
+    except OSError as err:
+        LOGGER.warning('Failed to cache Natural Earth layer in %s: %s', cache_file, err)
+    return layer
+
 def get_country_geometries(country_names=None, extent=None, resolution=10):
     """Natural Earth country boundaries within given extent
 
@@ -774,31 +1260,19 @@ def get_country_geometries(country_names=None, extent=None, resolution=10):
         within the specified extent.
     """
     resolution = nat_earth_resolution(resolution)
-    shp_file = shapereader.natural_earth(resolution=resolution,
-                                         category='cultural',
-                                         name='admin_0_countries')
-    nat_earth = gpd.read_file(shp_file, encoding='UTF-8')
-
-    if not nat_earth.crs:
-        nat_earth.crs = NE_CRS
-
-    # fill gaps in nat_earth
-    gap_mask = (nat_earth['ISO_A3'] == '-99')
-    nat_earth.loc[gap_mask, 'ISO_A3'] = nat_earth.loc[gap_mask, 'ADM0_A3']
-
-    gap_mask = (nat_earth['ISO_N3'] == '-99')
-    for idx, country in nat_earth[gap_mask].iterrows():
-        nat_earth.loc[idx, "ISO_N3"] = f"{natearth_country_to_int(country):03d}"
+    nat_earth = natural_earth_layer(resolution, 'cultural', 'admin_0_countries')
 
-    out = nat_earth
+    selection = np.ones(nat_earth.shape[0], dtype=bool)
     if country_names:
         if isinstance(country_names, str):
             country_names = [country_names]
-        country_mask = np.isin(
+        selection &= np.isin(
             nat_earth[['ISO_A3', 'WB_A3', 'ADM0_A3']].values,
             country_names,
         ).any(axis=1)
-        out = out[country_mask]
+
+    # boolean indexing returns a copy, the cached layer remains untouched
+    out = nat_earth[selection]
 
     if extent:
         if extent[1] - extent[0] > 360:
@@ -824,6 +1298,10 @@ def get_country_geometries(country_names=None, extent=None, resolution=10):
             bbox = shapely.ops.unary_union(
                 [box(*toggle_extent_bounds(e)) for e in [extent_left, extent_right]]
             )
+        # prefilter with the spatial index of the cached layer before the exact overlay
+        in_bbox = np.zeros(nat_earth.shape[0], dtype=bool)
+        in_bbox[nat_earth.sindex.query(bbox)] = True
+        out = nat_earth[selection & in_bbox]
         bbox = gpd.GeoSeries(bbox, crs=DEF_CRS)
         bbox = gpd.GeoDataFrame({'geometry': bbox}, crs=DEF_CRS)
         out = gpd.overlay(out, bbox, how="intersection")
@@ -961,8 +1439,136 @@ def assign_grid_points(x, y, grid_width, grid_height, grid_transform):
     assigned[(y_i < 0) | (y_i >= grid_height)] = -1
     return assigned
 
+class NearestNeighborIndex():
+    """Reusable spatial index of lat/lon coordinates for nearest neighbor queries
+
+    The search trees used by `assign_coordinates` are built lazily for each distance metric and
+    reused by all subsequent queries. An index can be written to a file and read again, e.g., to
+    store it next to the file of a hazard.
+
+    Attributes
+    ----------
+    coords : np.array with two columns
+        The indexed lat/lon coordinates.
+    fingerprint : str
+        Hash of the coordinates, see `coords_fingerprint`.
+    """
+
+    def __init__(self, coords):
+        """Index the given coordinates
+
+        Parameters
+        ----------
+        coords : np.array with two columns
+            Each row is a geographical coordinate pair (lat, lon).
+        """
+        self.coords = np.asarray(coords, dtype='float64')
+        self.fingerprint = coords_fingerprint(self.coords)
+        self._trees = dict()
+
+    def matches(self, coords):
+        """Check if the index has been built for the given coordinates
+
+        Parameters
+        ----------
+        coords : np.array with two columns
+            Each row is a geographical coordinate pair (lat, lon).
+
+        Returns
+        -------
+        bool
+        """
+        return coords_fingerprint(coords) == self.fingerprint
+
+    def tree(self, distance="euclidean"):
+        """Search tree for the given distance metric, built on first use
+
+        Parameters
+        ----------
+        distance : str, optional
+            Distance metric, one of "euclidean" (`scipy.spatial.KDTree`), "haversine"
+            (`sklearn.neighbors.BallTree`) or "approx" (latitude bands, see
+            `_approx_search_bands`). Default: "euclidean"
+
+        Returns
+        -------
+        scipy.spatial.KDTree or sklearn.neighbors.BallTree or tuple
+            Tree over the coordinates in radians, or latitude bands of the coordinates.
+        """
+        if distance not in self._trees:
+            if distance == "euclidean":
+                self._trees[distance] = scipy.spatial.KDTree(np.radians(self.coords))
+            elif distance == "haversine":
+                self._trees[distance] = BallTree(np.radians(self.coords), metric='haversine')
+            elif distance == "approx":
+                self._trees[distance] = _approx_search_bands(self.coords)
+            else:
+                raise ValueError(f'No search tree for "{distance}" distance.')
+        return self._trees[distance]
+
+    def grid(self):
+        """Regular grid of the coordinates, detected on first use
+
+        Returns
+        -------
+        tuple or None
+            See `grid_cell_index`. None if the coordinates are not points of a regular grid.
+        """
+        if "grid" not in self._trees:
+            self._trees["grid"] = grid_cell_index(self.coords)
+        return self._trees["grid"]
+
+    def write(self, file_name):
+        """Write the index (including the trees built so far) to a file
+
+        Parameters
+        ----------
+        file_name : str or Path
+            Path of the file to write.
+        """
+        LOGGER.info('Writing %s', file_name)
+        with Path(file_name).open('wb') as file:
+            pickle.dump(self, file, pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def from_file(cls, file_name):
+        """Read an index from a file written with `write`
+
+        Parameters
+        ----------
+        file_name : str or Path
+            Path of the file to read.
+
+        Returns
+        -------
+        NearestNeighborIndex
+        """
+        LOGGER.info('Reading %s', file_name)
+        with Path(file_name).open('rb') as file:
+            index = pickle.load(file)
+        if not isinstance(index, cls):
+            raise ValueError(f"File {file_name} does not contain a {cls.__name__}.")
+        return index
+
+def coords_fingerprint(coords):
+    """Hash of an array of coordinates, e.g., to detect modified coordinates
+
+    Parameters
+    ----------
+    coords : np.array
+        Array of coordinates.
+
+    Returns
+    -------
+    str
+    """
+    coords = np.ascontiguousarray(coords, dtype='float64')
+    hasher = hashlib.sha1(str(coords.shape).encode())
+    hasher.update(coords.tobytes())
+    return hasher.hexdigest()
+
 def assign_coordinates(coords, coords_to_assign, distance="euclidean",
-                       threshold=NEAREST_NEIGHBOR_THRESHOLD, **kwargs):
+                       threshold=NEAREST_NEIGHBOR_THRESHOLD, nn_index=None, **kwargs):
     """To each coordinate in `coords`, assign a matching coordinate in `coords_to_assign`
 
     If there is no exact match for some entry, an attempt is made to assign the geographically
@@ -993,6 +1599,10 @@ def assign_coordinates(coords, coords_to_assign, distance="euclidean",
     threshold : float, optional
         If the distance to the nearest neighbor exceeds `threshold`, the index `-1` is assigned.
         Set `threshold` to 0 to disable nearest neighbor matching. Default: 100 (km)
+    nn_index : NearestNeighborIndex, optional
+        Index of `coords_to_assign`. If given, its search trees are used (and built if
+        required) for non-exact matching, so that repeated assignments to the same coordinates
+        reuse them. Default: None
     kwargs: dict, optional
         Keyword arguments to be passed on to nearest-neighbor finding functions in case of
         non-exact matching with the specified `distance`.
@@ -1027,6 +1637,9 @@ def assign_coordinates(coords, coords_to_assign, distance="euclidean",
         raise ValueError(
             f'Coordinate assignment with "{distance}" distance is not supported.')
 
+    if nn_index is not None and nn_index.coords.shape != coords_to_assign.shape:
+        raise ValueError("The nearest neighbor index does not match the coordinates to assign.")
+
     coords = coords.astype('float64')
     coords_to_assign = coords_to_assign.astype('float64')
     if np.array_equal(coords, coords_to_assign):
@@ -1053,6 +1666,14 @@ def assign_coordinates(coords, coords_to_assign, distance="euclidean",
         # assign remaining coordinates to their geographically nearest neighbor
         if threshold > 0 and exact_assign_idx.size != coords_view.size:
             not_assigned_idx_mask = (assigned_idx == -1)
+            if nn_index is not None:
+                grid = nn_index.grid() if distance == "euclidean" else None
+                if grid is not None:
+                    kwargs['grid'] = grid
+                # with a regular grid, the tree is only required for points outside of the grid
+                if grid is None or np.any(
+                        _assign_grid_cells(grid, coords[not_assigned_idx_mask]) == -1):
+                    kwargs['tree'] = nn_index.tree(distance)
             assigned_idx[not_assigned_idx_mask] = nearest_neighbor_funcs[distance](
                 coords_to_assign, coords[not_assigned_idx_mask], threshold, **kwargs)
     return assigned_idx
@@ -1065,11 +1686,16 @@ def _dist_sqr_approx(lats1, lons1, cos_lats1, lats2, lons2):
     d_lat = lats1 - lats2
     return d_lon * d_lon * cos_lats1 * cos_lats1 + d_lat * d_lat
 
-def _nearest_neighbor_approx(centroids, coordinates, threshold, check_antimeridian=True):
+def _nearest_neighbor_approx(centroids, coordinates, threshold, check_antimeridian=True,
+                             tree=None):
     """Compute the nearest centroid for each coordinate using the
     euclidean distance d = ((dlon)cos(lat))^2+(dlat)^2. For distant points
     (e.g. more than 100km apart) use the haversine distance.
 
+    The centroids are sorted into latitude bands (see `_approx_search_bands`), and only the
+    bands and longitude ranges that might contain a closer centroid are searched. The result is
+    the same as for a brute-force search over all centroids.
+
     Parameters
     ----------
     centroids : 2d array
@@ -1086,38 +1712,37 @@ def _nearest_neighbor_approx(centroids, coordinates, threshold, check_antimeridi
         antimeridian is recomputed using the Haversine distance. The antimeridian is guessed from
         both coordinates and centroids, and is assumed equal to 0.5*(lon_max+lon_min) + 180.
         Default: True
+    tree : tuple, optional
+        Latitude bands of the centroids as returned by `_approx_search_bands`, e.g., from a
+        `NearestNeighborIndex`. If None, the bands are constructed. Default: None
 
     Returns
     -------
     np.array
         with as many rows as coordinates containing the centroids indexes
     """
+    if tree is None:
+        tree = _approx_search_bands(centroids)
 
     # Compute only for the unique coordinates. Copy the results for the
     # not unique coordinates
+    coordinates = np.asarray(coordinates, dtype=np.float64)
     _, idx, inv = np.unique(coordinates, axis=0, return_index=True,
                             return_inverse=True)
-    # Compute cos(lat) for all centroids
-    centr_cos_lat = np.cos(np.radians(centroids[:, 0]))
-    assigned = np.zeros(coordinates.shape[0], int)
-    num_warn = 0
-    for icoord, iidx in enumerate(idx):
-        dist = _dist_sqr_approx(centroids[:, 0], centroids[:, 1],
-                               centr_cos_lat, coordinates[iidx, 0],
-                               coordinates[iidx, 1])
-        min_idx = dist.argmin()
-        # Raise a warning if the minimum distance is greater than the
-        # threshold and set an unvalid index -1
-        if np.sqrt(dist.min()) * ONE_LAT_KM > threshold:
-            num_warn += 1
-            min_idx = -1
-
-        # Assign found centroid index to all the same coordinates
-        assigned[inv == icoord] = min_idx
+    assigned, dist_sqr = _nearest_neighbor_approx_bands(
+        *tree, coordinates[idx, 0], coordinates[idx, 1])
 
+    # Raise a warning if the minimum distance is greater than the
+    # threshold and set an unvalid index -1
+    far_msk = np.sqrt(dist_sqr) * ONE_LAT_KM > threshold
+    num_warn = np.count_nonzero(far_msk)
     if num_warn:
         LOGGER.warning('Distance to closest centroid is greater than %s'
                        'km for %s coordinates.', threshold, num_warn)
+        assigned[far_msk] = -1
+
+    # Assign found centroid index to all the same coordinates
+    assigned = assigned[inv.reshape(-1)]
 
     if check_antimeridian:
         assigned = _nearest_neighbor_antimeridian(
@@ -1125,7 +1750,122 @@ def _nearest_neighbor_approx(centroids, coordinates, threshold, check_antimeridi
 
     return assigned
 
-def _nearest_neighbor_haversine(centroids, coordinates, threshold):
+def _approx_search_bands(centroids):
+    """Sort centroids into latitude bands for the nearest neighbor search with "approx" distance
+
+    The number of (equally high) bands is the square root of the number of centroids. Within
+    each band, the centroids are sorted by longitude.
+
+    Parameters
+    ----------
+    centroids : 2d array
+        First column contains latitude, second column contains longitude.
+
+    Returns
+    -------
+    tuple
+        The arguments `lat_min` to `cent_cos` of `_nearest_neighbor_approx_bands`.
+    """
+    lat = np.asarray(centroids[:, 0], dtype=np.float64)
+    lon = np.asarray(centroids[:, 1], dtype=np.float64)
+    n_bands = max(int(np.sqrt(lat.size)), 1)
+    lat_min = lat.min()
+    band_height = (lat.max() - lat_min) / n_bands
+    if band_height <= 0:
+        n_bands, band_height = 1, 1.0
+    band = np.clip(np.floor((lat - lat_min) / band_height).astype(np.int64), 0, n_bands - 1)
+    # lexsort is stable: ties are kept in the order of the centroids
+    order = np.lexsort((lon, band))
+    band_ptr = np.zeros(n_bands + 1, dtype=np.int64)
+    band_ptr[1:] = np.cumsum(np.bincount(band, minlength=n_bands))
+    cos_lat = np.cos(np.radians(lat))
+    band_cos_min = np.ones(n_bands)
+    np.minimum.at(band_cos_min, band, cos_lat)
+    return (lat_min, band_height, band_ptr, band_cos_min,
+            order, lat[order], lon[order], cos_lat[order])
+
+@numba.njit(parallel=True)
+def _nearest_neighbor_approx_bands(lat_min, band_height, band_ptr, band_cos_min,
+                                   cent_idx, cent_lat, cent_lon, cent_cos, lats, lons):
+    """Nearest centroid in "approx" distance for each coordinate, searching latitude bands
+
+    The bands are visited in the order of their latitudinal distance from the coordinate, which
+    is a lower bound of the distance to all centroids in the band. Within a band, only centroids
+    in the longitude range that might be closer than the closest centroid found so far are
+    checked. Ties are resolved in favor of the smaller centroid index.
+
+    Parameters
+    ----------
+    lat_min, band_height, band_ptr, band_cos_min, cent_idx, cent_lat, cent_lon, cent_cos
+        Bands as returned by `_approx_search_bands`: smallest latitude and height of the bands,
+        start of each band in the sorted centroids, smallest cos(lat) in each band, and index,
+        latitude, longitude and cos(lat) of the sorted centroids.
+    lats, lons : np.array
+        Coordinates to find the nearest centroids for.
+
+    Returns
+    -------
+    assigned : np.array of int
+        Index of the nearest centroid for each coordinate.
+    dist_sqr : np.array
+        Squared distance (see `_dist_sqr_approx`) to the nearest centroid.
+    """
+    n_bands = band_ptr.size - 1
+    # tolerance for rounding errors in the band boundaries
+    lat_tol = 1e-9 * band_height
+    assigned = np.full(lats.size, -1, dtype=np.int64)
+    dist_sqr = np.full(lats.size, np.inf)
+    for i in numba.prange(lats.size):
+        lat, lon = lats[i], lons[i]
+        best, best_idx = np.inf, -1
+        band_up = int(np.floor((lat - lat_min) / band_height))
+        band_up = min(max(band_up, 0), n_bands - 1)
+        band_down = band_up - 1
+        while band_up < n_bands or band_down >= 0:
+            bound_up, bound_down = np.inf, np.inf
+            if band_up < n_bands:
+                bound_up = max(lat_min + band_up * band_height - lat - lat_tol, 0.0) ** 2
+            if band_down >= 0:
+                bound_down = max(
+                    lat - lat_min - (band_down + 1) * band_height - lat_tol, 0.0) ** 2
+            if min(bound_up, bound_down) > best:
+                break
+            if bound_up <= bound_down:
+                band = band_up
+                band_up += 1
+            else:
+                band = band_down
+                band_down -= 1
+            start, end = band_ptr[band], band_ptr[band + 1]
+            if start == end:
+                continue
+            band_lon = cent_lon[start:end]
+            if best_idx == -1:
+                # initial guess: centroids with the closest longitude in this band
+                pos = start + np.searchsorted(band_lon, lon)
+                for j in range(max(pos - 1, start), min(pos + 1, end)):
+                    d_lon = cent_lon[j] - lon
+                    d_lat = cent_lat[j] - lat
+                    dist = d_lon * d_lon * cent_cos[j] * cent_cos[j] + d_lat * d_lat
+                    if dist < best or (dist == best and cent_idx[j] < best_idx):
+                        best, best_idx = dist, cent_idx[j]
+            if band_cos_min[band] > 0:
+                lon_width = np.sqrt(best) / band_cos_min[band] * (1 + 1e-9)
+                first = start + np.searchsorted(band_lon, lon - lon_width, side='left')
+                last = start + np.searchsorted(band_lon, lon + lon_width, side='right')
+            else:
+                first, last = start, end
+            for j in range(first, last):
+                d_lon = cent_lon[j] - lon
+                d_lat = cent_lat[j] - lat
+                dist = d_lon * d_lon * cent_cos[j] * cent_cos[j] + d_lat * d_lat
+                if dist < best or (dist == best and cent_idx[j] < best_idx):
+                    best, best_idx = dist, cent_idx[j]
+        assigned[i] = best_idx
+        dist_sqr[i] = best
+    return assigned, dist_sqr
+
+def _nearest_neighbor_haversine(centroids, coordinates, threshold, tree=None):
     """Compute the neareast centroid for each coordinate using a Ball tree with haversine distance.
 
     Parameters
@@ -1139,6 +1879,9 @@ def _nearest_neighbor_haversine(centroids, coordinates, threshold):
     threshold : float
         distance threshold in km over which no neighbor will
         be found. Those are assigned with a -1 index
+    tree : sklearn.neighbors.BallTree, optional
+        Tree over the centroids (in radians) with haversine metric, e.g., from a
+        `NearestNeighborIndex`. If None, the tree is constructed. Default: None
 
     Returns
     -------
@@ -1146,7 +1889,8 @@ def _nearest_neighbor_haversine(centroids, coordinates, threshold):
         with as many rows as coordinates containing the centroids indexes
     """
     # Construct tree from centroids
-    tree = BallTree(np.radians(centroids), metric='haversine')
+    if tree is None:
+        tree = BallTree(np.radians(centroids), metric='haversine')
     # Select unique exposures coordinates
     _, idx, inv = np.unique(coordinates, axis=0, return_index=True,
                             return_inverse=True)
@@ -1172,7 +1916,8 @@ def _nearest_neighbor_haversine(centroids, coordinates, threshold):
     return assigned[inv]
 
 
-def _nearest_neighbor_euclidean(centroids, coordinates, threshold, check_antimeridian=True):
+def _nearest_neighbor_euclidean(centroids, coordinates, threshold, check_antimeridian=True,
+                                tree=None, grid=None):
     """Compute the neareast centroid for each coordinate using a k-d tree.
 
     Parameters
@@ -1191,20 +1936,42 @@ def _nearest_neighbor_euclidean(centroids, coordinates, threshold, check_antimer
         antimeridian is recomputed using the Haversine distance. The antimeridian is guessed from
         both coordinates and centroids, and is assumed equal to 0.5*(lon_max+lon_min) + 180.
         Default: True
+    tree : scipy.spatial.KDTree, optional
+        Tree over the centroids (in radians), e.g., from a `NearestNeighborIndex`. If None, the
+        tree is constructed when required. Default: None
+    grid : tuple, optional
+        If the centroids are points of a regular grid, the grid as returned by
+        `grid_cell_index`. Coordinates within the cell of a centroid are assigned to it without
+        a tree search. Default: None
 
     Returns
     -------
     np.array
         with as many rows as coordinates containing the centroids indexes
     """
-    # Construct tree from centroids
-    tree = scipy.spatial.KDTree(np.radians(centroids))
     # Select unique exposures coordinates
     _, idx, inv = np.unique(coordinates, axis=0, return_index=True,
                             return_inverse=True)
-
-    # query the k closest points of the n_points using dual tree
-    dist, assigned = tree.query(np.radians(coordinates[idx]), k=1, p=2, workers=-1)
+    coordinates_uni = coordinates[idx]
+
+    if grid is not None:
+        assigned = _assign_grid_cells(grid, coordinates_uni)
+        query_msk = assigned == -1
+        dist = np.zeros(assigned.size)
+        dist[~query_msk] = np.linalg.norm(
+            np.radians(coordinates_uni[~query_msk] - centroids[assigned[~query_msk]]), axis=1)
+    else:
+        assigned = np.zeros(coordinates_uni.shape[0], dtype=int)
+        query_msk = np.ones(assigned.size, dtype=bool)
+        dist = np.zeros(assigned.size)
+
+    if np.any(query_msk):
+        # Construct tree from centroids
+        if tree is None:
+            tree = scipy.spatial.KDTree(np.radians(centroids))
+        # query the k closest points of the n_points using dual tree
+        dist[query_msk], assigned[query_msk] = tree.query(
+            np.radians(coordinates_uni[query_msk]), k=1, p=2, workers=-1)
 
     # Raise a warning if the minimum distance is greater than the
     # threshold and set an unvalid index -1
@@ -1216,11 +1983,78 @@ def _nearest_neighbor_euclidean(centroids, coordinates, threshold, check_antimer
 
     if check_antimeridian:
         assigned = _nearest_neighbor_antimeridian(
-            centroids, coordinates[idx], threshold, assigned)
+            centroids, coordinates_uni, threshold, assigned)
 
     # Copy result to all exposures and return value
     return assigned[inv]
 
+def grid_cell_index(coords, max_cells_per_point=4, min_resol=1.0e-8):
+    """Detect if coordinates are points of a regular grid and map the grid cells to the points
+
+    The points are not required to cover the full (rectangular) grid, e.g., the grid might be
+    restricted to points on land. However, the grid is only used if the number of grid cells
+    does not exceed the number of points by more than the factor `max_cells_per_point`.
+
+    Parameters
+    ----------
+    coords : np.array with two columns
+        Each row is a geographical coordinate pair (lat, lon).
+    max_cells_per_point : float, optional
+        Maximum ratio of the number of cells in the grid to the number of points. Default: 4
+    min_resol : float, optional
+        Minimum resolution to consider, see `get_resolution`. Default: 1.0e-8.
+
+    Returns
+    -------
+    grid : tuple (lat_min, lon_min, res_lat, res_lon, cell_idx) or None
+        Coordinates of the first cell, resolution of the grid, and, for each cell of the grid
+        (rows: lat, columns: lon), the index of the point in `coords` or -1 if there is no point
+        in this cell. If there are duplicate points, the first one is used. None if the
+        coordinates are not points of a sufficiently dense regular grid.
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    lat_uni, lon_uni = np.unique(coords[:, 0]), np.unique(coords[:, 1])
+    if lat_uni.size < 2 or lon_uni.size < 2:
+        return None
+    res_lat, res_lon = get_resolution(lat_uni, lon_uni, min_resol=min_resol)
+    height = int(np.round((lat_uni[-1] - lat_uni[0]) / res_lat)) + 1
+    width = int(np.round((lon_uni[-1] - lon_uni[0]) / res_lon)) + 1
+    if height * width > max_cells_per_point * coords.shape[0]:
+        return None
+    cell_lat = (coords[:, 0] - lat_uni[0]) / res_lat
+    cell_lon = (coords[:, 1] - lon_uni[0]) / res_lon
+    row, col = np.round(cell_lat).astype(np.int64), np.round(cell_lon).astype(np.int64)
+    if (np.abs(cell_lat - row).max() > 1e-6) or (np.abs(cell_lon - col).max() > 1e-6):
+        return None
+    cell_idx = np.full((height, width), -1, dtype=np.int64)
+    # assign in reverse order so that the first of duplicate points is used
+    cell_idx[row[::-1], col[::-1]] = np.arange(coords.shape[0])[::-1]
+    return lat_uni[0], lon_uni[0], res_lat, res_lon, cell_idx
+
+def _assign_grid_cells(grid, coordinates):
+    """Assign coordinates to the grid points in the same grid cell
+
+    Parameters
+    ----------
+    grid : tuple
+        Grid as returned by `grid_cell_index`.
+    coordinates : 2d array
+        First column contains latitude, second column contains longitude.
+
+    Returns
+    -------
+    np.array
+        Index of the grid point for each coordinate, or -1 if the coordinate is not within a
+        cell of the grid that contains a point.
+    """
+    lat_min, lon_min, res_lat, res_lon, cell_idx = grid
+    row = np.round((coordinates[:, 0] - lat_min) / res_lat).astype(np.int64)
+    col = np.round((coordinates[:, 1] - lon_min) / res_lon).astype(np.int64)
+    inside = (row >= 0) & (row < cell_idx.shape[0]) & (col >= 0) & (col < cell_idx.shape[1])
+    assigned = np.full(coordinates.shape[0], -1, dtype=np.int64)
+    assigned[inside] = cell_idx[row[inside], col[inside]]
+    return assigned
+
 def _nearest_neighbor_antimeridian(centroids, coordinates, threshold, assigned):
     """Recompute nearest neighbors close to the anti-meridian with the Haversine distance
 
@@ -1428,12 +2262,16 @@ def natearth_country_to_int(country):
         return int(country.ISO_N3)
     return country_to_iso(str(country.NAME), representation="numeric")
 
-def get_country_code(lat, lon, gridded=False):
+def get_country_code(lat, lon, gridded=False, country_mask=None):
     """Provide numeric (ISO 3166) code for every point.
 
     Oceans get the value zero. Areas that are not in ISO 3166 are given values in the range above
     900 according to NATEARTH_AREA_NONISO_NUMERIC.
 
+    Unless `gridded` is True, the codes are looked up in rasterized country geometries, and only
+    points close to country boundaries are checked against the exact geometries (see
+    `CountryMask`).
+
     Parameters
     ----------
     lat : np.array
@@ -1441,7 +2279,11 @@ def get_country_code(lat, lon, gridded=False):
     lon : np.array
         longitude of points in epsg:4326
     gridded : bool
-        If True, interpolate precomputed gridded data which is usually much faster. Default: False.
+        If True, interpolate precomputed gridded data (without exact checks close to the
+        boundaries). Default: False.
+    country_mask : CountryMask, optional
+        Rasterized country geometries to use if `gridded` is False. Default: the cached mask of
+        all countries returned by `get_country_mask`.
 
     Returns
     -------
@@ -1461,28 +2303,9 @@ def get_country_code(lat, lon, gridded=False):
                                        method='nearest', fill_value=0)
         region_id = region_id.astype(int)
     else:
-        extent = (lon.min() - 0.001, lon.max() + 0.001,
-                  lat.min() - 0.001, lat.max() + 0.001)
-        countries = get_country_geometries(extent=extent)
-        with warnings.catch_warnings():
-            # in order to suppress the following
-            # UserWarning: Geometry is in a geographic CRS. Results from 'area' are likely
-            # incorrect. Use 'GeoSeries.to_crs()' to re-project geometries to a projected CRS
-            # before this operation.
-            warnings.simplefilter('ignore', UserWarning)
-            countries['area'] = countries.geometry.area
-        countries = countries.sort_values(by=['area'], ascending=False)
-        region_id = np.full((lon.size,), -1, dtype=int)
-        total_land = countries.geometry.unary_union
-        ocean_mask = (region_id.all() if total_land is None
-                else ~shapely.vectorized.contains(total_land, lon, lat))
-        region_id[ocean_mask] = 0
-        for country in countries.itertuples():
-            unset = (region_id == -1).nonzero()[0]
-            select = shapely.vectorized.contains(country.geometry,
-                                                 lon[unset], lat[unset])
-            region_id[unset[select]] = natearth_country_to_int(country)
-        region_id[region_id == -1] = 0
+        if country_mask is None:
+            country_mask = get_country_mask()
+        region_id = country_mask.region_id(lat, lon)
     return region_id
 
 def get_admin1_info(country_names):
@@ -1502,26 +2325,14 @@ def get_admin1_info(country_names):
     admin1_shapes : dict
         Shape according to Natural Earth.
     """
-    def _ensure_utf8(val):
-        # Without the `*.cpg` file present, the shape reader wrongly assumes latin-1 encoding:
-        # https://github.com/SciTools/cartopy/issues/1282
-        # https://github.com/SciTools/cartopy/commit/6d787b01e122eea68b67a9b2966e45877755a52d
-        # As a workaround, we encode and decode again, unless this fails which means
-        # that the `*.cpg` is present and the encoding is correct:
-        try:
-            return val.encode('latin-1').decode('utf-8')
-        except (AttributeError, UnicodeDecodeError, UnicodeEncodeError):
-            return val
-
     if isinstance(country_names, (str, int, float)):
         country_names = [country_names]
     if not isinstance(country_names, list):
         LOGGER.error("country_names needs to be of type list, str, int or float")
         raise TypeError("Invalid type for input parameter 'country_names'")
-    admin1_file = shapereader.natural_earth(resolution='10m',
-                                            category='cultural',
-                                            name='admin_1_states_provinces')
-    admin1_recs = shapereader.Reader(admin1_file)
+    # the layer is read with UTF-8 encoding, independently of the presence of a `*.cpg` file
+    admin1_recs = natural_earth_layer('10m', 'cultural', 'admin_1_states_provinces')
+    attr_names = [col for col in admin1_recs.columns if col != 'geometry']
     admin1_info = dict()
     admin1_shapes = dict()
     for country in country_names:
@@ -1530,13 +2341,9 @@ def get_admin1_info(country_names):
             country = f'{int(country):03d}'
         # get alpha-3 code according to ISO 3166
         country = pycountry.countries.lookup(country).alpha_3
-        admin1_info[country] = list()
-        admin1_shapes[country] = list()
-        for rec in admin1_recs.records():
-            if rec.attributes['adm0_a3'] == country:
-                rec_attributes = {k: _ensure_utf8(v) for k, v in rec.attributes.items()}
-                admin1_info[country].append(rec_attributes)
-                admin1_shapes[country].append(rec.geometry)
+        country_recs = admin1_recs[admin1_recs['adm0_a3'] == country]
+        admin1_info[country] = country_recs[attr_names].to_dict(orient='records')
+        admin1_shapes[country] = list(country_recs.geometry)
         if len(admin1_info[country]) == 0:
             raise LookupError(f'natural_earth records are empty for country {country}')
     return admin1_info, admin1_shapes
@@ -1580,11 +2387,7 @@ def get_admin1_geometries(countries):
         gdf_tmp = gpd.GeoDataFrame(columns=gdf.columns)
         gdf_tmp.admin1_name = [record['name'] for record in admin1_info[country]]
         gdf_tmp.iso_3166_2 = [record['iso_3166_2'] for record in admin1_info[country]]
-        # With this initiation of GeoSeries in a list comprehension,
-        # the ability of geopandas to convert shapereader.Shape to (Multi)Polygon is exploited:
-        geoseries = gpd.GeoSeries([gpd.GeoSeries(shape).values[0]
-                                   for shape in admin1_shapes[country]])
-        gdf_tmp.geometry = list(geoseries)
+        gdf_tmp.geometry = admin1_shapes[country]
         # fill columns with country identifiers (admin 0):
         gdf_tmp.iso_3n = pycountry.countries.lookup(country).numeric
         gdf_tmp.iso_3a = country
@@ -2071,9 +2874,15 @@ def _raster_gradient(data, transform, latlon_to_m=False):
 
     return gradient_data, gradient_transform
 
-def _prepare_raster_sample(path, lat, lon, intermediate_res, fill_value):
+def _prepare_raster_sample(path, lat, lon, intermediate_res, fill_value,
+                           tile_size=RASTER_SAMPLE_TILE_SIZE):
     """Helper function for the sampling of points from a raster file.
 
+    The sample points are grouped by the square tiles (of `tile_size` raster cells) that contain
+    them, and only a window around the points of each tile is read. This keeps the memory usage
+    proportional to the number of tiles that contain sample points, even if the points are
+    scattered over a large area.
+
     Parameters
     ----------
     path : str
@@ -2087,14 +2896,17 @@ def _prepare_raster_sample(path, lat, lon, intermediate_res, fill_value):
         increase performance for files of very high resolution.
     fill_value : numeric or None
         The value used outside of the raster bounds.
+    tile_size : int, optional
+        Size (in raster cells of resolution `intermediate_res`) of the tiles.
+        Default: RASTER_SAMPLE_TILE_SIZE
 
     Returns
     -------
-    data : np.array of shape (ny, nx)
-        Raster data from the given raster file that is covering a rectangular region around the
-        given sample points.
-    transform : rasterio.Affine
-        Affine transformation defining the output raster data.
+    tiles : iterator over tuples (idx, data, transform)
+        For each tile, the indices `idx` of the sample points in the tile, the raster data
+        (np.array of shape (ny, nx)) from the given raster file that is covering a rectangular
+        region around these points, and the affine transformation (rasterio.Affine) defining this
+        raster data. The data is read while iterating.
     fill_value : float
         The values to use outside of the raster bounds. If None was provided as an input, this is
         the raster's nodata value (if it exists) or 0.
@@ -2108,18 +2920,32 @@ def _prepare_raster_sample(path, lat, lon, intermediate_res, fill_value):
             intermediate_res = (np.abs(src.transform[0]), np.abs(src.transform[4]))
         meta_nodata = src.meta['nodata']
         crs = src.crs
-
-    bounds = (lon.min(), lat.min(), lon.max(), lat.max())
-    data, transform = read_raster_bounds(path, bounds, res=intermediate_res, pad_cells=2)
-    data = data[0, :, :]
-
-    if fill_value is not None:
-        data[data == meta_nodata] = fill_value
-    else:
+        origin = (src.transform[2], src.transform[5])
+
+    # group the points by tiles that are aligned with the (intermediate) raster grid
+    tile_res = tile_size * np.abs(np.broadcast_to(intermediate_res, (2,)))
+    tile_ij = np.stack([np.floor((lat - origin[1]) / tile_res[1]),
+                        np.floor((lon - origin[0]) / tile_res[0])], axis=1)
+    _, tile_idx = np.unique(tile_ij, axis=0, return_inverse=True)
+    tile_idx = tile_idx.ravel()
+    order = np.argsort(tile_idx, kind="stable")
+    tiles_idx = np.split(order, np.flatnonzero(np.diff(tile_idx[order])) + 1)
+
+    def _read_tiles(nodata_fill_value):
+        for idx in tiles_idx:
+            bounds = (lon[idx].min(), lat[idx].min(), lon[idx].max(), lat[idx].max())
+            data, transform = read_raster_bounds(path, bounds, res=intermediate_res, pad_cells=2)
+            data = data[0, :, :]
+            if nodata_fill_value is not None:
+                data[data == meta_nodata] = nodata_fill_value
+            yield idx, data, transform
+
+    tiles = _read_tiles(fill_value)
+    if fill_value is None:
         fill_value = meta_nodata
     fill_value = fill_value or 0
 
-    return data, transform, fill_value, crs
+    return tiles, fill_value, crs
 
 def read_raster_sample(path, lat, lon, intermediate_res=None, method='linear', fill_value=None):
     """Read point samples from raster file.
@@ -2148,11 +2974,14 @@ def read_raster_sample(path, lat, lon, intermediate_res=None, method='linear', f
     if lat.size == 0:
         return np.zeros_like(lat)
 
-    data, transform, fill_value, _ = _prepare_raster_sample(
+    tiles, fill_value, _ = _prepare_raster_sample(
         path, lat, lon, intermediate_res, fill_value)
 
-    return interp_raster_data(
-        data, lat, lon, transform, method=method, fill_value=fill_value)
+    values = np.zeros(lat.shape)
+    for idx, data, transform in tiles:
+        values[idx] = interp_raster_data(
+            data, lat[idx], lon[idx], transform, method=method, fill_value=fill_value)
+    return values
 
 def read_raster_sample_with_gradients(path, lat, lon, intermediate_res=None,
                                       method=('linear', 'nearest'), fill_value=None):
@@ -2200,16 +3029,20 @@ def read_raster_sample_with_gradients(path, lat, lon, intermediate_res=None,
     if isinstance(method, str):
         method = (method, method)
 
-    data, transform, fill_value, crs = _prepare_raster_sample(
+    tiles, fill_value, crs = _prepare_raster_sample(
         path, lat, lon, intermediate_res, fill_value)
 
-    interp_data = interp_raster_data(
-        data, lat, lon, transform, method=method[0], fill_value=fill_value)
-
     is_latlon = crs is not None and crs.to_epsg() == 4326
-    grad_data, grad_transform = _raster_gradient(data, transform, latlon_to_m=is_latlon)
-    interp_grad = interp_raster_data(
-        grad_data, lat, lon, grad_transform, method=method[1], fill_value=fill_value)
+    interp_data = np.zeros(npoints)
+    interp_grad = np.zeros((npoints, 2))
+    for idx, data, transform in tiles:
+        interp_data[idx] = interp_raster_data(
+            data, lat[idx], lon[idx], transform, method=method[0], fill_value=fill_value)
+
+        grad_data, grad_transform = _raster_gradient(data, transform, latlon_to_m=is_latlon)
+        interp_grad[idx] = interp_raster_data(
+            grad_data, lat[idx], lon[idx], grad_transform, method=method[1],
+            fill_value=fill_value)
 
     return interp_data, interp_grad
 
@@ -2364,9 +3197,14 @@ def write_raster(file_name, data_matrix, meta, dtype=np.float32):
         dst.write(data_matrix, indexes=np.arange(1, shape[0] + 1))
 
 def points_to_raster(points_df, val_names=None, res=0.0, raster_res=0.0, crs=DEF_CRS,
-                     scheduler=None):
+                     scheduler=None, aggregation=None):
     """Compute raster (as data and transform) from GeoDataFrame.
 
+    If the points lie on a regular grid of the raster's resolution (up to a tolerance of
+    `POINTS_TO_RASTER_GRID_TOL` raster cells), the values are binned directly into the raster cells
+    by index arithmetic. Otherwise, a square box of size `res` is rasterized for each point and
+    the values are assigned to all raster cells touched by the box.
+
     Parameters
     ----------
     points_df : GeoDataFrame
@@ -2384,7 +3222,12 @@ def points_to_raster(points_df, val_names=None, res=0.0, raster_res=0.0, crs=DEF
         given and there is no CRS information in `points_df`, the CRS is assumed to be EPSG:4326
         (lat/lon). Default: None
     scheduler : str
-        used for dask map_partitions. “threads”, “synchronous” or “processes”
+        Not used anymore since the point boxes are constructed in a single vectorized call. Kept
+        for backwards compatibility.
+    aggregation : str, optional
+        How to aggregate the values of several points in the same raster cell, one of "sum",
+        "mean" or "max". By default, the value of the last point (in the order of `points_df`)
+        is used. Default: None
 
     Returns
     -------
@@ -2396,63 +3239,108 @@ def points_to_raster(points_df, val_names=None, res=0.0, raster_res=0.0, crs=DEF
     """
     if not val_names:
         val_names = ['value']
+    if aggregation not in [None, "sum", "mean", "max"]:
+        raise ValueError(f"Unknown aggregation: {aggregation}")
     if not res:
         res = np.abs(get_resolution(points_df.latitude.values,
                                     points_df.longitude.values)).min()
     if not raster_res:
         raster_res = res
 
-    def apply_box(df_exp):
-        fun = lambda r: Point(r.longitude, r.latitude).buffer(res / 2).envelope
-        return df_exp.apply(fun, axis=1)
-
     LOGGER.info('Raster from resolution %s to %s.', res, raster_res)
-    df_poly = gpd.GeoDataFrame(points_df[val_names])
-    if not scheduler:
-        df_poly['geometry'] = apply_box(points_df)
-    else:
-        ddata = dd.from_pandas(points_df[['latitude', 'longitude']],
-                               npartitions=cpu_count())
-        df_poly['geometry'] = ddata.map_partitions(apply_box, meta=Polygon) \
-                                   .compute(scheduler=scheduler)
-    df_poly.set_crs(crs if crs else points_df.crs if points_df.crs else DEF_CRS, inplace=True)
+    crs = pyproj.CRS.from_user_input(
+        crs if crs else points_df.crs if points_df.crs else DEF_CRS)
+    lat = points_df.latitude.values
+    lon = points_df.longitude.values
 
     # renormalize longitude if necessary
-    if equal_crs(df_poly.crs, DEF_CRS):
-        xmin, ymin, xmax, ymax = latlon_bounds(points_df.latitude.values,
-                                               points_df.longitude.values)
-        x_mid = 0.5 * (xmin + xmax)
-        # we don't really change the CRS when rewrapping, so we reset the CRS attribute afterwards
-        df_poly = df_poly \
-            .to_crs({"proj": "longlat", "lon_wrap": x_mid}) \
-            .set_crs(DEF_CRS, allow_override=True)
+    if equal_crs(crs, DEF_CRS):
+        xmin, ymin, xmax, ymax = latlon_bounds(lat, lon)
+        lon = lon_normalize(lon.astype(np.float64), center=0.5 * (xmin + xmax))
     else:
-        xmin, ymin, xmax, ymax = (points_df.longitude.min(), points_df.latitude.min(),
-                                  points_df.longitude.max(), points_df.latitude.max())
+        xmin, ymin, xmax, ymax = (lon.min(), lat.min(), lon.max(), lat.max())
 
     # construct raster
     rows, cols, ras_trans = pts_to_raster_meta((xmin, ymin, xmax, ymax),
                                                (raster_res, -raster_res))
     raster_out = np.zeros((len(val_names), rows, cols))
-
-    # TODO: parallel rasterize
-    for i_val, val_name in enumerate(val_names):
-        raster_out[i_val, :, :] = rasterio.features.rasterize(
-            list(zip(df_poly.geometry, df_poly[val_name])),
-            out_shape=(rows, cols),
-            transform=ras_trans,
-            fill=0,
-            all_touched=True,
-            dtype=rasterio.float32)
+    values = points_df[val_names].values.astype(np.float32).T
+
+    # raster cells of the points, if they are all (almost) centered in a raster cell
+    cell_idx = None
+    if np.isclose(res, raster_res, rtol=POINTS_TO_RASTER_GRID_TOL, atol=0):
+        col = (lon - xmin) / raster_res
+        row = (ymax - lat) / raster_res
+        if (np.all(np.abs(col - np.round(col)) <= POINTS_TO_RASTER_GRID_TOL)
+                and np.all(np.abs(row - np.round(row)) <= POINTS_TO_RASTER_GRID_TOL)):
+            cell_idx = np.round(row).astype(np.int64) * cols + np.round(col).astype(np.int64)
+
+    if cell_idx is not None:
+        LOGGER.debug('Binning %s points into raster cells.', str(cell_idx.size))
+        for i_val in range(len(val_names)):
+            raster_out[i_val, :, :] = _bin_raster_values(
+                cell_idx, values[i_val], rows * cols, aggregation).reshape(rows, cols)
+    else:
+        boxes = shapely.box(lon - res / 2, lat - res / 2, lon + res / 2, lat + res / 2)
+        rasterize = functools.partial(
+            rasterio.features.rasterize, out_shape=(rows, cols), transform=ras_trans,
+            fill=0, all_touched=True, dtype=rasterio.float32)
+        if aggregation in ["sum", "mean"]:
+            rasterize = functools.partial(rasterize, merge_alg=rasterio.features.MergeAlg.add)
+        if aggregation == "mean":
+            count = rasterize(list(zip(boxes, np.ones(boxes.size))))
+        for i_val in range(len(val_names)):
+            # for "max", the larger values are burned in later and replace the smaller ones
+            order = (np.argsort(values[i_val], kind="stable") if aggregation == "max"
+                     else np.arange(boxes.size))
+            raster_out[i_val, :, :] = rasterize(list(zip(boxes[order], values[i_val][order])))
+            if aggregation == "mean":
+                raster_out[i_val, count > 0] /= count[count > 0]
 
     meta = {
-        'crs': df_poly.crs,
+        'crs': crs,
         'height': rows,
         'width': cols,
         'transform': ras_trans,
     }
     return raster_out, meta
 
+def _bin_raster_values(cell_idx, values, size, aggregation=None):
+    """Aggregate point values in raster cells
+
+    Parameters
+    ----------
+    cell_idx : np.array of int
+        Index of the (flattened) raster cell of each point.
+    values : np.array of float32
+        Value of each point.
+    size : int
+        Number of raster cells.
+    aggregation : str, optional
+        One of "sum", "mean" or "max". By default, the value of the last point in each cell is
+        used. See `points_to_raster`. Default: None
+
+    Returns
+    -------
+    np.array of float32
+        Aggregated value of each raster cell, 0 for cells without points.
+    """
+    out = np.zeros(size, dtype=np.float32)
+    if aggregation is None:
+        _, last = np.unique(cell_idx[::-1], return_index=True)
+        last = cell_idx.size - 1 - last
+        out[cell_idx[last]] = values[last]
+    elif aggregation == "max":
+        max_val = np.full(size, -np.inf, dtype=np.float32)
+        np.maximum.at(max_val, cell_idx, values)
+        out[cell_idx] = max_val[cell_idx]
+    else:
+        out[:] = np.bincount(cell_idx, weights=values, minlength=size)
+        if aggregation == "mean":
+            count = np.bincount(cell_idx, minlength=size)
+            out[count > 0] /= count[count > 0]
+    return out
+
 def subraster_from_bounds(transform, bounds):
     """Compute a subraster definition from a given reference transform and bounds.
 
@@ -2627,14 +3515,18 @@ def mask_raster_with_geometry(raster, transform, shapes, nodata=None, **kwargs):
     return output.squeeze(0)
 
 def set_df_geometry_points(df_val, scheduler=None, crs=None):
-    """Set given geometry to given dataframe using dask if scheduler.
+    """Set given geometry to given dataframe.
+
+    The points are constructed from the latitude and longitude columns in a single vectorized
+    call (`geopandas.points_from_xy`).
 
     Parameters
     ----------
     df_val : GeoDataFrame
         contains latitude and longitude columns
     scheduler : str, optional
-        used for dask map_partitions. “threads”, “synchronous” or “processes”
+        Not used anymore since the points are constructed in a single vectorized call. Kept for
+        backwards compatibility.
     crs : object (anything readable by pyproj4.CRS.from_user_input), optional
         Coordinate Reference System, if omitted or None: df_val.geometry.crs
     """
@@ -2647,20 +3539,8 @@ def set_df_geometry_points(df_val, scheduler=None, crs=None):
         except AttributeError:
             crs = None
 
-    # work in parallel
-    if scheduler:
-        def apply_point(df_exp):
-            return df_exp.apply(lambda row: Point(row.longitude, row.latitude), axis=1)
-
-        ddata = dd.from_pandas(df_val, npartitions=cpu_count())
-        df_val['geometry'] = ddata.map_partitions(
-                                 apply_point,
-                                 meta=('geometry', gpd.array.GeometryDtype)
-                             ).compute(scheduler=scheduler)
-    # single process
-    else:
-        df_val['geometry'] = gpd.GeoSeries(
-            gpd.points_from_xy(df_val.longitude, df_val.latitude), index=df_val.index, crs=crs)
+    df_val['geometry'] = gpd.GeoSeries(
+        gpd.points_from_xy(df_val.longitude, df_val.latitude), index=df_val.index, crs=crs)
 
     # set crs
     if crs:
@@ -25,10 +25,14 @@ __all__ = ['geo_bin_from_array',
            'make_map',
            'add_shapes',
            'add_populated_places',
-           'add_cntry_names'
+           'add_cntry_names',
+           'save_frames_video'
           ]
 
+import itertools
 import logging
+from pathlib import Path
+import tempfile
 from textwrap import wrap
 import warnings
 
@@ -43,6 +47,7 @@ from cartopy.io import shapereader
 from cartopy.mpl.gridliner import LONGITUDE_FORMATTER, LATITUDE_FORMATTER
 from rasterio.crs import CRS
 import requests
+from tqdm import tqdm
 
 from climada.util.constants import CMAP_EXPOSURES, CMAP_CAT, CMAP_RASTER
 from climada.util.files_handler import to_list
@@ -550,6 +555,64 @@ def make_map(num_sub=1, figsize=(9, 13), proj=ccrs.PlateCarree(), adapt_fontsize
 
     return fig, axis_sub, fontsize
 
+def save_frames_video(plot_frame, frames, file_name, writer, pool=None):
+    """Render the frames of a video to image files (optionally in parallel) and encode them
+
+    In contrast to `matplotlib.animation.FuncAnimation`, each frame is plotted in a separate
+    figure. This allows for rendering the frames in parallel. Afterwards, the images are encoded
+    to a video file using the given writer.
+
+    Parameters
+    ----------
+    plot_frame : callable
+        Function that is called as `plot_frame(frame, path)` for each frame. It creates a new
+        figure, plots the frame, saves it as a PNG image to `path` and closes the figure. All
+        frames are required to have the same size.
+    frames : list
+        For each frame, the argument `frame` passed to `plot_frame`.
+    file_name : str
+        File name to save the video to (including full path and file extension).
+    writer : matplotlib.animation.AbstractMovieWriter
+        Video writer.
+    pool : pathos.pool, optional
+        Pool that will be used to render the frames in parallel. The frames are split into one
+        chunk per worker, so that `plot_frame` and any data bound to it are sent to each worker
+        only once. Default: None
+    """
+    if len(frames) == 0:
+        LOGGER.warning("No frames to render, %s is not written.", file_name)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = [str(Path(tmp_dir, f"frame_{i:06d}.png")) for i in range(len(frames))]
+        LOGGER.info('Rendering %d frames.', len(frames))
+        if pool:
+            n_chunks = min(len(frames), pool.nodes)
+            bounds = np.linspace(0, len(frames), n_chunks + 1).astype(int)
+            pool.map(_save_frames, itertools.repeat(plot_frame, n_chunks),
+                     [frames[start:end] for start, end in zip(bounds[:-1], bounds[1:])],
+                     [paths[start:end] for start, end in zip(bounds[:-1], bounds[1:])])
+        else:
+            _save_frames(plot_frame, tqdm(frames), paths)
+
+        LOGGER.info('Encoding video %s', file_name)
+        dpi = plt.rcParams['figure.dpi']
+        image = plt.imread(paths[0])
+        fig = plt.figure(figsize=(image.shape[1] / dpi, image.shape[0] / dpi), dpi=dpi)
+        axis = fig.add_axes([0, 0, 1, 1])
+        axis.set_axis_off()
+        axis_image = axis.imshow(image)
+        with writer.saving(fig, file_name, dpi=dpi):
+            for path in paths:
+                axis_image.set_data(plt.imread(path))
+                writer.grab_frame()
+        plt.close(fig)
+
+def _save_frames(plot_frame, frames, paths):
+    """Render a chunk of frames of `save_frames_video` to image files"""
+    for frame, path in zip(frames, paths):
+        plot_frame(frame, path)
+
 def add_shapes(axis):
     """
     Overlay Earth's countries coastlines to matplotlib.pyplot axis.
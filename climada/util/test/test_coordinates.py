@@ -21,13 +21,14 @@ Test coordinates module.
 
 import unittest
 from pathlib import Path
+import tempfile
 
 from cartopy.io import shapereader
 import geopandas as gpd
 import numpy as np
 from pyproj.crs import CRS as PCRS
 import shapely
-from shapely.geometry import box
+from shapely.geometry import box, LineString
 from rasterio.windows import Window
 from rasterio.warp import Resampling
 from rasterio import Affine
@@ -35,7 +36,7 @@ from rasterio.crs import CRS as RCRS
 import rasterio.transform
 
 from climada import CONFIG
-from climada.util.constants import HAZ_DEMO_FL, DEF_CRS, ONE_LAT_KM, DEMO_DIR
+from climada.util.constants import HAZ_DEMO_FL, DEF_CRS, ONE_LAT_KM, DEMO_DIR, EARTH_RADIUS_KM
 import climada.util.coordinates as u_coord
 
 DATA_DIR = CONFIG.util.test_data.dir()
@@ -827,6 +828,90 @@ class TestAssign(unittest.TestCase):
                 coords_empty, coords_to_assign, distance=distance, threshold=thresh)
             np.testing.assert_array_equal(assigned_idx, result)
 
+    def test_assign_coordinates_nn_index(self):
+        """Test assign_coordinates with a reusable nearest neighbor index"""
+        coords = np.array([(0.2, 2), (0, 0), (0, 2), (2.1, 3), (1, 1), (-1, 1), (0, 179.9)])
+        coords_to_assign = np.array([(2.1, 3), (0, 0), (0, 2), (0.9, 1.0), (0, -179.9)])
+        nn_index = u_coord.NearestNeighborIndex(coords_to_assign)
+        self.assertTrue(nn_index.matches(coords_to_assign.astype(np.float32)))
+        self.assertFalse(nn_index.matches(coords_to_assign[:-1]))
+        for distance in ["euclidean", "haversine"]:
+            for thresh, result in [(100, [2, 1, 2, 0, 3, -1, 4]), (20, [-1, 1, 2, 0, 3, -1, -1])]:
+                assigned_idx = u_coord.assign_coordinates(
+                    coords, coords_to_assign, distance=distance, threshold=thresh,
+                    nn_index=nn_index)
+                np.testing.assert_array_equal(assigned_idx, result)
+            tree = nn_index.tree(distance)
+            self.assertIs(nn_index.tree(distance), tree)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_name = Path(tmp_dir, "nn_index.pkl")
+            nn_index.write(file_name)
+            nn_index_read = u_coord.NearestNeighborIndex.from_file(file_name)
+        self.assertEqual(nn_index_read.fingerprint, nn_index.fingerprint)
+        self.assertEqual(set(nn_index_read._trees), set(nn_index._trees))
+
+        with self.assertRaises(ValueError):
+            u_coord.assign_coordinates(coords, coords_to_assign[:-1], nn_index=nn_index)
+        with self.assertRaises(ValueError):
+            nn_index.tree("manhattan")
+
+    def test_grid_cell_index(self):
+        """Test detection of regular grids and assignment to grid points"""
+        lat, lon = np.meshgrid(np.arange(10, 12.01, 0.5), np.arange(-3, 0.01, 0.25), indexing='ij')
+        coords = np.stack([lat.ravel(), lon.ravel()], axis=1)
+        # points of an incomplete grid in random order
+        coords = coords[np.random.default_rng(0).permutation(coords.shape[0])[5:]]
+        lat_min, lon_min, res_lat, res_lon, cell_idx = u_coord.grid_cell_index(coords)
+        self.assertEqual((lat_min, lon_min), (10, -3))
+        np.testing.assert_allclose((res_lat, res_lon), (0.5, 0.25))
+        self.assertEqual(cell_idx.shape, (5, 13))
+        self.assertEqual(np.count_nonzero(cell_idx >= 0), coords.shape[0])
+        np.testing.assert_array_equal(
+            coords[cell_idx[cell_idx >= 0]],
+            np.stack([lat, lon], axis=-1)[cell_idx >= 0])
+
+        # not regular, or too sparse
+        self.assertIsNone(u_coord.grid_cell_index(coords + [[0.1, 0]] * (coords[:, :1] > 11)))
+        self.assertIsNone(u_coord.grid_cell_index(np.array([[0, 0], [1, 1], [50, 50]])))
+        self.assertIsNone(u_coord.grid_cell_index(coords[coords[:, 0] == 10]))
+
+        # same result as the tree search, also for points outside of the grid
+        exposures = np.stack([
+            np.random.default_rng(1).uniform(9, 13, 500),
+            np.random.default_rng(2).uniform(-4, 1, 500),
+        ], axis=1)
+        nn_index = u_coord.NearestNeighborIndex(coords)
+        assigned = u_coord.assign_coordinates(exposures, coords, threshold=50, nn_index=nn_index)
+        self.assertIsNotNone(nn_index.grid())
+        np.testing.assert_array_equal(
+            assigned, u_coord.assign_coordinates(exposures, coords, threshold=50))
+
+    def test_nearest_neighbor_approx_brute_force(self):
+        """Compare _nearest_neighbor_approx with a brute-force search"""
+        rng = np.random.default_rng(42)
+        grid_lat, grid_lon = np.meshgrid(np.arange(-60, 60.1, 0.5), np.arange(-20, 20.1, 0.5))
+        centroids_list = [
+            np.stack([rng.uniform(-80, 80, 2000), rng.uniform(-30, 30, 2000)], axis=1),
+            np.stack([grid_lat.ravel(), grid_lon.ravel()], axis=1),
+            np.array([[10.0, 5.0]]),
+        ]
+        # coordinates exactly between grid points are checked for the handling of ties
+        coordinates = np.concatenate([
+            np.stack([rng.uniform(-85, 85, 1000), rng.uniform(-35, 35, 1000)], axis=1),
+            np.array([[0.25, 0.25], [10.25, -3.0], [10.25, -3.0], [89.0, 0.0]]),
+        ])
+        for centroids in centroids_list:
+            cos_lat = np.cos(np.radians(centroids[:, 0]))
+            ref = [
+                u_coord._dist_sqr_approx(
+                    centroids[:, 0], centroids[:, 1], cos_lat, lat, lon).argmin()
+                for lat, lon in coordinates
+            ]
+            assigned = u_coord._nearest_neighbor_approx(
+                centroids, coordinates, 1e5, check_antimeridian=False)
+            np.testing.assert_array_equal(assigned, ref)
+
 class TestGetGeodata(unittest.TestCase):
     def test_nat_earth_resolution_pass(self):
         """Correct resolution."""
@@ -864,6 +949,37 @@ class TestGetGeodata(unittest.TestCase):
             if not ex_box.intersects(line.geometry):
                 self.assertEqual(1, 0)
 
+    def test_natural_earth_layer_pass(self):
+        """Check that natural earth layers are parsed once and cached"""
+        layer = u_coord.natural_earth_layer('110m', 'cultural', 'admin_0_countries')
+        self.assertIs(layer, u_coord.natural_earth_layer('110m', 'cultural', 'admin_0_countries'))
+        self.assertTrue(u_coord.NATEARTH_CACHE_DIR.joinpath('ne_110m_admin_0_countries.pkl')
+                        .is_file())
+        self.assertFalse(np.any(layer['ISO_A3'] == '-99'))
+        self.assertFalse(np.any(layer['ISO_N3'] == '-99'))
+
+        # the getters return copies, the cached layer remains untouched
+        countries = u_coord.get_country_geometries(resolution=110)
+        countries['ISO_A3'] = 'XXX'
+        self.assertFalse(np.any(layer['ISO_A3'] == 'XXX'))
+        countries = u_coord.get_country_geometries(['CHE'], extent=(5, 12, 45, 48),
+                                                   resolution=110)
+        self.assertEqual(countries.shape[0], 1)
+        self.assertEqual(countries['ISO_A3'].values[0], 'CHE')
+
+    def test_natural_earth_layer_corrupt_cache(self):
+        """Check that an unreadable cache file is replaced"""
+        layer = u_coord.natural_earth_layer('110m', 'physical', 'coastline')
+        cache_file = u_coord.NATEARTH_CACHE_DIR.joinpath('ne_110m_coastline.pkl')
+        cache_file.write_bytes(b'truncated')
+        u_coord.natural_earth_layer.cache_clear()
+        reread = u_coord.natural_earth_layer('110m', 'physical', 'coastline')
+        self.assertEqual(reread.shape, layer.shape)
+        u_coord.natural_earth_layer.cache_clear()
+        cached = u_coord.natural_earth_layer('110m', 'physical', 'coastline')
+        self.assertEqual(cached.shape, layer.shape)
+        self.assertEqual(list(u_coord.NATEARTH_CACHE_DIR.glob('*.tmp')), [])
+
     def test_get_land_geometry_country_pass(self):
         """get_land_geometry with selected countries."""
         iso_countries = ['DEU', 'VNM']
@@ -915,6 +1031,76 @@ class TestGetGeodata(unittest.TestCase):
         self.assertEqual(res.size, lat.size)
         np.testing.assert_array_equal(res[:3], [True, False, True])
 
+    def test_on_land_default_pass(self):
+        """check that the default land mask agrees with the union of the country geometries"""
+        rng = np.random.default_rng(1234)
+        # coasts and lakes: Great Lakes, Caspian Sea, Netherlands/Denmark, Lake Victoria
+        for extent in [(-93, -75, 40, 50), (45, 56, 36, 48), (3, 13, 50, 58), (31, 35, -4, 1)]:
+            land_geom = u_coord.get_land_geometry(
+                extent=(extent[0] - 1, extent[1] + 1, extent[2] - 1, extent[3] + 1),
+                resolution=10)
+            # random points and points close to the coastlines (the boundary of land_geom also
+            # runs along the clipping box, which is outside of the extent)
+            coast = shapely.get_coordinates(land_geom.boundary)
+            coast = coast[rng.choice(coast.shape[0], size=2000)]
+            coast += rng.normal(scale=0.01, size=coast.shape)
+            coast = coast[(coast[:, 0] > extent[0]) & (coast[:, 0] < extent[1])
+                          & (coast[:, 1] > extent[2]) & (coast[:, 1] < extent[3])]
+            lat = np.concatenate([rng.uniform(extent[2], extent[3], size=2000), coast[:, 1]])
+            lon = np.concatenate([rng.uniform(extent[0], extent[1], size=2000), coast[:, 0]])
+            on_land = u_coord.coord_on_land(lat, lon)
+            self.assertTrue(np.any(on_land))
+            self.assertFalse(np.all(on_land))
+            np.testing.assert_array_equal(on_land, u_coord.coord_on_land(lat, lon, land_geom))
+
+    def test_land_mask_pass(self):
+        """check that rasterized land mask agrees with exact land geometry"""
+        land_geom = u_coord.get_land_geometry(extent=(-20, 10, 25, 45), resolution=50)
+        land_mask = u_coord.LandMask(land_geom, resolution=0.5)
+        self.assertTrue(np.any(land_mask.mask == land_mask.LAND))
+        self.assertTrue(np.any(land_mask.mask == land_mask.SEA))
+        self.assertTrue(np.any(land_mask.mask == land_mask.COAST))
+
+        rng = np.random.default_rng(1234)
+        lat = rng.uniform(20, 50, size=5000)
+        lon = rng.uniform(-25, 15, size=5000)
+        # longitude outside of the land geometry's extent is normalized
+        lon[:10] += 360
+        np.testing.assert_array_equal(
+            u_coord.coord_on_land(lat, lon, land_mask),
+            u_coord.coord_on_land(lat, lon, land_geom))
+
+        with self.assertRaises(ValueError):
+            u_coord.LandMask(land_geom, resolution=0)
+
+    def test_country_mask_pass(self):
+        """check that rasterized country mask agrees with exact country geometries"""
+        countries = u_coord.get_country_geometries(extent=(-10, 30, 35, 60), resolution=50)
+        country_mask = u_coord.CountryMask(countries, resolution=0.5)
+        self.assertTrue(np.any(country_mask.mask == country_mask.BOUNDARY))
+        self.assertTrue(np.any(country_mask.mask == 0))
+        self.assertTrue(np.any(country_mask.mask == 250))
+
+        rng = np.random.default_rng(1234)
+        lat = rng.uniform(30, 65, size=5000)
+        lon = rng.uniform(-15, 35, size=5000)
+        lon[:10] += 360
+        region_id = u_coord.get_country_code(lat, lon, country_mask=country_mask)
+
+        # reference: exact test against the countries, largest first
+        region_id_ref = np.zeros(lat.size, dtype=int)
+        lon_norm = u_coord.lon_normalize(lon.copy())
+        for country in country_mask.countries.itertuples():
+            unset = (region_id_ref == 0).nonzero()[0]
+            select = shapely.contains_xy(country.geometry, lon_norm[unset], lat[unset])
+            region_id_ref[unset[select]] = country.region_id
+        np.testing.assert_array_equal(region_id, region_id_ref)
+        np.testing.assert_array_equal(
+            u_coord.coord_on_land(lat, lon, country_mask), region_id_ref != 0)
+
+        with self.assertRaises(ValueError):
+            u_coord.CountryMask(countries, resolution=0)
+
     def test_dist_to_coast(self):
         """Test point in coast and point not in coast"""
         points = np.array([
@@ -935,6 +1121,53 @@ class TestGetGeodata(unittest.TestCase):
         for d, r in zip(dists, res):
             self.assertAlmostEqual(d, r)
 
+    def test_dist_to_coast_index(self):
+        """Test the indexed distance to coast against the UTM-based distance"""
+        points = np.array([
+            # Caribbean Sea:
+            [13.208333333333329, -59.625000000000014],
+            # South America:
+            [-12.497529, -58.849505],
+            # Very close to coast of Somalia:
+            [1.96768, 45.23219],
+            # Ocean and land point, same UTM zone as Somalia
+            [0.5, 48.5],
+            [5.5, 44.5],
+        ])
+        res_utm = u_coord.dist_to_coast(points, signed=True)
+        res_index = u_coord.dist_to_coast(points, signed=True, method="index")
+        np.testing.assert_allclose(res_index, res_utm, rtol=5e-3, atol=1)
+        self.assertLess(res_index[4], 0)
+
+        with self.assertRaises(ValueError):
+            u_coord.dist_to_coast(points, method="nasa")
+
+    def test_coast_distance(self):
+        """Test CoastDistance against the exact distance to all arcs"""
+        lines = [
+            LineString([(0, -1), (0, 1)]),
+            LineString([(10, 10), (12, 11), (12.5, 14), (10, 10)]),
+            LineString([(179, -10), (180, -5), (-179, 0)]),
+        ]
+        coast_dist = u_coord.CoastDistance(lines, max_segment_km=5)
+        self.assertTrue(np.all(
+            u_coord._unit_vector_angle(coast_dist.arcs[:, 0], coast_dist.arcs[:, 1])
+            * EARTH_RADIUS_KM <= 5 + 1e-6))
+
+        # distance of a point on the equator to the meridian
+        np.testing.assert_allclose(
+            coast_dist.dist(np.array([0.0]), np.array([1.0])),
+            [np.radians(1) * EARTH_RADIUS_KM * 1000])
+
+        rng = np.random.default_rng(0)
+        lat, lon = rng.uniform(-20, 20, 500), rng.uniform(-30, 30, 500)
+        lon[:100] += 180
+        pnt = u_coord.latlon_to_geosph_vector(lat, lon)
+        ref = np.array([
+            u_coord._dist_to_arcs(p[None], coast_dist.arcs[:, 0], coast_dist.arcs[:, 1]).min()
+            for p in pnt]) * EARTH_RADIUS_KM * 1000
+        np.testing.assert_allclose(coast_dist.dist(lat, lon), ref)
+
     def test_dist_to_coast_nasa(self):
         """Test point in coast and point not in coast"""
         points = np.array([
@@ -1223,6 +1456,34 @@ class TestRasterMeta(unittest.TestCase):
         self.assertEqual(meta['width'], 4)
         np.testing.assert_array_equal(r_data[0], [[0, 0, 0, 2], [0, 0, 3, 1]])
 
+    def test_points_to_raster_aggregation(self):
+        """Test points_to_raster with points on a regular grid and aggregation"""
+        df_val = gpd.GeoDataFrame()
+        df_val['latitude'] = [0, 0, 1, 1, 1, 0]
+        df_val['longitude'] = [10, 11, 10, 12, 12, 10]
+        df_val['value'] = [1, 2, 3, 4, -5, 6]
+        ref_data = {
+            None: [[3, 0, -5], [6, 2, 0]],
+            "sum": [[3, 0, -1], [7, 2, 0]],
+            "mean": [[3, 0, -0.5], [3.5, 2, 0]],
+            "max": [[3, 0, 4], [6, 2, 0]],
+        }
+        for aggregation, ref in ref_data.items():
+            # points centered in the raster cells are binned by index arithmetic
+            r_data, meta = u_coord.points_to_raster(
+                df_val, val_names=['value'], res=1.0, aggregation=aggregation)
+            self.assertEqual(meta['transform'], Affine(1, 0, 9.5, 0, -1, 1.5))
+            np.testing.assert_array_almost_equal(r_data[0], ref)
+
+            # points that are not centered are rasterized as boxes of size `res`
+            r_data, meta = u_coord.points_to_raster(
+                df_val, val_names=['value'], res=0.5, raster_res=1.0, aggregation=aggregation)
+            self.assertEqual(meta['transform'], Affine(1, 0, 9.5, 0, -1, 1.5))
+            np.testing.assert_array_almost_equal(r_data[0], ref)
+
+        with self.assertRaises(ValueError):
+            u_coord.points_to_raster(df_val, val_names=['value'], aggregation="median")
+
 class TestRasterIO(unittest.TestCase):
     def test_write_raster_pass(self):
         """Test write_raster function."""
@@ -1386,6 +1647,27 @@ class TestRasterIO(unittest.TestCase):
         np.testing.assert_array_almost_equal(z_left, z_both_neg[:z_left.size])
         np.testing.assert_array_almost_equal(z_right, z_both_neg[-z_right.size:])
 
+    def test_prepare_raster_sample_tiles(self):
+        """Test that only tiles around the sample points are read"""
+        res = 0.009000000000000341
+        i_j_vals = np.array([[2, 3], [4, 5], [300, 400], [301, 402]])
+        lat = 10.42822096697894 - res / 2 - i_j_vals[:, 0] * res
+        lon = -69.33714959699981 + res / 2 + i_j_vals[:, 1] * res
+        tiles, fill_value, _ = u_coord._prepare_raster_sample(
+            HAZ_DEMO_FL, lat, lon, None, None, tile_size=50)
+        tiles = sorted(tiles, key=lambda tile: tile[0][0])
+        self.assertEqual(len(tiles), 2)
+        for (idx, data, _), ref_idx in zip(tiles, [[0, 1], [2, 3]]):
+            np.testing.assert_array_equal(idx, ref_idx)
+            self.assertLessEqual(max(data.shape), 10)
+
+        values = np.zeros(lat.size)
+        for idx, data, transform in tiles:
+            values[idx] = u_coord.interp_raster_data(
+                data, lat[idx], lon[idx], transform, fill_value=fill_value)
+        np.testing.assert_array_almost_equal(
+            values, u_coord.read_raster_sample(HAZ_DEMO_FL, lat, lon))
+
     def test_sample_raster_gradient(self):
         """Test sampling gradients from a raster file"""
         path = u_coord._get_dist_to_coast_nasa_tif()
@@ -20,9 +20,14 @@ Test plot module.
 """
 
 import unittest
+from pathlib import Path
+import tempfile
 import cartopy
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.animation import PillowWriter
+from PIL import Image
+from pathos.pools import ThreadPool
 import cartopy.crs as ccrs
 
 import climada.util.plot as u_plot
@@ -145,6 +150,60 @@ class TestPlots(unittest.TestCase):
         self.assertEqual(cmap, ax.collections[0].cmap.name)
         plt.close()
 
+    def test_save_frames_video(self):
+        """Render frames to images and encode them to an animated GIF"""
+        def plot_frame(frame, path):
+            fig, axis = plt.subplots(figsize=(2, 2))
+            axis.plot([0, frame], [0, frame])
+            fig.savefig(path)
+            plt.close(fig)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_name = str(Path(tmp_dir, "test.gif"))
+            u_plot.save_frames_video(plot_frame, [1, 2, 3], file_name, PillowWriter(fps=2))
+            with Image.open(file_name) as image:
+                self.assertEqual(image.n_frames, 3)
+
+            file_name = str(Path(tmp_dir, "empty.gif"))
+            u_plot.save_frames_video(plot_frame, [], file_name, PillowWriter(fps=2))
+            self.assertFalse(Path(file_name).exists())
+
+    def test_save_frames_video_pool(self):
+        """Render frames with a thread pool and compare them to the sequential rendering"""
+        def plot_frame(frame, path):
+            fig, axis = plt.subplots(figsize=(2, 2))
+            axis.plot([0, frame], [0, frame])
+            fig.savefig(path)
+            plt.close(fig)
+
+        def read_frames(file_name):
+            with Image.open(file_name) as image:
+                frames = []
+                for i_frame in range(image.n_frames):
+                    image.seek(i_frame)
+                    frames.append(np.array(image.convert("RGB")))
+            return frames
+
+        frames = [1, 2, 3, 4, 5]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_name = str(Path(tmp_dir, "seq.gif"))
+            u_plot.save_frames_video(plot_frame, frames, file_name, PillowWriter(fps=2))
+            seq_frames = read_frames(file_name)
+
+            file_name = str(Path(tmp_dir, "pool.gif"))
+            pool = ThreadPool(nodes=2)
+            u_plot.save_frames_video(plot_frame, frames, file_name, PillowWriter(fps=2),
+                                     pool=pool)
+            pool.close()
+            pool.join()
+            pool.clear()
+            pool_frames = read_frames(file_name)
+
+        self.assertEqual(len(seq_frames), 5)
+        self.assertEqual(len(pool_frames), 5)
+        for seq_frame, pool_frame in zip(seq_frames, pool_frames):
+            np.testing.assert_array_equal(pool_frame, seq_frame)
+
 
 # Execute Tests
 if __name__ == "__main__":
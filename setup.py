@@ -66,6 +66,7 @@ setup(
         'rasterio',
         'salib',
         'scikit-learn',
+        'shapely>=2.0',
         'statsmodels',
         'sparse',
         'tables',